@@ -0,0 +1,14 @@
+"""Puts the repository root on sys.path.
+
+Imported first by every benchmark script, so that
+
+    python benchmarks/<script>.py
+
+imports silospin from the source tree without PYTHONPATH or an install.
+"""
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
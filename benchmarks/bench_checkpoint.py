@@ -0,0 +1,81 @@
+"""Cost of periodic checkpoints in StrangSplitIntegrator.integrate_tme.
+
+Runs the same TME integration (streamed to disk) with several checkpoint
+intervals and reports the checkpoint size, the time per checkpoint and the
+total overhead relative to the run without checkpoints. Run as:
+
+    python benchmarks/bench_checkpoint.py [--d 10] [--B 1024] [--Nt 1000] [--dir /tmp]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState, make_problem
+
+if HAS_CUPY:
+    import cupy as xp
+else:
+    xp = np
+
+
+class _JAction:
+    """J[rho] = -2*pi*i [dH, rho]."""
+
+    def __init__(self, dH):
+        self.dH = dH
+
+    def compute_action(self, t, dummy, rho, out):
+        out[...] = -2j * np.pi * (xp.einsum('ijb,jkb->ikb', self.dH, rho)
+                                  - xp.einsum('ijb,jkb->ikb', rho, self.dH))
+
+
+def make_j_action(d, B):
+    """J for dH = diag(0, 1, ..., d-1) on every batch element."""
+    dH = xp.asarray(np.diag(np.arange(d, dtype=float))[:, :, None] * np.ones(B), order='F')
+    return _JAction(dH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=1024)
+    parser.add_argument('--Nt', type=int, default=1000)
+    parser.add_argument('--every', type=int, nargs='+', default=[0, 500, 100, 20])
+    parser.add_argument('--dir', default='.')
+    args = parser.parse_args()
+
+    H_callback, collapse_ops, rho0 = make_problem(args.d, args.B, xp)
+    J = make_j_action(args.d, args.B)
+    traj = os.path.join(args.dir, 'bench_checkpoint_traj.npy')
+    ckpt = os.path.join(args.dir, 'bench_checkpoint.npz')
+
+    base = None
+    print(f"d={args.d} B={args.B} Nt={args.Nt}")
+    for every in args.every:
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, args.B, args.d,
+                                           TemplateState(), xp=xp)
+        t0 = time.perf_counter()
+        integrator.integrate_tme(1.0, args.Nt, rho0, J, trajectory_path=traj,
+                                 checkpoint_path=ckpt if every else None,
+                                 checkpoint_every=every)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        stats = integrator.checkpoint_stats
+        per = stats['seconds'] / stats['count'] if stats['count'] else 0.0
+        print(f"every={every:5d}: {elapsed:7.2f} s  {stats['count']:4d} checkpoints "
+              f"x {stats['bytes'] / 1e6:6.1f} MB, {per * 1e3:7.1f} ms each, "
+              f"overhead {100.0 * (elapsed - base) / base:+5.1f}%")
+
+    for path in (traj, ckpt):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
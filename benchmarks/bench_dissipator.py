@@ -0,0 +1,65 @@
+"""Fused dissipator vs the per-collapse-operator loop.
+
+Times StrangSplitIntegrator._compute_dissipator_action (stacked operator
+pairs, constant kernel count) against _compute_dissipator_action_loop for
+increasing numbers of collapse operators. Uses CuPy when available, else
+NumPy. Run as:
+
+    python benchmarks/bench_dissipator.py [--d 10] [--B 4096]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=4096)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--n-ops', type=int, nargs='+', default=[1, 2, 6, 10])
+    args = parser.parse_args()
+
+    xp = cp if HAS_CUPY else np
+    sync = cp.cuda.Device().synchronize if HAS_CUPY else (lambda: None)
+    d, B = args.d, args.B
+    rng = np.random.default_rng(0)
+
+    rho_h = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    rho = xp.asarray(np.asfortranarray(rho_h + rho_h.conj().transpose(1, 0, 2)))
+    out = xp.zeros_like(rho)
+
+    for n_ops in args.n_ops:
+        collapse_ops = []
+        for _ in range(n_ops):
+            L = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+            collapse_ops.append((xp.asarray(np.asfortranarray(L)), xp.asarray(rng.uniform(0.1, 1.0, B))))
+        integrator = StrangSplitIntegrator(lambda ti, B, arr: None, collapse_ops, B, d,
+                                           TemplateState(), xp=xp)
+        timings = {}
+        for name, fn in (('loop', integrator._compute_dissipator_action_loop),
+                         ('fused', integrator._compute_dissipator_action)):
+            fn(rho, out)
+            sync()
+            t0 = time.perf_counter()
+            for _ in range(args.repeats):
+                fn(rho, out)
+            sync()
+            timings[name] = (time.perf_counter() - t0) / args.repeats
+        print(f"[{xp.__name__}] d={d} B={B} n_ops={n_ops:3d}: "
+              f"loop {timings['loop']*1e3:8.2f} ms  fused {timings['fused']*1e3:8.2f} ms  "
+              f"speedup {timings['loop']/timings['fused']:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
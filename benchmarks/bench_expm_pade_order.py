@@ -0,0 +1,68 @@
+"""Fixed Padé[13,13] vs adaptive Padé degree in BatchedExpmWorkspace.
+
+Sweeps the 1-norm of A = -2*pi*i*H*dt from tiny time steps (degree 3)
+up to norms that need scaling and squaring. Run as:
+
+    python benchmarks/bench_expm_pade_order.py [--d 10] [--B 4096]
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.linalg import expm
+
+import _path  # noqa: F401
+from silospin.batched_expm import BatchedExpmWorkspace, HAS_CUPY, _select_pade_order, _PADE_ORDERS
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+def make_batch(d, B, norm, seed=0):
+    """A = -i H with every element scaled to ||A||_1 = norm."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(B, d, d)) + 1j * rng.normal(size=(B, d, d))
+    H = 0.5 * (X + X.conj().transpose(0, 2, 1))
+    H /= np.abs(H).sum(axis=1).max(axis=1)[:, None, None]
+    return np.ascontiguousarray((-1j * norm * H).transpose(1, 2, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=4096)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    backends = [('numpy', np, lambda: None)]
+    if HAS_CUPY:
+        backends.append(('cupy', cp, cp.cuda.Stream.null.synchronize))
+
+    for name, xp, sync in backends:
+        for norm in (1e-3, 1e-2, 0.2, 0.8, 2.0, 5.0, 20.0):
+            A_host = make_batch(args.d, args.B, norm)
+            A = xp.asarray(A_host)
+            ref = np.stack([expm(A_host[:, :, b]) for b in range(0, args.B, 97)], axis=-1)
+            timings = {}
+            errs = {}
+            for order in (13, 'adaptive'):
+                ws = BatchedExpmWorkspace(args.d, args.B, xp=xp, pade_order=order)
+                ws.compute(A)
+                sync()
+                t0 = time.perf_counter()
+                for _ in range(args.repeats):
+                    U = ws.compute(A)
+                sync()
+                timings[order] = (time.perf_counter() - t0) / args.repeats
+                U = U.get() if xp is not np else U
+                errs[order] = np.abs(U[:, :, ::97] - ref).max()
+            m = _select_pade_order(norm, _PADE_ORDERS)
+            print(f"[{name}] ||A||_1={norm:7.3g} (m={m:2d}): "
+                  f"pade13 {timings[13]*1e3:8.2f} ms  "
+                  f"adaptive {timings['adaptive']*1e3:8.2f} ms  "
+                  f"speedup {timings[13]/timings['adaptive']:5.2f}x  "
+                  f"max err {errs[13]:.1e} / {errs['adaptive']:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Reproducible benchmark suite for silospin.batched_expm.
+
+Sweeps matrix size d, batch size B and 1-norm regime on NumPy (and CuPy
+when available), timing
+
+  - batched_expm           (allocating functional API)
+  - BatchedExpmWorkspace   (pre-allocated, .compute)
+  - scipy.linalg.expm      (per-matrix loop, host only, small B)
+
+and recording the max error of the batched results against SciPy on a
+sample of the batch. Results are written as JSON together with the
+environment (library versions, CPU/GPU, git revision), so runs can be
+compared over time; --compare flags configurations that got slower than a
+previous result file. Run as:
+
+    python benchmarks/bench_expm_suite.py [--quick] [--output expm_bench.json]
+    python benchmarks/bench_expm_suite.py --compare old.json --output new.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+import scipy
+from scipy.linalg import expm
+
+import _path  # noqa: F401
+from silospin.batched_expm import BatchedExpmWorkspace, HAS_CUPY, batched_expm
+
+if HAS_CUPY:
+    import cupy as cp
+
+# 1-norm regimes of A: short steps (low Padé degree), moderate, needs squaring
+NORMS = {'small': 1e-2, 'medium': 1.0, 'large': 20.0}
+# Number of workspace buffers of size d*d*B (BatchedExpmWorkspace + input)
+_BUFFERS = 20
+
+
+def make_batch(d, B, norm, seed=0):
+    """A = -i H, every element scaled to ||A||_1 = norm, layout [d, d, B]."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(B, d, d)) + 1j * rng.normal(size=(B, d, d))
+    H = 0.5 * (X + X.conj().transpose(0, 2, 1))
+    H /= np.abs(H).sum(axis=1).max(axis=1)[:, None, None]
+    return np.ascontiguousarray((-1j * norm * H).transpose(1, 2, 0))
+
+
+def _time(fn, sync, repeats, min_time):
+    """Best-of wall time per call, at least `repeats` calls and `min_time` s."""
+    fn()
+    sync()
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeats or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        sync()
+        times.append(time.perf_counter() - t0)
+        if len(times) >= 10 * repeats:
+            break
+    return min(times), float(np.median(times)), len(times)
+
+
+def environment():
+    env = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'blas_threads': {k: os.environ.get(k) for k in
+                         ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')},
+    }
+    try:
+        env['git_revision'] = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        env['git_revision'] = None
+    if HAS_CUPY:
+        props = cp.cuda.runtime.getDeviceProperties(cp.cuda.Device().id)
+        env['cupy'] = cp.__version__
+        env['gpu'] = props['name'].decode() if isinstance(props['name'], bytes) else props['name']
+    return env
+
+
+def run_case(backend, xp, sync, d, B, regime, args):
+    A_host = make_batch(d, B, NORMS[regime])
+    A = xp.asarray(A_host)
+    sample = np.unique(np.linspace(0, B - 1, min(B, args.error_samples)).astype(int))
+    ref = np.stack([expm(A_host[:, :, b]) for b in sample], axis=-1)
+
+    def to_host(arr):
+        return arr.get() if xp is not np else arr
+
+    record = {'backend': backend, 'd': d, 'B': B, 'regime': regime,
+              'norm': NORMS[regime], 'timings': {}, 'max_error': {}}
+
+    ws = BatchedExpmWorkspace(d, B, xp=xp)
+    candidates = {
+        'batched_expm': lambda: batched_expm(A, xp=xp),
+        'workspace': lambda: ws.compute(A),
+    }
+    for name, fn in candidates.items():
+        best, median, n = _time(fn, sync, args.repeats, args.min_time)
+        err = float(np.abs(to_host(fn())[:, :, sample] - ref).max())
+        record['timings'][name] = {'best_s': best, 'median_s': median, 'calls': n,
+                                   'per_matrix_us': 1e6 * best / B}
+        record['max_error'][name] = err
+
+    if backend == 'numpy' and B <= args.scipy_max_batch:
+        def scipy_loop():
+            for b in range(B):
+                expm(A_host[:, :, b])
+        best, median, n = _time(scipy_loop, sync, max(1, args.repeats // 5), args.min_time)
+        record['timings']['scipy'] = {'best_s': best, 'median_s': median, 'calls': n,
+                                      'per_matrix_us': 1e6 * best / B}
+    return record
+
+
+def compare(results, baseline_path, threshold):
+    """Print cases whose best time regressed by more than threshold."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(r):
+        return (r['backend'], r['d'], r['B'], r['regime'])
+
+    old = {key(r): r for r in baseline['results']}
+    n_regressions = 0
+    for r in results:
+        prev = old.get(key(r))
+        if prev is None:
+            continue
+        for name, t in r['timings'].items():
+            if name not in prev['timings']:
+                continue
+            ratio = t['best_s'] / prev['timings'][name]['best_s']
+            if ratio > 1.0 + threshold:
+                n_regressions += 1
+                print(f"REGRESSION {key(r)} {name}: {ratio:.2f}x slower")
+    print(f"{n_regressions} regressions against {baseline_path} (threshold {threshold:.0%})")
+    return n_regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dims', type=int, nargs='+', default=[2, 4, 10, 16, 32])
+    parser.add_argument('--batch-sizes', type=int, nargs='+',
+                        default=[1, 10, 100, 1000, 10000, 100000])
+    parser.add_argument('--regimes', nargs='+', default=list(NORMS), choices=list(NORMS))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds spent timing each case')
+    parser.add_argument('--scipy-max-batch', type=int, default=1000)
+    parser.add_argument('--error-samples', type=int, default=32)
+    parser.add_argument('--max-gb', type=float, default=4.0,
+                        help='skip cases whose workspace would exceed this')
+    parser.add_argument('--quick', action='store_true',
+                        help='small sweep (d in {2, 10}, B up to 1000)')
+    parser.add_argument('--output', default='expm_bench.json')
+    parser.add_argument('--compare', default=None, help='previous JSON result file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slow-down reported as a regression')
+    args = parser.parse_args()
+    if args.quick:
+        args.dims = [2, 10]
+        args.batch_sizes = [1, 100, 1000]
+        args.min_time = 0.05
+
+    backends = [('numpy', np, lambda: None)]
+    if HAS_CUPY:
+        backends.append(('cupy', cp, cp.cuda.Stream.null.synchronize))
+
+    results = []
+    for backend, xp, sync in backends:
+        for d in args.dims:
+            for B in args.batch_sizes:
+                if _BUFFERS * d * d * B * 16 > args.max_gb * 1e9:
+                    print(f"[{backend}] d={d} B={B}: skipped (> {args.max_gb} GB)")
+                    continue
+                for regime in args.regimes:
+                    r = run_case(backend, xp, sync, d, B, regime, args)
+                    results.append(r)
+                    t = r['timings']
+                    line = (f"[{backend}] d={d:3d} B={B:7d} {regime:6s}: "
+                            f"batched_expm {t['batched_expm']['per_matrix_us']:9.2f} us/mat  "
+                            f"workspace {t['workspace']['per_matrix_us']:9.2f} us/mat")
+                    if 'scipy' in t:
+                        line += f"  scipy {t['scipy']['per_matrix_us']:9.2f} us/mat"
+                    line += f"  err {max(r['max_error'].values()):.1e}"
+                    print(line, flush=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=1)
+    print(f"Wrote {len(results)} cases to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
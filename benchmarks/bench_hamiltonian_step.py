@@ -0,0 +1,126 @@
+"""Kernel count and time of the TME Hamiltonian step (rho and drho).
+
+'separate' is the previous scheme: U^dag = conj(U).T is materialised every
+step and rho, drho are conjugated one after the other (four batched
+products). 'fused' is StrangSplitIntegrator._hamiltonian_step on the
+[d, d, B, 2] stack: two batched gemm calls for both states and, on CuPy,
+no U^dag copy (cuBLAS applies U^H directly). Launches are counted by
+wrapping the backend's batched-product entry points. Run as:
+
+    python benchmarks/bench_hamiltonian_step.py [--d 10] [--B 4096]
+"""
+import argparse
+import contextlib
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin import integrator_strang
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState, make_problem
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+class _Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def wrap(self, fn):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return fn(*args, **kwargs)
+        return counted
+
+
+@contextlib.contextmanager
+def count_launches(xp, counter):
+    """Count batched matmul/einsum/gemmBatched calls issued inside the block."""
+    patches = [(xp, 'matmul'), (xp, 'einsum')]
+    if xp is not np:
+        table = integrator_strang._GEMM_BATCHED
+        saved_table = dict(table)
+        for key, fn in table.items():
+            table[key] = counter.wrap(fn)
+    saved = [(mod, name, getattr(mod, name)) for mod, name in patches]
+    for mod, name, fn in saved:
+        setattr(mod, name, counter.wrap(fn))
+    try:
+        yield counter
+    finally:
+        for mod, name, fn in saved:
+            setattr(mod, name, fn)
+        if xp is not np:
+            table.update(saved_table)
+
+
+def separate_step(integ, rho, drho, xp):
+    """Previous scheme: U^dag copy + two products per state."""
+    integ._Udag[:] = integ._U.conj().transpose(1, 0, 2)
+    integrator_strang._bmm(integ._U, rho, integ._tmp, xp)
+    integrator_strang._bmm(integ._tmp, integ._Udag, rho, xp)
+    integrator_strang._bmm(integ._U, drho, integ._tmp, xp)
+    integrator_strang._bmm(integ._tmp, integ._Udag, drho, xp)
+    return 2  # conj + copy into U^dag
+
+
+def fused_step(integ, pair, pair_tmp, xp):
+    copies = 0
+    if integ._needs_udag:
+        integ._Udag[:] = integ._U.conj().transpose(1, 0, 2)
+        copies = 2
+    integ._hamiltonian_step(pair, tmp=pair_tmp)
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=4096)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+    d, B = args.d, args.B
+
+    backends = [('numpy', np, lambda: None)]
+    if HAS_CUPY:
+        backends.append(('cupy', cp, cp.cuda.Stream.null.synchronize))
+
+    for name, xp, sync in backends:
+        H_callback, collapse_ops, rho0 = make_problem(d, B, xp)
+        integ = StrangSplitIntegrator(H_callback, collapse_ops, B, d, TemplateState(), xp=xp)
+        integ._fill_propagator(0, 1e-3)
+
+        pair = xp.zeros((d, d, B, 2), dtype=xp.complex128, order='F')
+        pair[..., 0] = xp.asarray(rho0)
+        pair[..., 1] = xp.asarray(rho0)
+        pair_tmp = xp.zeros_like(pair)
+        rho, drho = pair[..., 0], pair[..., 1]
+
+        runs = {
+            'separate': lambda: separate_step(integ, rho, drho, xp),
+            'fused': lambda: fused_step(integ, pair, pair_tmp, xp),
+        }
+        results = {}
+        for label, run in runs.items():
+            counter = _Counter()
+            with count_launches(xp, counter):
+                copies = run()
+            run()
+            sync()
+            t0 = time.perf_counter()
+            for _ in range(args.repeats):
+                run()
+            sync()
+            elapsed = (time.perf_counter() - t0) / args.repeats
+            results[label] = elapsed
+            print(f"[{name}] {label:8s}: {counter.calls} batched products + {copies} "
+                  f"elementwise passes per step, {elapsed * 1e3:8.3f} ms/step")
+        print(f"[{name}] speed-up {results['separate'] / results['fused']:.2f}x  (d={d}, B={B})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""CPU (NumPy backend) throughput of StrangSplitIntegrator.
+
+Reports steps/second per batch size. BLAS threading is controlled the
+usual way (OMP_NUM_THREADS / OPENBLAS_NUM_THREADS / MKL_NUM_THREADS).
+Run as:
+
+    python benchmarks/bench_integrator_cpu.py [--d 10] [--Nt 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState, make_problem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--Nt', type=int, default=200)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 128, 1024])
+    args = parser.parse_args()
+
+    for B in args.batch_sizes:
+        H_callback, collapse_ops, rho0 = make_problem(args.d, B)
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, B, args.d,
+                                           TemplateState(), xp=np)
+        integrator.integrate(1.0, 3, rho0)
+        t0 = time.perf_counter()
+        integrator.integrate(1.0, args.Nt, rho0)
+        elapsed = time.perf_counter() - t0
+        steps = args.Nt - 1
+        print(f"d={args.d} B={B:6d}: {steps / elapsed:9.1f} steps/s  "
+              f"{steps * B / elapsed:11.1f} element-steps/s")
+
+
+if __name__ == '__main__':
+    main()
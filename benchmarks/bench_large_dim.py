@@ -0,0 +1,100 @@
+"""Propagator engines at larger Hilbert space dimension.
+
+Times one Strang step (Euler dissipator) of StrangSplitIntegrator with
+propagator='pade', 'eigh' and 'chebyshev' for spin-chain sized d, and
+reports the deviation of each from 'eigh' after a few steps. The
+Hamiltonian is a random Heisenberg-like chain with the usual short time
+step (||H dt|| ~ 0.1-1), where the Chebyshev series needs ~10-20 terms.
+Run as:
+
+    python benchmarks/bench_large_dim.py [--dims 16 64 128] [--B 8] [--steps 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState
+
+if HAS_CUPY:
+    import cupy as xp
+    sync = xp.cuda.Stream.null.synchronize
+else:
+    xp = np
+
+    def sync():
+        pass
+
+
+def spin_chain(n_spins, B, seed=0):
+    """Random-coupling XXZ chains H_b [d, d, B], d = 2**n_spins (MHz units)."""
+    rng = np.random.default_rng(seed)
+    sx = np.array([[0, 1], [1, 0]], dtype=complex) / 2
+    sy = np.array([[0, -1j], [1j, 0]], dtype=complex) / 2
+    sz = np.array([[1, 0], [0, -1]], dtype=complex) / 2
+
+    def site(op, i):
+        out = np.eye(1)
+        for k in range(n_spins):
+            out = np.kron(out, op if k == i else np.eye(2))
+        return out
+
+    d = 2 ** n_spins
+    H = np.zeros((d, d, B), dtype=complex)
+    for b in range(B):
+        for i in range(n_spins):
+            H[:, :, b] += rng.uniform(-5, 5) * site(sz, i)
+            if i + 1 < n_spins:
+                J = rng.uniform(0.5, 2.0)
+                for op in (sx, sy, sz):
+                    H[:, :, b] += J * site(op, i) @ site(op, i + 1)
+    return np.asfortranarray(H)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dims', type=int, nargs='+', default=[16, 64, 128])
+    parser.add_argument('--B', type=int, default=8)
+    parser.add_argument('--steps', type=int, default=5)
+    parser.add_argument('--dt', type=float, default=0.01)
+    args = parser.parse_args()
+
+    for d in args.dims:
+        n_spins = int(np.log2(d))
+        H0 = xp.asarray(spin_chain(n_spins, args.B), order='F')
+
+        def H_callback(ti, B, out):
+            out[...] = H0
+
+        L = xp.zeros((d, d, args.B), dtype=xp.complex128, order='F')
+        L[0, 1, :] = 1.0
+        collapse_ops = [(L, xp.full(args.B, 0.01))]
+        rho0 = xp.zeros((d, d, args.B), dtype=xp.complex128, order='F')
+        rho0[...] = xp.eye(d)[:, :, None] / d
+        rho0[0, 0, :] += 0.5
+        rho0[1, 1, :] -= 0.5
+
+        T = args.dt * args.steps
+        finals = {}
+        for engine in ('eigh', 'pade', 'chebyshev'):
+            integ = StrangSplitIntegrator(H_callback, collapse_ops, args.B, d,
+                                          TemplateState(), xp=xp, propagator=engine)
+            integ.integrate(args.dt, 2, rho0)
+            sync()
+            t0 = time.perf_counter()
+            sol = integ.integrate(T, args.steps + 1, rho0)
+            sync()
+            per_step = (time.perf_counter() - t0) / args.steps
+            finals[engine] = sol[-1].numpy()
+            extra = f" ({integ._U.n_terms} terms)" if engine == 'chebyshev' else ""
+            err = np.abs(finals[engine] - finals['eigh']).max()
+            print(f"d={d:4d} B={args.B}: {engine:9s} {per_step * 1e3:9.2f} ms/step  "
+                  f"max |rho - rho_eigh| {err:.1e}{extra}")
+
+
+if __name__ == '__main__':
+    main()
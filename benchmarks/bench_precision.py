@@ -0,0 +1,87 @@
+"""Speed/accuracy of precision='double' / 'single' / 'mixed'.
+
+Part 1 times BatchedExpmWorkspace.compute over a range of 1-norms and
+reports the max error against scipy.linalg.expm. Part 2 runs a short
+StrangSplitIntegrator.integrate and reports throughput and the max
+deviation of the trajectory from the double-precision run. Run as:
+
+    python benchmarks/bench_precision.py [--d 10] [--B 4096] [--Nt 200]
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.linalg import expm
+
+import _path  # noqa: F401
+from silospin.batched_expm import BatchedExpmWorkspace, HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from bench_expm_pade_order import make_batch
+from problems import TemplateState, make_problem
+
+if HAS_CUPY:
+    import cupy as cp
+
+PRECISIONS = ('double', 'single', 'mixed')
+
+
+def bench_expm(xp, sync, d, B, repeats, label):
+    for norm in (1e-2, 0.8, 5.0, 50.0):
+        A_host = make_batch(d, B, norm)
+        A = xp.asarray(A_host)
+        ref = np.stack([expm(A_host[:, :, b]) for b in range(0, B, 97)], axis=-1)
+        row = []
+        for precision in PRECISIONS:
+            ws = BatchedExpmWorkspace(d, B, xp=xp, precision=precision)
+            ws.compute(A)
+            sync()
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                U = ws.compute(A)
+            sync()
+            elapsed = (time.perf_counter() - t0) / repeats
+            U = U.get() if xp is not np else U
+            err = np.abs(U[:, :, ::97] - ref).max()
+            row.append(f"{precision} {elapsed * 1e3:7.2f} ms err {err:.1e}")
+        print(f"[{label}] expm ||A||_1={norm:6.3g}: " + "  |  ".join(row))
+
+
+def bench_integrator(xp, sync, d, B, Nt, label):
+    H_callback, collapse_ops, rho0 = make_problem(d, B, xp)
+
+    sols = {}
+    for precision in PRECISIONS:
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, B, d, TemplateState(),
+                                           xp=xp, precision=precision)
+        integrator.integrate(1.0, 3, rho0)
+        sync()
+        t0 = time.perf_counter()
+        sols[precision] = integrator.integrate(1.0, Nt, rho0).numpy()
+        sync()
+        elapsed = time.perf_counter() - t0
+        err = np.abs(sols[precision] - sols['double']).max()
+        print(f"[{label}] integrate {precision:6s}: {(Nt - 1) / elapsed:8.1f} steps/s  "
+              f"snapshot {sols[precision].dtype.itemsize:2d} B/elem  "
+              f"max |rho - rho_double| {err:.1e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=4096)
+    parser.add_argument('--Nt', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    backends = [('numpy', np, lambda: None)]
+    if HAS_CUPY:
+        backends.append(('cupy', cp, cp.cuda.Stream.null.synchronize))
+
+    for name, xp, sync in backends:
+        bench_expm(xp, sync, args.d, args.B, args.repeats, name)
+        bench_integrator(xp, sync, args.d, args.B, args.Nt, name)
+
+
+if __name__ == '__main__':
+    main()
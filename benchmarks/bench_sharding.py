@@ -0,0 +1,60 @@
+"""Scaling of ShardedStrangIntegrator over 1..N worker processes.
+
+Runs the same problem (fixed total batch B) with an increasing number of
+shards and reports wall time, speed-up and parallel efficiency
+T(1) / (n * T(n)). Pass --devices to shard over GPUs instead of CPU
+processes. Run as:
+
+    OMP_NUM_THREADS=1 python benchmarks/bench_sharding.py [--B 512] [--max-workers 4]
+"""
+import argparse
+import functools
+import os
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.integrator_strang import StrangSplitIntegrator
+from silospin.sharded_integrator import ShardedStrangIntegrator
+
+from problems import TemplateState, make_problem
+
+
+def build_shard(start, stop, d, B, use_gpu):
+    xp = np
+    if use_gpu:
+        import cupy as xp
+    H_callback, collapse_ops, rho0 = make_problem(d, B, xp, batch=slice(start, stop))
+    integrator = StrangSplitIntegrator(H_callback, collapse_ops, stop - start, d,
+                                       TemplateState(), xp=xp)
+    return integrator, rho0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=512)
+    parser.add_argument('--Nt', type=int, default=200)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--devices', type=int, nargs='+', default=None)
+    args = parser.parse_args()
+
+    factory = functools.partial(build_shard, d=args.d, B=args.B,
+                                use_gpu=args.devices is not None)
+    print(f"d={args.d} B={args.B} Nt={args.Nt}")
+    print(f"{'workers':>8} {'wall s':>9} {'shard s':>9} {'speed-up':>9} {'efficiency':>10}")
+    base = None
+    n = 1
+    while n <= args.max_workers:
+        sharded = ShardedStrangIntegrator(factory, args.B, n_workers=n, devices=args.devices)
+        sharded.integrate(1.0, args.Nt)
+        # Process start-up is excluded: compare the slowest shard's integration time
+        t = max(sharded.shard_times)
+        base = base or t
+        print(f"{n:8d} {sharded.wall_time:9.2f} {t:9.2f} {base / t:9.2f} "
+              f"{base / (n * t):10.2f}")
+        n *= 2
+
+
+if __name__ == '__main__':
+    main()
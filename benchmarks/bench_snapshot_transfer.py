@@ -0,0 +1,54 @@
+"""Snapshot transfer throughput of StrangSplitIntegrator.integrate.
+
+Compares chunk_size=1 (one D2H copy per step, the old behaviour) against
+chunked asynchronous transfers through pinned memory, for full and packed
+(Hermitian triangle) snapshot storage. Requires CuPy and a GPU. Run as:
+
+    python benchmarks/bench_snapshot_transfer.py [--B 2048] [--Nt 2000] [--storage full packed]
+"""
+import argparse
+import sys
+import time
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+
+from problems import TemplateState, make_problem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=2048)
+    parser.add_argument('--Nt', type=int, default=2000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1, 50, 500])
+    parser.add_argument('--storage', nargs='+', default=['full', 'packed'])
+    args = parser.parse_args()
+
+    if not HAS_CUPY:
+        print("CuPy not available, skipping")
+        sys.exit(0)
+    import cupy as cp
+    from silospin.integrator_strang import StrangSplitIntegrator
+
+    H_callback, collapse_ops, rho0 = make_problem(args.d, args.B, cp)
+    for storage in args.storage:
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, args.B, args.d,
+                                           TemplateState(), storage=storage)
+        integrator.integrate(1.0, 10, rho0)
+
+        # Packed snapshots hold d² reals instead of d² complex entries
+        bytes_per_entry = 8 if storage == 'packed' else 16
+        mb = args.Nt * args.B * args.d ** 2 * bytes_per_entry / 1e6
+        for chunk_size in args.chunk_sizes:
+            cp.cuda.Device().synchronize()
+            t0 = time.perf_counter()
+            integrator.integrate(1.0, args.Nt, rho0, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - t0
+            print(f"{storage:6s} chunk_size={chunk_size:5d}: {elapsed:7.2f} s  "
+                  f"{(args.Nt - 1) / elapsed:8.1f} steps/s  {mb:8.1f} MB copied "
+                  f"({mb / elapsed:8.1f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Accuracy vs cost of Strang (2nd order) and Yoshida (4th order) steps.
+
+Integrates a time-independent Lindblad problem with dissipator='exact' for
+increasing Nt and reports the final-state error against a fine Yoshida
+reference together with the wall time, so equal-error step counts can be
+read off directly. Uses CuPy when available, else NumPy. Run as:
+
+    python benchmarks/bench_splitting_order.py [--d 10] [--B 256]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import StrangSplitIntegrator
+
+from problems import TemplateState, make_problem
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--d', type=int, default=10)
+    parser.add_argument('--B', type=int, default=256)
+    parser.add_argument('--T', type=float, default=2.0)
+    parser.add_argument('--nts', type=int, nargs='+', default=[26, 51, 101, 201, 401, 801])
+    args = parser.parse_args()
+
+    xp = cp if HAS_CUPY else np
+    to_host = (lambda a: a.get()) if HAS_CUPY else np.asarray
+    # Time-independent H, two decay channels
+    H_callback, collapse_ops, rho0 = make_problem(args.d, args.B, xp, drift=0.0, rates=(0.2, 0.3))
+
+    def run(scheme, Nt):
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, args.B, args.d,
+                                           TemplateState(), xp=xp, dissipator='exact',
+                                           scheme=scheme)
+        final = {}
+        t0 = time.perf_counter()
+        integrator.integrate_observables(
+            args.T, Nt, rho0, stride=Nt - 1,
+            callback=lambda ti, t, rho: final.__setitem__(ti, to_host(rho).copy()))
+        elapsed = time.perf_counter() - t0
+        return final[Nt - 1], elapsed
+
+    ref, _ = run('yoshida4', 8 * max(args.nts))
+    for scheme in ('strang', 'yoshida4'):
+        for Nt in args.nts:
+            rho_T, elapsed = run(scheme, Nt)
+            err = np.abs(rho_T - ref).max()
+            print(f"{scheme:9s} Nt={Nt:6d}: max err {err:9.2e}  time {elapsed:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Per-wave vs per-core vs per-device waveform upload on a mock data server.
+
+MockDataServer stands in for a ziDAQServer connection: every call costs a
+fixed round-trip latency plus the payload at a given bandwidth, and the
+calls are counted. The waveforms are interleaved int16 vectors of the size
+zhinst.utils.convert_awg_waveform produces. Run as:
+
+    python benchmarks/bench_waveform_upload.py [--devices 2] [--cores 4] [--waves 200]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.quantum_compiler.waveform_upload import upload_waveforms, waveform_settings
+
+
+class MockDataServer:
+    """Counts set/setVector calls and sleeps for latency + bytes / bandwidth."""
+
+    def __init__(self, latency, bandwidth):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.round_trips = 0
+        self.nodes = {}
+
+    def _transfer(self, nbytes):
+        self.round_trips += 1
+        time.sleep(self.latency + nbytes / self.bandwidth)
+
+    def setVector(self, path, value):
+        self._transfer(value.nbytes)
+        self.nodes[path] = value
+
+    def set(self, settings):
+        self._transfer(sum(value.nbytes for _, value in settings))
+        self.nodes.update(settings)
+
+
+def make_waveforms(n_waves, n_samples, seed=0):
+    """Waveforms of one core keyed by wave index, interleaved int16 (2 channels)."""
+    rng = np.random.default_rng(seed)
+    return {i: rng.integers(-2**15, 2**15, size=2 * n_samples, dtype=np.int16)
+            for i in range(n_waves)}
+
+
+def run(mode, devices, args):
+    daq = MockDataServer(args.latency * 1e-3, args.bandwidth * 1e6)
+    t0 = time.perf_counter()
+    for device_id, cores in devices.items():
+        if mode == 'device':
+            settings = []
+            for core_idx, waves in cores.items():
+                settings += waveform_settings(device_id, core_idx, waves)
+            upload_waveforms(daq, settings)
+        else:
+            for core_idx, waves in cores.items():
+                upload_waveforms(daq, waveform_settings(device_id, core_idx, waves),
+                                 batched=mode == 'core')
+    return time.perf_counter() - t0, daq
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--devices', type=int, default=2)
+    parser.add_argument('--cores', type=int, default=4)
+    parser.add_argument('--waves', type=int, default=200, help='waveforms per core')
+    parser.add_argument('--samples', type=int, default=96, help='samples per waveform')
+    parser.add_argument('--latency', type=float, default=2.0, help='round trip latency in ms')
+    parser.add_argument('--bandwidth', type=float, default=100.0, help='MB/s')
+    args = parser.parse_args()
+
+    devices = {f"dev{8000 + k}": {core: make_waveforms(args.waves, args.samples, seed=10 * k + core)
+                                  for core in range(1, args.cores + 1)}
+               for k in range(args.devices)}
+    n_waves = args.devices * args.cores * args.waves
+    print(f"{args.devices} devices x {args.cores} cores x {args.waves} waves "
+          f"({args.samples} samples), latency {args.latency} ms, {args.bandwidth} MB/s")
+
+    reference = None
+    for mode in ('wave', 'core', 'device'):
+        wall, daq = run(mode, devices, args)
+        if reference is None:
+            reference = (wall, daq.round_trips)
+        assert len(daq.nodes) == n_waves
+        print(f"  {mode:6s}: {daq.round_trips:5d} round trips "
+              f"({reference[1] - daq.round_trips:5d} saved)  {wall*1e3:8.1f} ms  "
+              f"speedup {reference[0] / wall:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
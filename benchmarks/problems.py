@@ -0,0 +1,59 @@
+"""Test problems shared by the integrator benchmarks.
+
+make_problem builds the usual random open system: H(t) = H0 * (1 + drift*t)
+with a random Hermitian H0 per batch element, decay operators
+L_k = |k><k+1| with rates[k], and rho0 = |1><1|. Arrays are [d, d, B],
+F-ordered, on the array module xp (numpy or cupy).
+"""
+import numpy as np
+
+import _path  # noqa: F401
+from silospin.batched_expm import HAS_CUPY
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+class TemplateState:
+    """Minimal state template: StrangSplitIntegrator only calls clone()."""
+
+    def clone(self, arr):
+        return arr
+
+
+class HCallback:
+    """H(ti) = H0 * (1 + drift*ti), written into out. Picklable (sharded runs)."""
+
+    def __init__(self, H0, drift=0.01):
+        self.H0 = H0
+        self.drift = drift
+
+    def __call__(self, ti, B, out):
+        xp = cp.get_array_module(out) if HAS_CUPY else np
+        xp.multiply(self.H0, 1.0 + self.drift * ti, out=out)
+
+
+def random_hermitian(d, B, seed=0):
+    """Random Hermitian matrices [d, d, B] (NumPy, complex128)."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    return 0.5 * (X + X.conj().transpose(1, 0, 2))
+
+
+def make_problem(d, B, xp=np, seed=0, drift=0.01, rates=(0.1,), batch=slice(None)):
+    """
+    (H_callback, collapse_ops, rho0) of the benchmark problem (see module docstring).
+
+    batch selects a slice of the B batch elements (one shard of the full
+    problem); the arrays then have the length of that slice.
+    """
+    H0 = random_hermitian(d, B, seed)[:, :, batch]
+    n = H0.shape[2]
+    collapse_ops = []
+    for k, rate in enumerate(rates):
+        L = np.zeros((d, d, n), dtype=np.complex128)
+        L[k, k + 1, :] = 1.0
+        collapse_ops.append((xp.asarray(L, order='F'), xp.full(n, rate)))
+    rho0 = np.zeros((d, d, n), dtype=np.complex128)
+    rho0[1, 1, :] = 1.0
+    return HCallback(xp.asarray(H0, order='F'), drift), collapse_ops, xp.asarray(rho0, order='F')
@@ -1,8 +1,16 @@
 """Batched matrix exponential for small dense matrices.
 
-Implements Padé[13,13] scaling-and-squaring (Higham 2005) for batched
-complex matrices. Designed for d=10 NV Hamiltonian propagators where
-B (batch) can be large but d is small.
+Implements Padé scaling-and-squaring (Higham 2005) for batched complex
+matrices. The Padé degree is picked from {3, 5, 7, 9, 13} using Higham's
+theta_m table, so small-norm inputs (short time steps) only pay for the
+cheapest approximant that is accurate to double precision. Designed for
+d=10 NV Hamiltonian propagators where B (batch) can be large but d is small.
+For Hermitian generators, batched_expm_hermitian diagonalises instead.
+
+precision='single' runs everything in complex64 with the single-precision
+theta_m table (degrees 3, 5, 7); precision='mixed' evaluates the Padé
+approximant in complex64 and promotes to complex128 for the repeated
+squaring, where rounding errors accumulate.
 
 Both CuPy (GPU) and NumPy (CPU) backends are provided.
 """
@@ -14,6 +22,28 @@ try:
 except ImportError:
     HAS_CUPY = False
 
+if HAS_CUPY:
+    from cupy.cuda import device as cuda_device
+    from cupy_backends.cuda.libs import cublas
+
+    _GETRF_BATCHED = {
+        np.dtype(np.complex128): cublas.zgetrfBatched,
+        np.dtype(np.complex64): cublas.cgetrfBatched,
+    }
+    _GETRS_BATCHED = {
+        np.dtype(np.complex128): cublas.zgetrsBatched,
+        np.dtype(np.complex64): cublas.cgetrsBatched,
+    }
+
+    # y += a * x in a single pass
+    _axpy_kernel = cp.ElementwiseKernel('T x, T a', 'T y', 'y += a * x', 'silospin_axpy')
+
+try:
+    # gufunc behind np.linalg.solve; unlike the wrapper it accepts out=
+    from numpy.linalg._umath_linalg import solve as _np_solve_gufunc
+except ImportError:  # pragma: no cover
+    _np_solve_gufunc = None
+
 # Padé[13,13] coefficients from Higham (2005), Table 10.4
 _PADE13_COEFFS = [
     1.0,
@@ -32,9 +62,57 @@ _PADE13_COEFFS = [
     1.544049750670308885e-17,
 ]
 
+# Padé[m,m] coefficients for m = 3, 5, 7, 9 from Higham (2005), eq. (2.11).
+# Only the ratio p_m / q_m matters, so they are left unnormalised.
+_PADE_COEFFS = {
+    3: [120.0, 60.0, 12.0, 1.0],
+    5: [30240.0, 15120.0, 3360.0, 420.0, 30.0, 1.0],
+    7: [17297280.0, 8648640.0, 1995840.0, 277200.0, 25200.0, 1512.0, 56.0,
+        1.0],
+    9: [17643225600.0, 8821612800.0, 2075673600.0, 302702400.0, 30270240.0,
+        2162160.0, 110880.0, 3960.0, 90.0, 1.0],
+    13: _PADE13_COEFFS,
+}
+
 # theta_13 from Al-Mohy and Higham (2010), Table 2.3
 _THETA_13 = 5.371920351148152
 
+# theta_m from Higham (2005), Table 2.3: largest 1-norm for which Padé[m,m]
+# reaches double-precision backward error without scaling.
+_THETA = {
+    3: 1.495585217958292e-2,
+    5: 2.539398330063230e-1,
+    7: 9.504178996162932e-1,
+    9: 2.097847961257068e0,
+    13: _THETA_13,
+}
+
+_PADE_ORDERS = (3, 5, 7, 9, 13)
+
+# theta_m for single precision (u = 2^-24), Higham (2005), Table 2.3. Degree
+# 7 is already optimal there, so higher degrees are never picked adaptively.
+_THETA_SINGLE = {
+    3: 4.258730016922831e-1,
+    5: 1.880152677804762e0,
+    7: 3.925724783138660e0,
+}
+_PADE_ORDERS_SINGLE = (3, 5, 7)
+
+# Supported precisions: (Padé dtype, squaring/result dtype)
+#   'double' - complex128 throughout
+#   'single' - complex64 throughout
+#   'mixed'  - complex64 Padé, complex128 squaring and result
+_PRECISIONS = {
+    'double': (np.complex128, np.complex128),
+    'single': (np.complex64, np.complex64),
+    'mixed': (np.complex64, np.complex128),
+}
+
+# Supported scaling modes:
+#   'global'  - one squaring count s from the largest 1-norm in the batch
+#   'bucketed' - per-element s_b; element b is only squared s_b times
+_SCALING_MODES = ('global', 'bucketed')
+
 
 def _batched_matmul(A, B, xp):
     """Batched matrix multiply: A[d,d,B] @ B[d,d,B] -> [d,d,B]."""
@@ -47,6 +125,100 @@ def _batched_matmul_out(A, B, out, xp):
     return out
 
 
+def _check_scaling(scaling):
+    if scaling not in _SCALING_MODES:
+        raise ValueError(
+            f"Unknown scaling mode {scaling!r}, expected one of {_SCALING_MODES}"
+        )
+
+
+def _check_precision(precision):
+    if precision not in _PRECISIONS:
+        raise ValueError(
+            f"Unknown precision {precision!r}, expected one of {tuple(_PRECISIONS)}"
+        )
+    return _PRECISIONS[precision]
+
+
+def _theta_table(precision):
+    """theta_m for the precision the Padé approximant is evaluated in."""
+    if precision == 'double':
+        return _THETA
+    # Degrees without a single-precision bound keep the (stricter) double one
+    return {**_THETA, **_THETA_SINGLE}
+
+
+def _candidate_orders(pade_order, precision='double'):
+    """Padé degrees to choose from, cheapest first."""
+    if pade_order == 'adaptive':
+        return _PADE_ORDERS if precision == 'double' else _PADE_ORDERS_SINGLE
+    if pade_order in _PADE_ORDERS:
+        return (pade_order,)
+    raise ValueError(
+        f"Unknown pade_order {pade_order!r}, expected 'adaptive' or one of {_PADE_ORDERS}"
+    )
+
+
+def _select_pade_order(norm, orders, theta=_THETA):
+    """Cheapest order with norm <= theta_m, else the highest one."""
+    for m in orders[:-1]:
+        if norm <= theta[m]:
+            return m
+    return orders[-1]
+
+
+def _pade_orders_per_element(norms, orders, xp, theta=_THETA):
+    """Per-element version of _select_pade_order."""
+    m_b = xp.full(norms.shape, orders[-1], dtype=np.int64)
+    for m in reversed(orders[:-1]):
+        m_b[norms <= theta[m]] = m
+    return m_b
+
+
+def _squaring_exponents(norms, theta, xp):
+    """Per-element squaring counts s_b = max(0, ceil(log2(norm_b / theta)))."""
+    norms = xp.maximum(norms, np.finfo(np.float64).tiny)
+    s = xp.ceil(xp.log2(norms / theta))
+    return xp.maximum(s, 0).astype(np.int64)
+
+
+def _square_by_bucket(result, s, xp):
+    """Square result[:, :, b] in place s[b] times.
+
+    At pass k only the elements with s_b > k are gathered and squared, so
+    the total work is sum(s_b) matrix products instead of B * max(s_b).
+    """
+    B_batch = result.shape[2]
+    s_max = int(s.max())
+    for k in range(s_max):
+        idx = xp.nonzero(s > k)[0]
+        if idx.size == B_batch:
+            result[:] = _batched_matmul(result, result, xp)
+        else:
+            sub = result[:, :, idx]
+            result[:, :, idx] = _batched_matmul(sub, sub, xp)
+    return result
+
+
+def _add_identity(X, c):
+    """X[b] += c * I in place for X [B, d, d].
+
+    One 1-D strided update per diagonal entry; a [B, d] diagonal view would
+    make NumPy buffer the in-place operation.
+    """
+    for i in range(X.shape[1]):
+        X[:, i, i] += c
+
+
+def _np_solve(a, b, out):
+    """Batched solve a @ X = b into out (NumPy, [B, d, d] stacks)."""
+    if _np_solve_gufunc is None:
+        out[...] = np.linalg.solve(a, b)
+    else:
+        _np_solve_gufunc(a, b, out=out)
+    return out
+
+
 def _batched_eye(d, B, dtype, xp):
     """Create batched identity: I[d,d,B]."""
     I = xp.zeros((d, d, B), dtype=dtype)
@@ -59,123 +231,336 @@ class BatchedExpmWorkspace:
     """Pre-allocated workspace for batched_expm to avoid memory fragmentation.
 
     Create once, reuse across all time steps.
+
+    All buffers are kept batch-first, [B, d, d] C-contiguous, so every
+    product is one stacked matmul written into its output buffer, the
+    linear combinations of powers are fused axpy updates and the LU solve
+    writes straight into the result: with scaling='global', compute()
+    allocates no array memory after construction. self.result is a
+    [d, d, B] view of the batch-first result buffer.
+
+    Parameters
+    ----------
+    d : int
+        Matrix dimension.
+    B : int
+        Batch size.
+    xp : module, optional
+        Array module (cupy or numpy). Defaults to cupy when available.
+    scaling : str
+        'global' squares every element by the count required by the largest
+        1-norm in the batch. 'bucketed' picks a squaring count per element
+        and only squares the elements that need it, which is cheaper for
+        batches with a few large-norm outliers (sorting the batch by norm
+        allocates a few [B] index arrays per call).
+    pade_order : 'adaptive' or int
+        'adaptive' uses the cheapest Padé degree in {3, 5, 7, 9, 13} whose
+        theta_m bounds the 1-norm (per batch for 'global' scaling, per
+        element for 'bucketed'). An int fixes the degree.
+    precision : str
+        'double' (default), 'single' or 'mixed'. See _PRECISIONS. The
+        result is complex64 for 'single' and complex128 otherwise.
     """
 
-    def __init__(self, d, B, xp=None):
+    def __init__(self, d, B, xp=None, scaling='global', pade_order='adaptive',
+                 precision='double'):
         if xp is None:
             xp = cp if HAS_CUPY else np
+        _check_scaling(scaling)
+        dtype, result_dtype = _check_precision(precision)
         self.xp = xp
         self.d = d
         self.B = B
-        dtype = np.complex128
-
-        # Padé workspace [d, d, B]
-        self.A_scaled = xp.zeros((d, d, B), dtype=dtype)
-        self.A2 = xp.zeros((d, d, B), dtype=dtype)
-        self.A4 = xp.zeros((d, d, B), dtype=dtype)
-        self.A6 = xp.zeros((d, d, B), dtype=dtype)
-        self.W1 = xp.zeros((d, d, B), dtype=dtype)
-        self.W2 = xp.zeros((d, d, B), dtype=dtype)
-        self.W = xp.zeros((d, d, B), dtype=dtype)
-        self.U = xp.zeros((d, d, B), dtype=dtype)
-        self.V = xp.zeros((d, d, B), dtype=dtype)
-        self.p13 = xp.zeros((d, d, B), dtype=dtype)
-        self.q13 = xp.zeros((d, d, B), dtype=dtype)
-        self.I = _batched_eye(d, B, dtype, xp)
-        self.result = xp.zeros((d, d, B), dtype=dtype)
-        self.tmp = xp.zeros((d, d, B), dtype=dtype)
-
-        # Transposed workspace for solve [B, d, d]
-        self.q13_t = xp.zeros((B, d, d), dtype=dtype)
-        self.p13_t = xp.zeros((B, d, d), dtype=dtype)
+        self.scaling = scaling
+        self.pade_order = pade_order
+        self.precision = precision
+        self.dtype = np.dtype(dtype)
+        self._orders = _candidate_orders(pade_order, precision)
+        self._theta = _theta_table(precision)
+
+        # Padé workspace [B, d, d]
+        shape = (B, d, d)
+        self.A_scaled = xp.zeros(shape, dtype=dtype)
+        self.A2 = xp.zeros(shape, dtype=dtype)
+        self.A4 = xp.zeros(shape, dtype=dtype)
+        self.A6 = xp.zeros(shape, dtype=dtype)
+        self.A8 = xp.zeros(shape, dtype=dtype)
+        self.W1 = xp.zeros(shape, dtype=dtype)
+        self.W2 = xp.zeros(shape, dtype=dtype)
+        self.W = xp.zeros(shape, dtype=dtype)
+        self.U = xp.zeros(shape, dtype=dtype)
+        self.V = xp.zeros(shape, dtype=dtype)
+        self.q13 = xp.zeros(shape, dtype=dtype)
+        # Squaring runs in result_dtype
+        self.result_t = xp.zeros(shape, dtype=result_dtype)
+        self.tmp = xp.zeros(shape, dtype=result_dtype)
+        self.result = self.result_t.transpose(1, 2, 0)
+        # getrsBatched overwrites the right-hand side, so on CuPy p13 *is*
+        # the result when no precision change is needed
+        if xp is not np and self.dtype == np.dtype(result_dtype):
+            self.p13 = self.result_t
+        else:
+            self.p13 = xp.zeros(shape, dtype=dtype)
+
+        # 1-norm workspace
+        real = self.A_scaled.real.dtype
+        self._abs = xp.zeros(shape, dtype=real)
+        self._colsum = xp.zeros((B, d), dtype=real)
+        self.norms = xp.zeros(B, dtype=real)
+        self._max_norm = xp.zeros((), dtype=real)
+
+        if xp is not np:
+            self._init_cublas_solve()
+
+    def _init_cublas_solve(self):
+        """Pivot, info and matrix pointer arrays of the batched LU solve."""
+        d, B = self.d, self.B
+        step = np.uint64(d * d * self.dtype.itemsize)
+        idx = np.arange(B, dtype=np.uint64)
+        self._q_ptrs = cp.asarray(np.uint64(self.q13.data.ptr) + step * idx)
+        self._p_ptrs = cp.asarray(np.uint64(self.p13.data.ptr) + step * idx)
+        self._pivots = cp.zeros((B, d), dtype=np.int32)
+        self._lu_info = cp.zeros(B, dtype=np.int32)
+        self._solve_info = np.zeros(1, dtype=np.int32)
+
+    def _axpy(self, y, a, x):
+        """y += a * x in place (one fused kernel on CuPy)."""
+        if self.xp is np:
+            # q13 is free until the end of _pade
+            scratch = self.q13[:x.shape[0]]
+            np.multiply(x, a, out=scratch)
+            y += scratch
+        else:
+            _axpy_kernel(x, self.dtype.type(a), y)
 
-    def compute(self, A):
-        """Compute expm(A) using pre-allocated buffers. Returns self.result."""
+    def _combine(self, out, coeffs, powers, identity):
+        """out = sum_k coeffs[k] * powers[k] + identity * I, without temporaries."""
+        self.xp.multiply(powers[0], coeffs[0], out=out)
+        for c, P in zip(coeffs[1:], powers[1:]):
+            self._axpy(out, c, P)
+        _add_identity(out, identity)
+
+    def _pade13(self, sl):
+        """U, V of Padé[13,13] for self.A_scaled[sl] (powers already filled)."""
         xp = self.xp
         b = _PADE13_COEFFS
+        A, A2, A4, A6 = self.A_scaled[sl], self.A2[sl], self.A4[sl], self.A6[sl]
+        W1, W2, W, U, V = self.W1[sl], self.W2[sl], self.W[sl], self.U[sl], self.V[sl]
+        powers = (A6, A4, A2)
+
+        # W = A6 @ (b13 A6 + b11 A4 + b9 A2) + b7 A6 + b5 A4 + b3 A2 + b1 I
+        self._combine(W1, (b[13], b[11], b[9]), powers, 0.0)
+        self._combine(W2, (b[7], b[5], b[3]), powers, b[1])
+        xp.matmul(A6, W1, out=W)
+        W += W2
+        # U = A @ W
+        xp.matmul(A, W, out=U)
 
-        # Scaling
-        norms = xp.abs(A).sum(axis=0).max(axis=0)
-        max_norm = float(norms.max())
-
-        if max_norm == 0.0:
-            self.result[:] = self.I
-            return self.result
-
-        s = max(0, int(np.ceil(np.log2(max_norm / _THETA_13))))
-
-        if s > 0:
-            self.A_scaled[:] = A * (2.0 ** (-s))
+        # V = A6 @ Z1 + Z2 (reuse W1, W2 as Z1, Z2)
+        self._combine(W1, (b[12], b[10], b[8]), powers, 0.0)
+        self._combine(W2, (b[6], b[4], b[2]), powers, b[0])
+        xp.matmul(A6, W1, out=V)
+        V += W2
+
+    def _pade_low(self, m, sl):
+        """U, V of Padé[m,m], m <= 9, for self.A_scaled[sl] (powers already filled)."""
+        b = _PADE_COEFFS[m]
+        powers = (self.A2[sl], self.A4[sl], self.A6[sl], self.A8[sl])[:m // 2]
+        W = self.W[sl]
+
+        # W = sum_k b[2k+1] A^{2k},  V = sum_k b[2k] A^{2k}
+        self._combine(W, b[3::2], powers, b[1])
+        self._combine(self.V[sl], b[2::2], powers, b[0])
+        # U = A @ W
+        self.xp.matmul(self.A_scaled[sl], W, out=self.U[sl])
+
+    def _solve(self, sl):
+        """self.result_t[sl] = q13^-1 p13, written into pre-allocated buffers."""
+        result = self.result_t[sl]
+        if self.xp is np:
+            in_place = self.result_t.dtype == self.dtype
+            out = result if in_place else self.W[sl]
+            _np_solve(self.q13[sl], self.p13[sl], out)
         else:
-            self.A_scaled[:] = A
+            self._cublas_solve(sl)
+            in_place = self.p13 is self.result_t
+            out = self.p13[sl]
+        if not in_place:
+            result[...] = out
+
+    def _cublas_solve(self, sl):
+        """LU-factor q13[sl] and overwrite p13[sl] with the solution (getrf/getrs batched).
+
+        cuBLAS reads the row-major [B, d, d] buffers as q^T and p^T. Both are
+        polynomials in A, so q^-1 p = p q^-1 and solving q^T Y = p^T gives
+        Y = (q^-1 p)^T, i.e. the row-major solution.
+        """
+        getrf, getrs = _GETRF_BATCHED[self.dtype], _GETRS_BATCHED[self.dtype]
+        d = self.d
+        q_ptrs, p_ptrs = self._q_ptrs[sl], self._p_ptrs[sl]
+        pivots, lu_info = self._pivots[sl], self._lu_info[sl]
+        n = q_ptrs.size
+        handle = cuda_device.get_cublas_handle()
+        cublas.setStream(handle, cp.cuda.get_current_stream().ptr)
+        getrf(handle, d, q_ptrs.data.ptr, d, pivots.data.ptr, lu_info.data.ptr, n)
+        getrs(handle, cublas.CUBLAS_OP_N, d, d, q_ptrs.data.ptr, d,
+              pivots.data.ptr, p_ptrs.data.ptr, d, self._solve_info.ctypes.data, n)
+
+    def _pade(self, m, sl=slice(None)):
+        """Padé[m,m] approximant of self.A_scaled[sl] into self.result_t[sl].
+
+        sl is a contiguous slice of the batch, so every buffer view stays a
+        C-contiguous [n, d, d] stack.
+        """
+        xp = self.xp
+        A, A2, A4 = self.A_scaled[sl], self.A2[sl], self.A4[sl]
 
         # Compute powers
-        _batched_matmul_out(self.A_scaled, self.A_scaled, self.A2, xp)
-        _batched_matmul_out(self.A2, self.A2, self.A4, xp)
-        _batched_matmul_out(self.A2, self.A4, self.A6, xp)
-
-        # W1 = b[13]*A6 + b[11]*A4 + b[9]*A2
-        self.W1[:] = b[13] * self.A6 + b[11] * self.A4 + b[9] * self.A2
-        # W2 = b[7]*A6 + b[5]*A4 + b[3]*A2 + b[1]*I
-        self.W2[:] = b[7] * self.A6 + b[5] * self.A4 + b[3] * self.A2 + b[1] * self.I
-
-        # W = A6 @ W1 + W2
-        _batched_matmul_out(self.A6, self.W1, self.W, xp)
-        self.W += self.W2
-        # U = A @ W
-        _batched_matmul_out(self.A_scaled, self.W, self.U, xp)
-
-        # V = A6 @ Z1 + Z2 (reuse W1, W2 as Z1, Z2)
-        self.W1[:] = b[12] * self.A6 + b[10] * self.A4 + b[8] * self.A2
-        self.W2[:] = b[6] * self.A6 + b[4] * self.A4 + b[2] * self.A2 + b[0] * self.I
-        _batched_matmul_out(self.A6, self.W1, self.V, xp)
-        self.V += self.W2
+        xp.matmul(A, A, out=A2)
+        if m >= 5:
+            xp.matmul(A2, A2, out=A4)
+        if m >= 7:
+            xp.matmul(A2, A4, out=self.A6[sl])
+        if m == 9:
+            xp.matmul(A4, A4, out=self.A8[sl])
+
+        if m == 13:
+            self._pade13(sl)
+        else:
+            self._pade_low(m, sl)
+
+        # p13 = U + V, q13 = -U + V; solve q13 @ X = p13
+        U, V = self.U[sl], self.V[sl]
+        xp.add(U, V, out=self.p13[sl])
+        xp.subtract(V, U, out=self.q13[sl])
+        self._solve(sl)
+
+    def _square_sorted(self, s_b):
+        """Square self.result_t[i] s_b[i] times, for s_b ascending (host array).
+
+        The elements still being squared at pass k are the suffix with
+        s_b > k, so every pass is one stacked matmul on contiguous views,
+        ping-ponging with self.tmp. An element squared an odd number of
+        times ends up in self.tmp and is copied back.
+        """
+        src, dst = self.result_t, self.tmp
+        s_max = int(s_b[-1])
+        for k in range(s_max):
+            lo = int(np.searchsorted(s_b, k, side='right'))
+            self.xp.matmul(src[lo:], src[lo:], out=dst[lo:])
+            src, dst = dst, src
+        for k in range(1, s_max + 1, 2):
+            lo, hi = np.searchsorted(s_b, k, side='left'), np.searchsorted(s_b, k, side='right')
+            self.result_t[lo:hi] = self.tmp[lo:hi]
+
+    def _compute_bucketed(self):
+        """Per-element Padé degree and squaring count for self.A_scaled (norms filled).
+
+        Both grow with the 1-norm, so after sorting the batch by norm every
+        degree bucket is a contiguous slice of the workspace buffers and
+        the elements squared at each pass are a contiguous suffix.
+        """
+        xp = self.xp
+        orders, theta = self._orders, self._theta
+        norms = self.norms if xp is np else self.norms.get()
+        order = np.argsort(norms, kind='stable')
+        norms = norms[order]
+        s_b = _squaring_exponents(norms, theta[orders[-1]], np)
+        m_b = _pade_orders_per_element(norms, orders, np, theta)
+
+        if order[0] > 0 or np.any(order[1:] != order[:-1] + 1):
+            order_x = xp.asarray(order)
+            xp.take(self.A_scaled, order_x, axis=0, out=self.W)
+            self.A_scaled[...] = self.W
+        else:
+            order_x = None
+        if s_b[-1] > 0:
+            self.A_scaled *= xp.asarray(np.ldexp(1.0, -s_b))[:, None, None]
+
+        # One Padé evaluation per degree bucket
+        for m in np.unique(m_b).tolist():
+            lo, hi = np.searchsorted(m_b, m, side='left'), np.searchsorted(m_b, m, side='right')
+            self._pade(int(m), slice(int(lo), int(hi)))
+        self._square_sorted(s_b)
+
+        if order_x is not None:
+            # Undo the sort: result[order[i]] = sorted[i]
+            self.tmp[order_x] = self.result_t
+            self.result_t[...] = self.tmp
+
+    def _square(self, s):
+        """Square self.result s times, ping-ponging with self.tmp."""
+        src, dst = self.result_t, self.tmp
+        for _ in range(s):
+            self.xp.matmul(src, src, out=dst)
+            src, dst = dst, src
+        if src is not self.result_t:
+            self.result_t[...] = src
 
-        # p13 = U + V, q13 = -U + V
-        self.p13[:] = self.U + self.V
-        self.q13[:] = -self.U + self.V
+    def compute(self, A):
+        """Compute expm(A) for A [d, d, B] using pre-allocated buffers. Returns self.result."""
+        xp = self.xp
+        orders = self._orders
+        theta = self._theta
+        # Batch-first copy of A; scaled in place below
+        xp.copyto(self.A_scaled, A.transpose(2, 0, 1), casting='same_kind')
+
+        # 1-norms: max column sum of |A_b|
+        xp.abs(self.A_scaled, out=self._abs)
+        xp.sum(self._abs, axis=1, out=self._colsum)
+        xp.max(self._colsum, axis=1, out=self.norms)
+        xp.max(self.norms, out=self._max_norm)
+        max_norm = float(self._max_norm)
 
-        # Solve q13 @ X = p13
-        self.q13_t[:] = self.q13.transpose(2, 0, 1)
-        self.p13_t[:] = self.p13.transpose(2, 0, 1)
+        if max_norm == 0.0:
+            self.result_t[...] = 0
+            _add_identity(self.result_t, 1.0)
+            return self.result
 
-        if xp is np:
-            result_t = np.linalg.solve(self.q13_t, self.p13_t)
+        if self.scaling == 'bucketed':
+            self._compute_bucketed()
         else:
-            result_t = cp.linalg.solve(self.q13_t, self.p13_t)
-
-        self.result[:] = result_t.transpose(1, 2, 0)
-
-        # Repeated squaring
-        for _ in range(s):
-            self.tmp[:] = self.result
-            _batched_matmul_out(self.tmp, self.tmp, self.result, xp)
+            m = _select_pade_order(max_norm, orders, theta)
+            s = max(0, int(np.ceil(np.log2(max_norm / theta[m]))))
+            if s > 0:
+                self.A_scaled *= 2.0 ** (-s)
+            self._pade(m)
+            self._square(s)
 
         return self.result
 
 
 # --- Original functional API (kept for backward compatibility) ---
 
-def _pade13_batched(A, xp):
-    """Compute Padé[13,13] approximation (allocates temporaries)."""
+def _pade_batched(A, m, xp):
+    """Compute Padé[m,m] approximation (allocates temporaries)."""
     d = A.shape[0]
     B_batch = A.shape[2]
     dtype = A.dtype
-    b = _PADE13_COEFFS
+    b = _PADE_COEFFS[m]
 
     I = _batched_eye(d, B_batch, dtype, xp)
     A2 = _batched_matmul(A, A, xp)
-    A4 = _batched_matmul(A2, A2, xp)
-    A6 = _batched_matmul(A2, A4, xp)
 
-    W1 = b[13] * A6 + b[11] * A4 + b[9] * A2
-    W2 = b[7] * A6 + b[5] * A4 + b[3] * A2 + b[1] * I
-    Z1 = b[12] * A6 + b[10] * A4 + b[8] * A2
-    Z2 = b[6] * A6 + b[4] * A4 + b[2] * A2 + b[0] * I
+    if m == 13:
+        A4 = _batched_matmul(A2, A2, xp)
+        A6 = _batched_matmul(A2, A4, xp)
 
-    W = _batched_matmul(A6, W1, xp) + W2
-    U = _batched_matmul(A, W, xp)
-    V = _batched_matmul(A6, Z1, xp) + Z2
+        W1 = b[13] * A6 + b[11] * A4 + b[9] * A2
+        W2 = b[7] * A6 + b[5] * A4 + b[3] * A2 + b[1] * I
+        Z1 = b[12] * A6 + b[10] * A4 + b[8] * A2
+        Z2 = b[6] * A6 + b[4] * A4 + b[2] * A2 + b[0] * I
+
+        W = _batched_matmul(A6, W1, xp) + W2
+        U = _batched_matmul(A, W, xp)
+        V = _batched_matmul(A6, Z1, xp) + Z2
+    else:
+        powers = [I, A2]
+        while len(powers) < m // 2 + 1:
+            powers.append(_batched_matmul(powers[-1], A2, xp))
+        W = sum(b[2 * k + 1] * P for k, P in enumerate(powers))
+        V = sum(b[2 * k] * P for k, P in enumerate(powers))
+        U = _batched_matmul(A, W, xp)
 
     p13 = U + V
     q13 = -U + V
@@ -191,29 +576,53 @@ def _pade13_batched(A, xp):
     return result_t.transpose(1, 2, 0)
 
 
-def batched_expm(A, xp=None):
-    """Compute expm(A) for batched matrices (allocates temporaries each call)."""
+def _pade13_batched(A, xp):
+    """Compute Padé[13,13] approximation (allocates temporaries)."""
+    return _pade_batched(A, 13, xp)
+
+
+def batched_expm(A, xp=None, scaling='global', pade_order='adaptive', precision='double'):
+    """Compute expm(A) for batched matrices (allocates temporaries each call).
+
+    See BatchedExpmWorkspace for the meaning of `scaling`, `pade_order` and
+    `precision`.
+    """
     if xp is None:
         xp = cp if (HAS_CUPY and hasattr(A, '__cuda_array_interface__')) else np
+    _check_scaling(scaling)
+    dtype, result_dtype = _check_precision(precision)
+    orders = _candidate_orders(pade_order, precision)
+    theta = _theta_table(precision)
 
     d = A.shape[0]
     B_batch = A.shape[2]
-    dtype = A.dtype
+    A = A.astype(dtype, copy=False)
 
     norms = xp.abs(A).sum(axis=0).max(axis=0)
     max_norm = float(norms.max())
 
     if max_norm == 0.0:
-        return _batched_eye(d, B_batch, dtype, xp)
+        return _batched_eye(d, B_batch, result_dtype, xp)
+
+    if scaling == 'bucketed':
+        s_b = _squaring_exponents(norms, theta[orders[-1]], xp)
+        A_scaled = A * xp.ldexp(1.0, -s_b)[None, None, :].astype(A.real.dtype)
+        m_b = _pade_orders_per_element(norms, orders, xp, theta)
+        result = xp.empty(A_scaled.shape, dtype=result_dtype)
+        for m in xp.unique(m_b).tolist():
+            idx = xp.nonzero(m_b == m)[0]
+            result[:, :, idx] = _pade_batched(A_scaled[:, :, idx], int(m), xp)
+        return _square_by_bucket(result, s_b, xp)
 
-    s = max(0, int(np.ceil(np.log2(max_norm / _THETA_13))))
+    m = _select_pade_order(max_norm, orders, theta)
+    s = max(0, int(np.ceil(np.log2(max_norm / theta[m]))))
 
     if s > 0:
         A_scaled = A * (2.0 ** (-s))
     else:
         A_scaled = A
 
-    result = _pade13_batched(A_scaled, xp)
+    result = _pade_batched(A_scaled, m, xp).astype(result_dtype, copy=False)
 
     for _ in range(s):
         result = _batched_matmul(result, result, xp)
@@ -221,6 +630,25 @@ def batched_expm(A, xp=None):
     return result
 
 
+def batched_expm_hermitian(H, t, xp=None, precision='double'):
+    """Compute expm(-i * t * H) for batched Hermitian H[d,d,B] via eigh.
+
+    U = V diag(exp(-i t w)) V^dag with H = V diag(w) V^dag. Unitary to
+    machine precision for any ||t H||, with no scaling and squaring.
+    With precision 'single' or 'mixed' the eigendecomposition runs in
+    complex64; 'mixed' returns complex128.
+    """
+    if xp is None:
+        xp = cp if (HAS_CUPY and hasattr(H, '__cuda_array_interface__')) else np
+    dtype, result_dtype = _check_precision(precision)
+
+    # eigh works on [B, d, d] stacks
+    w, V = xp.linalg.eigh(xp.ascontiguousarray(H.transpose(2, 0, 1), dtype=dtype))
+    phases = xp.exp(-1j * t * w).astype(dtype, copy=False)  # [B, d]
+    U_t = xp.matmul(V * phases[:, None, :], V.conj().transpose(0, 2, 1))
+    return U_t.transpose(1, 2, 0).astype(result_dtype, copy=False)
+
+
 def batched_expm_gpu(A):
     """GPU convenience wrapper."""
     return batched_expm(A, xp=cp)
@@ -0,0 +1,198 @@
+"""Chebyshev propagator for larger Hilbert space dimensions.
+
+Applies rho -> U rho U^dag with U = exp(-i theta H) directly, as the
+exponential of the commutator superoperator,
+
+    U rho U^dag = exp(-i theta [H, .]) rho
+                = sum_k c_k T_k([H, .] / W) rho,
+
+with Chebyshev polynomials T_k, W a per-element bound on the spectral width
+of H (Gershgorin) and c_k = (2 - delta_k0) (-i)^k J_k(theta W). U is never
+formed and no linear system is solved: every term costs two batched
+products H X and X H, and the series is truncated once the Bessel
+coefficients drop below tol, i.e. after about theta*W + O((theta*W)^(1/3))
+terms.
+
+Every term costs as many products as the final conjugation with U, so
+this is not faster than forming U: in benchmarks/bench_large_dim.py
+(CPU, d = 16-128, 8-16 terms) it is 1.2-2.8x slower per step than
+propagator='pade', and at best on par with 'eigh' for the shortest steps.
+Its use is a propagator that needs only matrix products, no linear solve
+or eigendecomposition.
+
+Arrays use the [d, d, B] (or [d, d, B, P] stack) layout of the integrator;
+NumPy and CuPy are both supported.
+"""
+import numpy as np
+
+from .batched_expm import HAS_CUPY
+
+if HAS_CUPY:
+    import cupy as cp
+
+# Default truncation of the series per working precision
+_DEFAULT_TOL = {
+    np.dtype(np.complex128): 1e-13,
+    np.dtype(np.complex64): 1e-7,
+}
+
+
+def bessel_j_table(n_max, a):
+    """
+    J_0(a) ... J_n_max(a) for an array a >= 0, shape [n_max + 1, len(a)].
+
+    Miller's backward recurrence normalised with J_0 + 2 sum J_2k = 1,
+    stable for every order (NumPy only, no SciPy dependency).
+    """
+    a = np.atleast_1d(np.asarray(a, dtype=np.float64))
+    zero = a < 1e-300
+    x = np.where(zero, 1.0, a)
+
+    # Start well above both n_max and a
+    n_start = max(n_max, int(np.ceil(x.max()))) + 20
+    n_start += int(np.sqrt(40.0 * n_start))
+    n_start += n_start % 2
+
+    table = np.zeros((n_max + 1, a.size))
+    j_next = np.zeros_like(x)
+    j_cur = np.full_like(x, 1e-300)
+    norm = np.zeros_like(x)
+    for k in range(n_start, 0, -1):
+        j_prev = 2.0 * k / x * j_cur - j_next
+        j_next, j_cur = j_cur, j_prev
+        if k - 1 <= n_max:
+            table[k - 1] = j_cur
+        if (k - 1) % 2 == 0 and k - 1 > 0:
+            norm += 2.0 * j_cur
+        # Rescale to avoid overflow
+        big = np.abs(j_cur) > 1e250
+        if big.any():
+            scale = np.where(big, 1e-250, 1.0)
+            j_cur *= scale
+            j_next *= scale
+            norm *= scale
+            table[:, big] *= 1e-250
+    norm += j_cur  # J_0
+    table /= norm
+
+    table[:, zero] = 0.0
+    table[0, zero] = 1.0
+    return table
+
+
+class ChebyshevPropagator:
+    """
+    Chebyshev expansion of X -> exp(-i theta H) X exp(i theta H).
+
+    Drop-in for the dense propagator in StrangSplitIntegrator
+    (propagator='chebyshev'): set() takes the Hamiltonian and step of the
+    current time step, apply() conjugates states in place.
+
+    Parameters
+    ----------
+    d, B : int
+    xp : module, optional
+        cupy or numpy. Defaults to cupy when available.
+    dtype : complex dtype
+    tol : float, optional
+        Truncation threshold for |c_k|. Defaults to 1e-13 (complex128) or
+        1e-7 (complex64).
+    """
+
+    def __init__(self, d, B, xp=None, dtype=np.complex128, tol=None):
+        if xp is None:
+            xp = cp if HAS_CUPY else np
+        self.xp = xp
+        self.d = d
+        self.B = B
+        self.dtype = np.dtype(dtype)
+        self.tol = _DEFAULT_TOL[self.dtype] if tol is None else tol
+        self.H = xp.zeros((d, d, B), dtype=dtype, order='F')
+        self.coeffs = None   # [n_terms, B] complex
+        self.n_terms = 0
+        self._inv_width = None
+        self._work = {}
+
+    def set(self, H, theta):
+        """Use Hamiltonian H [d, d, B] and step theta (U = exp(-i theta H))."""
+        xp = self.xp
+        self.H[...] = H
+
+        # Gershgorin interval [lo, hi] of each H_b bounds its spectrum, so
+        # the commutator [H, .] has spectrum inside [-W, W], W = hi - lo
+        diag = xp.diagonal(self.H, axis1=0, axis2=1).real           # [B, d]
+        radius = xp.abs(self.H).sum(axis=0).T - xp.abs(diag)          # [B, d]
+        width = (diag + radius).max(axis=1) - (diag - radius).min(axis=1)
+        width = xp.maximum(width, np.finfo(np.float64).tiny)
+        self._inv_width = (1.0 / width).astype(self.H.real.dtype)
+
+        # Bessel coefficients on the host (a few hundred scalars at most)
+        a = np.abs(theta) * (width.get() if hasattr(width, 'get') else np.asarray(width))
+        a_max = float(a.max())
+        n_max = int(a_max + 10.0 * np.cbrt(a_max) + 20)
+        J = bessel_j_table(n_max, a)
+        significant = np.nonzero(np.abs(J).max(axis=1) > self.tol)[0]
+        n_terms = int(significant[-1]) + 1 if significant.size else 1
+
+        k = np.arange(n_terms)
+        phase = (-1j * np.sign(theta)) ** k
+        c = (2.0 - (k == 0))[:, None] * phase[:, None] * J[:n_terms]
+        self.coeffs = xp.asarray(c.astype(self.dtype))
+        self.n_terms = n_terms
+
+    def _buffers(self, shape):
+        bufs = self._work.get(shape)
+        if bufs is None:
+            bufs = [self.xp.zeros(shape, dtype=self.dtype, order='F') for _ in range(4)]
+            self._work[shape] = bufs
+        return bufs
+
+    def _apply_scaled_commutator(self, X, out, tmp):
+        """out = [H, X] / W for X [d, d, B, ...P]."""
+        # Deferred: integrator_strang imports this module
+        from .integrator_strang import _stack_transpose_axes
+
+        xp = self.xp
+        axes = _stack_transpose_axes(X.ndim)
+        Hv = self.H.transpose(2, 0, 1)
+        xp.matmul(Hv, X.transpose(axes), out=out.transpose(axes))
+        xp.matmul(X.transpose(axes), Hv, out=tmp.transpose(axes))
+        out -= tmp
+        out *= self._inv_width.reshape((1, 1, self.B) + (1,) * (X.ndim - 3))
+
+    def apply(self, X):
+        """X <- U X U^dag in place, X [d, d, B] or [d, d, B, P]."""
+        if self.coeffs is None:
+            raise RuntimeError("ChebyshevPropagator.apply called before set()")
+        xp = self.xp
+        c_shape = (1, 1, self.B) + (1,) * (X.ndim - 3)
+        c = [self.coeffs[k].reshape(c_shape) for k in range(self.n_terms)]
+        T_prev, T_cur, T_next, tmp = self._buffers(X.shape)
+
+        # T_0 = X, T_1 = L X
+        T_prev[...] = X
+        X *= c[0]
+        if self.n_terms == 1:
+            return X
+        self._apply_scaled_commutator(T_prev, T_cur, tmp)
+        X += xp.multiply(T_cur, c[1], out=tmp)
+
+        # T_{k+1} = 2 L T_k - T_{k-1}
+        for k in range(2, self.n_terms):
+            self._apply_scaled_commutator(T_cur, T_next, tmp)
+            T_next *= 2.0
+            T_next -= T_prev
+            X += xp.multiply(T_next, c[k], out=tmp)
+            T_prev, T_cur, T_next = T_cur, T_next, T_prev
+        return X
+
+
+def chebyshev_propagate(H, X, theta, xp=None, tol=None):
+    """Return exp(-i theta H) X exp(i theta H) for H [d, d, B], X [d, d, B, ...]."""
+    if xp is None:
+        xp = cp if (HAS_CUPY and hasattr(H, '__cuda_array_interface__')) else np
+    d, _, B = H.shape
+    prop = ChebyshevPropagator(d, B, xp=xp, dtype=np.result_type(H.dtype, X.dtype), tol=tol)
+    prop.set(H, theta)
+    out = xp.array(X, dtype=prop.dtype, order='F')
+    return prop.apply(out)
@@ -0,0 +1,65 @@
+"""Checkpoint files for resumable StrangSplitIntegrator runs.
+
+A checkpoint is a single .npz file holding the integrator state arrays
+(rho, and drho for TME runs) as host arrays, the number of completed
+steps and the run parameters needed to validate a resume. It is written
+to a temporary file next to the target and moved into place with
+os.replace, so a crash during the write leaves the previous checkpoint
+intact.
+"""
+import json
+import os
+
+import numpy as np
+
+# Bumped whenever the file layout changes
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, arrays, meta):
+    """
+    Atomically write a checkpoint.
+
+    Parameters
+    ----------
+    path : str
+    arrays : dict of str -> np.ndarray
+        Host arrays (e.g. {'rho': ..., 'drho': ...}).
+    meta : dict
+        JSON-serializable run parameters and progress.
+
+    Returns
+    -------
+    int
+        Size of the written file in bytes.
+    """
+    path = str(path)
+    tmp = path + '.tmp'
+    meta = dict(meta, version=CHECKPOINT_VERSION)
+    # np.savez appends .npz to names without it; write through a file object
+    with open(tmp, 'wb') as f:
+        np.savez(f, _meta=np.array(json.dumps(meta)), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint written by save_checkpoint.
+
+    Returns
+    -------
+    arrays : dict of str -> np.ndarray
+    meta : dict
+    """
+    with np.load(str(path)) as data:
+        meta = json.loads(str(data['_meta']))
+        arrays = {k: data[k] for k in data.files if k != '_meta'}
+    if meta.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Checkpoint {path} has version {meta.get('version')}, "
+            f"expected {CHECKPOINT_VERSION}"
+        )
+    return arrays, meta
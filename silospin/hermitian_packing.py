@@ -0,0 +1,127 @@
+"""Packed storage of Hermitian matrices.
+
+A Hermitian d x d matrix is fully described by its d real diagonal
+entries and the d(d-1)/2 complex entries above the diagonal, i.e. d² real
+numbers instead of d² complex ones. The packed layout along the last axis
+is
+
+    [ diag (d) | Re(upper) (d(d-1)/2) | Im(upper) (d(d-1)/2) ]
+
+with the upper triangle in row-major order (np.triu_indices(d, k=1)).
+Packed arrays are real (float64 for complex128 input, float32 for
+complex64), so stored trajectories and device-to-host copies are half the
+size of the full complex matrices.
+
+Works with NumPy and CuPy arrays; the backend is inferred from the input.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .batched_expm import HAS_CUPY
+
+if HAS_CUPY:
+    import cupy as cp
+
+
+def _get_xp(arr):
+    return cp if (HAS_CUPY and hasattr(arr, '__cuda_array_interface__')) else np
+
+
+@lru_cache(maxsize=None)
+def _triu_indices(d):
+    rows, cols = np.triu_indices(d, k=1)
+    rows.setflags(write=False)
+    cols.setflags(write=False)
+    return rows, cols
+
+
+def packed_size(d):
+    """Number of real entries of a packed d x d Hermitian matrix (= d²)."""
+    return d * d
+
+
+def packed_dim(n):
+    """Matrix dimension d of a packed array with last axis n = d²."""
+    d = int(round(np.sqrt(n)))
+    if d * d != n:
+        raise ValueError(f"Packed length {n} is not a square number")
+    return d
+
+
+def split_packed(packed, d=None):
+    """
+    Views of the three blocks of a packed array (no copy).
+
+    Returns
+    -------
+    diag : [..., d] real diagonal
+    re, im : [..., d(d-1)/2] real and imaginary parts of the upper triangle
+    """
+    if d is None:
+        d = packed_dim(packed.shape[-1])
+    m = d * (d - 1) // 2
+    return packed[..., :d], packed[..., d:d + m], packed[..., d + m:]
+
+
+def pack_hermitian(rho, out=None):
+    """
+    Pack Hermitian matrices rho[..., d, d] into real arrays [..., d²].
+
+    Only the diagonal and upper triangle are read; the lower triangle is
+    assumed to be the conjugate transpose.
+
+    Parameters
+    ----------
+    rho : xp.ndarray [..., d, d], complex
+    out : xp.ndarray [..., d²], real, optional
+        Destination (e.g. a slice of a snapshot buffer).
+
+    Returns
+    -------
+    xp.ndarray [..., d²]
+    """
+    xp = _get_xp(rho)
+    d = rho.shape[-1]
+    if out is None:
+        out = xp.empty(rho.shape[:-2] + (d * d,), dtype=rho.real.dtype)
+    rows, cols = _triu_indices(d)
+    diag, re, im = split_packed(out, d)
+    diag[...] = xp.diagonal(rho, axis1=-2, axis2=-1).real
+    upper = rho[..., xp.asarray(rows), xp.asarray(cols)]
+    re[...] = upper.real
+    im[...] = upper.imag
+    return out
+
+
+def unpack_hermitian(packed, out=None):
+    """
+    Rebuild full Hermitian matrices from packed arrays.
+
+    Parameters
+    ----------
+    packed : xp.ndarray or np.memmap [..., d²], real
+        Also accepts a torch CPU tensor (as returned by the integrator).
+    out : xp.ndarray [..., d, d], complex, optional
+
+    Returns
+    -------
+    xp.ndarray [..., d, d]
+    """
+    if hasattr(packed, 'numpy') and not isinstance(packed, np.ndarray):
+        packed = packed.numpy()
+    xp = _get_xp(packed)
+    d = packed_dim(packed.shape[-1])
+    if out is None:
+        cdtype = np.result_type(packed.dtype, np.complex64)
+        out = xp.empty(packed.shape[:-1] + (d, d), dtype=cdtype)
+    rows, cols = _triu_indices(d)
+    rows, cols = xp.asarray(rows), xp.asarray(cols)
+    diag, re, im = split_packed(packed, d)
+
+    out[...] = 0
+    idx = xp.arange(d)
+    out[..., idx, idx] = diag
+    out[..., rows, cols] = re + 1j * im
+    out[..., cols, rows] = re - 1j * im
+    return out
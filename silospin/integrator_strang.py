@@ -8,17 +8,313 @@ Exploits the fact that H(t) is constant within each time step:
 This reduces H evaluations from 4/step (RK4) to 1/step, and replaces
 approximate ODE integration with exact unitary evolution for the
 Hamiltonian part.
+
+Runs on CuPy (GPU) or NumPy (CPU) arrays; on NumPy the batched products
+go through np.matmul, i.e. (multithreaded) BLAS gemm per batch element.
 """
+import hashlib
 import logging
+import os
+import time
+from collections import OrderedDict
 
 import torch
-import cupy as cp
 import numpy as np
 
-from .batched_expm import BatchedExpmWorkspace
+from .batched_expm import BatchedExpmWorkspace, batched_expm, batched_expm_hermitian, HAS_CUPY
+from .checkpoint import load_checkpoint, save_checkpoint
+from .chebyshev_propagator import ChebyshevPropagator
+from .hermitian_packing import pack_hermitian
+from .trajectory_writer import TensorSink, TrajectoryFileWriter
 
 logger = logging.getLogger(__name__)
 
+# Engines for U = expm(-2*pi*i * H * dt):
+#   'pade' - scaling-and-squaring Padé on the general matrix
+#   'eigh' - batched Hermitian eigendecomposition, exact for any ||H dt||
+#   'chebyshev' - U rho U† applied as a Chebyshev series of [H, .] without
+#                 forming U (products only, see chebyshev_propagator)
+_PROPAGATORS = ('pade', 'eigh', 'chebyshev')
+
+# Dissipator half-steps:
+#   'euler' - rho += (dt/2) * L_D[rho]
+#   'exact' - vec(rho) <- expm(S_D dt/2) vec(rho) with the precomputed
+#             batched d²xd² superoperator S_D (collapse ops are static)
+_DISSIPATORS = ('euler', 'exact')
+
+# Number of half-step superoperator exponentials kept (one per distinct dt)
+_DISSIPATOR_CACHE_SIZE = 4
+
+# Time-step schemes:
+#   'strang'   - 2nd order Strang splitting D(dt/2) H(dt) D(dt/2)
+#   'yoshida4' - 4th order triple-jump composition S(w1 dt) S(w0 dt) S(w1 dt)
+#                of Strang steps (Yoshida 1990)
+_SCHEMES = ('strang', 'yoshida4')
+_YOSHIDA4_W1 = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+_YOSHIDA4_W0 = 1.0 - 2.0 * _YOSHIDA4_W1
+
+# Working precision:
+#   'double' - complex128 throughout
+#   'single' - complex64 state, buffers and snapshots (half the memory)
+#   'mixed'  - complex64 propagator evaluation (Padé / eigh), complex128
+#              squaring, state and snapshots, where errors accumulate
+_PRECISIONS = ('double', 'single', 'mixed')
+
+# Snapshot layout along the last axis of stored trajectories:
+#   'full'   - d² complex entries of rho (row-major)
+#   'packed' - d² reals: diagonal, Re and Im of the upper triangle (see
+#              hermitian_packing), packed on the device before the D2H copy
+_STORAGES = ('full', 'packed')
+
+_TORCH_DTYPES = {
+    np.dtype(np.complex128): torch.complex128,
+    np.dtype(np.complex64): torch.complex64,
+    np.dtype(np.float64): torch.float64,
+    np.dtype(np.float32): torch.float32,
+}
+
+# Pointer arrays kept for cuBLAS batched conjugation (one per buffer set)
+_GEMM_POINTER_CACHE_SIZE = 8
+
+if HAS_CUPY:
+    import cupy as cp
+    from cupy.cuda import device as cuda_device
+    from cupy_backends.cuda.libs import cublas
+
+    _GEMM_BATCHED = {
+        np.dtype(np.complex128): cublas.zgemmBatched,
+        np.dtype(np.complex64): cublas.cgemmBatched,
+    }
+
+
+def _bmm(A, B, out, xp):
+    """out[:, :, b] = A[:, :, b] @ B[:, :, b] for [d, d, B] arrays."""
+    if xp is np:
+        # Batched BLAS gemm over the trailing batch axis
+        np.matmul(A.transpose(2, 0, 1), B.transpose(2, 0, 1), out=out.transpose(2, 0, 1))
+    else:
+        xp.einsum('ijb,jkb->ikb', A, B, out=out)
+    return out
+
+
+def _stack_transpose_axes(ndim):
+    """Axes turning [d, d, B, ...P] into a matmul stack [...P, B, d, d]."""
+    return tuple(range(ndim - 1, 1, -1)) + (0, 1)
+
+
+def _cublas_conjugate(U, X, tmp, pointers):
+    """
+    X <- U X U^dag for F-contiguous X [d, d, B, ...P] and U [d, d, B].
+
+    Two cuBLAS gemmBatched launches over all B*P matrices; the second uses
+    op(U) = U^H, so U^dag is never formed. `pointers` are the device
+    pointer arrays (U, X, tmp) of every matrix in the batch.
+    """
+    d = U.shape[0]
+    n = X.size // (d * d)
+    p_U, p_X, p_T = pointers
+    gemm = _GEMM_BATCHED[X.dtype]
+    one = np.ones((), dtype=X.dtype)
+    zero = np.zeros((), dtype=X.dtype)
+
+    handle = cuda_device.get_cublas_handle()
+    cublas.setStream(handle, cp.cuda.get_current_stream().ptr)
+    mode = cublas.getPointerMode(handle)
+    cublas.setPointerMode(handle, cublas.CUBLAS_POINTER_MODE_HOST)
+    try:
+        # tmp = U @ X
+        gemm(handle, cublas.CUBLAS_OP_N, cublas.CUBLAS_OP_N, d, d, d,
+             one.ctypes.data, p_U.data.ptr, d, p_X.data.ptr, d,
+             zero.ctypes.data, p_T.data.ptr, d, n)
+        # X = tmp @ U^H
+        gemm(handle, cublas.CUBLAS_OP_N, cublas.CUBLAS_OP_C, d, d, d,
+             one.ctypes.data, p_T.data.ptr, d, p_U.data.ptr, d,
+             zero.ctypes.data, p_X.data.ptr, d, n)
+    finally:
+        cublas.setPointerMode(handle, mode)
+
+
+def _to_host(arr):
+    """numpy view/copy of a CuPy or NumPy array."""
+    return arr.get() if hasattr(arr, 'get') else np.asarray(arr)
+
+
+class PropagatorCache:
+    """
+    Bounded LRU cache of (U, U^dag) pairs for repeated Hamiltonian segments.
+
+    Pulse schedules are built from a few distinct piecewise-constant
+    segments (idle, pi, pi/2, plunger, ...) that repeat many times, so the
+    propagator only has to be computed once per distinct (segment, dt).
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget for cached propagators. Least recently used entries
+        are evicted once the budget is exceeded.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return cached (U, U^dag) for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    @staticmethod
+    def _entry_bytes(U, Udag):
+        return U.nbytes + (Udag.nbytes if Udag is not None else 0)
+
+    def put(self, key, U, Udag):
+        """Store copies of U and U^dag (may be None) under key, evicting LRU entries."""
+        size = self._entry_bytes(U, Udag)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.nbytes -= self._entry_bytes(*self._entries.pop(key))
+        while self._entries and self.nbytes + size > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= self._entry_bytes(*old)
+            self.evictions += 1
+        self._entries[key] = (U.copy(), Udag.copy() if Udag is not None else None)
+        self.nbytes += size
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        """Hit/miss counters and memory use."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+        }
+
+
+def _pinned_empty(shape, dtype):
+    """numpy array backed by page-locked host memory (async D2H target)."""
+    count = int(np.prod(shape))
+    mem = cp.cuda.alloc_pinned_memory(count * np.dtype(dtype).itemsize)
+    return np.frombuffer(mem, dtype, count).reshape(shape)
+
+
+class _ChunkedSnapshotWriter:
+    """
+    Collects per-step snapshots on the device and flushes them to a sink
+    (TensorSink or TrajectoryFileWriter) every chunk_size steps.
+
+    Two device chunk buffers alternate: while one is being filled by the
+    integration, the other is copied to pinned host memory on a separate
+    stream, so the D2H transfer overlaps with compute instead of stalling
+    the stream once per step. With xp=np a single host chunk buffer is
+    handed to the sink directly.
+    """
+
+    def __init__(self, sink, n_total, chunk_size, n_parts, B, d, xp, start=0,
+                 dtype=np.complex128, packed=False):
+        self.sink = sink
+        self.chunk_size = max(1, min(int(chunk_size), n_total))
+        self.packed = packed
+        if packed:
+            shape = (self.chunk_size, B, n_parts, d * d)
+            dtype = np.finfo(dtype).dtype
+        else:
+            shape = (self.chunk_size, B, n_parts, d, d)
+        if xp is np:
+            self._dev = [np.empty(shape, dtype=dtype)]
+            self._host = None
+            self._stream = None
+        else:
+            self._dev = [xp.empty(shape, dtype=dtype) for _ in range(2)]
+            self._host = [_pinned_empty(shape, dtype) for _ in range(2)]
+            self._stream = cp.cuda.Stream(non_blocking=True)
+        self._pending = None  # (slot, start, n, done_event)
+        self._slot = 0
+        self._fill = 0
+        self._start = start
+
+    def push(self, *parts):
+        """Append one snapshot; parts are [d, d, B] arrays (rho, drho, ...)."""
+        buf = self._dev[self._slot]
+        for p, arr in enumerate(parts):
+            if self.packed:
+                pack_hermitian(arr.transpose(2, 0, 1), out=buf[self._fill, :, p])
+            else:
+                buf[self._fill, :, p] = arr.transpose(2, 0, 1)
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._fill == 0:
+            return
+        if self._stream is None:
+            n = self._fill
+            block = self._dev[0][:n]
+            self.sink.write(self._start, block.reshape(n, block.shape[1], -1))
+            self._start += n
+            self._fill = 0
+            return
+        # The other slot is about to be refilled: its copy must be done
+        self._finish_pending()
+
+        ready = cp.cuda.Event()
+        ready.record()
+        self._stream.wait_event(ready)
+        slot, n = self._slot, self._fill
+        self._dev[slot][:n].get(stream=self._stream, out=self._host[slot][:n],
+                                blocking=False)
+        done = cp.cuda.Event()
+        done.record(self._stream)
+
+        self._pending = (slot, self._start, n, done)
+        self._start += n
+        self._slot = 1 - slot
+        self._fill = 0
+
+    def _finish_pending(self):
+        if self._pending is None:
+            return
+        slot, start, n, done = self._pending
+        done.synchronize()
+        host = self._host[slot][:n]
+        self.sink.write(start, host.reshape(n, host.shape[1], -1))
+        self._pending = None
+
+    def sync(self):
+        """Write out everything pushed so far, including a partial chunk."""
+        self._flush()
+        self._finish_pending()
+        self.sink.flush()
+
+    def close(self):
+        """Flush the partial last chunk, wait for all transfers, close the sink."""
+        self._flush()
+        self._finish_pending()
+        return self.sink.close()
+
+
+def _array_digest(arr):
+    """Content hash of a NumPy array (used as a cache key for H)."""
+    return hashlib.blake2b(arr.tobytes(), digest_size=16).hexdigest()
+
 
 class StrangSplitIntegrator:
     """
@@ -29,9 +325,38 @@ class StrangSplitIntegrator:
         U = expm(-2*pi*i * H(t_i) * dt)            # batched 10x10 expm
         rho_2 = U * rho_1 * U^dag                  # exact Hamiltonian step
         rho_3 = rho_2 + (dt/2) * L_D[rho_2]        # half-step dissipation
+
+    With propagator='eigh', U is built from a batched eigendecomposition of
+    the Hermitian H instead of Padé, which stays exact for large dt. With
+    propagator='chebyshev', U is never formed: rho -> U rho U^dag is applied
+    as a Chebyshev series in [H, .] using only matrix products. It is
+    slower per step than 'pade' at the dimensions benchmarked (d = 16-128,
+    see chebyshev_propagator).
+
+    With cache_bytes > 0, (U, U^dag) are kept in a PropagatorCache keyed by
+    segment_callback(ti) (or, on NumPy only, by a hash of H when no segment
+    callback is given) and reused whenever the same segment repeats.
+
+    With dissipator='exact', the Euler half-steps are replaced by
+    expm(S_D dt/2), computed once per dt, which is unconditionally stable
+    and costs one batched matvec per half step.
+
+    With scheme='yoshida4', every step is the composition of three Strang
+    steps of lengths w1*dt, w0*dt, w1*dt (w0 < 0), which is 4th order when
+    the sub-flows are exact, i.e. together with dissipator='exact'.
+
+    With precision='single' all arrays are complex64 (~1e-6 relative
+    accuracy, half the memory and bandwidth); 'mixed' only evaluates the
+    propagators in complex64 and keeps the state in complex128.
+
+    With storage='packed', snapshots are stored as d² reals per matrix
+    (hermitian_packing layout) instead of d² complex entries; use
+    hermitian_packing.unpack_hermitian to recover the full matrices.
     """
 
-    def __init__(self, H_callback, collapse_ops_raw, batch_size, dim, state):
+    def __init__(self, H_callback, collapse_ops_raw, batch_size, dim, state,
+                 propagator='pade', segment_callback=None, cache_bytes=0, xp=None,
+                 dissipator='euler', scheme='strang', precision='double', storage='full'):
         """
         Parameters
         ----------
@@ -39,53 +364,207 @@ class StrangSplitIntegrator:
             Fills arr_out[d, d, B] with Hamiltonian at time index ti.
             This is the fused kernel or CuPy callback.
         collapse_ops_raw : list of (L_k, rate_k)
-            L_k: cp.ndarray [d, d, B], rate_k: cp.ndarray [B]
+            L_k: xp.ndarray [d, d, B], rate_k: xp.ndarray [B]
         batch_size : int
         dim : int
         state : DenseMixedState
             Template state for .clone()
+        propagator : str
+            'pade' (default), 'eigh' or 'chebyshev'. See _PROPAGATORS.
+            The propagator cache does not apply to 'chebyshev'.
+        segment_callback : callable(ti) -> hashable, optional
+            Returns an ID for the piecewise-constant segment active at time
+            index ti, or None for steps that should not be cached. On a
+            cache hit H_callback is not called at all.
+        cache_bytes : int
+            Memory budget of the propagator cache. 0 disables caching. On
+            CuPy the cache requires segment_callback: keying it by a hash
+            of H would copy H to the host every step.
+        xp : module, optional
+            Array backend, cupy or numpy. Defaults to cupy when available.
+            All arrays passed in (collapse ops, rho0, observables) and
+            filled by the callbacks must belong to this backend.
+        dissipator : str
+            'euler' (default) or 'exact'. See _DISSIPATORS.
+        scheme : str
+            'strang' (default) or 'yoshida4'. See _SCHEMES.
+        precision : str
+            'double' (default), 'single' or 'mixed'. See _PRECISIONS. With
+            'single', rho0 and the callbacks' outputs are cast to complex64
+            and snapshots are returned as complex64.
+        storage : str
+            'full' (default) or 'packed'. See _STORAGES. Packed snapshots
+            halve trajectory memory and device-to-host traffic.
         """
+        if xp is None:
+            xp = cp if HAS_CUPY else np
+        if propagator not in _PROPAGATORS:
+            raise ValueError(
+                f"Unknown propagator {propagator!r}, expected one of {_PROPAGATORS}"
+            )
+        if dissipator not in _DISSIPATORS:
+            raise ValueError(
+                f"Unknown dissipator {dissipator!r}, expected one of {_DISSIPATORS}"
+            )
+        if scheme not in _SCHEMES:
+            raise ValueError(
+                f"Unknown scheme {scheme!r}, expected one of {_SCHEMES}"
+            )
+        if precision not in _PRECISIONS:
+            raise ValueError(
+                f"Unknown precision {precision!r}, expected one of {_PRECISIONS}"
+            )
+        if storage not in _STORAGES:
+            raise ValueError(
+                f"Unknown storage {storage!r}, expected one of {_STORAGES}"
+            )
+        if scheme == 'yoshida4' and dissipator == 'euler':
+            logger.warning("scheme='yoshida4' with Euler dissipator half-steps is "
+                           "not 4th order; use dissipator='exact'")
+        self.propagator = propagator
+        self.dissipator = dissipator
+        self.scheme = scheme
+        self.precision = precision
+        self.storage = storage
+        self.dtype = xp.complex64 if precision == 'single' else xp.complex128
+        self.xp = xp
         self.H_callback = H_callback
-        self.collapse_ops = list(collapse_ops_raw)  # snapshot — immune to later mutations
+        # snapshot — immune to later mutations
+        real_dtype = xp.float32 if precision == 'single' else xp.float64
+        self.collapse_ops = [(L_k.astype(self.dtype, copy=False),
+                              rate_k.astype(real_dtype, copy=False))
+                             for L_k, rate_k in collapse_ops_raw]
         self.B = batch_size
         self.d = dim
         self.state_template = state
+        self.segment_callback = segment_callback
+        if cache_bytes > 0 and propagator == 'chebyshev':
+            logger.warning("cache_bytes is ignored with propagator='chebyshev'")
+            cache_bytes = 0
+        if cache_bytes > 0 and segment_callback is None and xp is not np:
+            raise ValueError("cache_bytes > 0 on CuPy requires a segment_callback "
+                             "(hashing H would add a device-to-host copy per step)")
+        self.propagator_cache = PropagatorCache(cache_bytes) if cache_bytes > 0 else None
 
         # Pre-allocate workspace
-        self._H_buf = cp.zeros((dim, dim, batch_size), dtype=cp.complex128, order='F')
-        self._A_buf = cp.zeros((dim, dim, batch_size), dtype=cp.complex128, order='F')
-        self._U = cp.zeros_like(self._H_buf)
-        self._Udag = cp.zeros_like(self._H_buf)
-        self._drho = cp.zeros_like(self._H_buf)
-        self._tmp = cp.zeros_like(self._H_buf)
+        self._H_buf = xp.zeros((dim, dim, batch_size), dtype=self.dtype, order='F')
+        self._A_buf = xp.zeros((dim, dim, batch_size), dtype=self.dtype, order='F')
+        self._drho = xp.zeros_like(self._H_buf)
+        self._tmp = xp.zeros_like(self._H_buf)
+        self._gemm_pointers = OrderedDict()
+        if propagator == 'chebyshev':
+            # The "propagators" hold H and the series coefficients of a step;
+            # no dense U, U† or expm workspace is needed
+            self._U = ChebyshevPropagator(dim, batch_size, xp=xp, dtype=self.dtype)
+            self._U_alt = ChebyshevPropagator(dim, batch_size, xp=xp, dtype=self.dtype)
+            self._Udag = self._Udag_alt = None
+            self._needs_udag = False
+            self._expm_ws = None
+        else:
+            self._U = xp.zeros_like(self._H_buf)
+            self._Udag = xp.zeros_like(self._H_buf)
+            # Second propagator pair for composition schemes
+            self._U_alt = xp.zeros_like(self._H_buf)
+            self._Udag_alt = xp.zeros_like(self._H_buf)
+            # np.matmul has no conjugate-transpose operand, so NumPy needs U†
+            # materialised; on CuPy the conjugation uses cuBLAS op(U) = U^H
+            self._needs_udag = xp is np
 
-        # Pre-allocated expm workspace (avoids memory fragmentation over 10K steps)
-        self._expm_ws = BatchedExpmWorkspace(dim, batch_size, xp=cp)
+            # Pre-allocated expm workspace (avoids memory fragmentation over 10K steps)
+            self._expm_ws = BatchedExpmWorkspace(dim, batch_size, xp=xp, precision=precision)
 
         # Pre-compute L†L and L† for each collapse operator (static)
         self._LdagL = []
         self._Ldag = []
         for L_k, rate_k in self.collapse_ops:
-            Ldag = L_k.conj().transpose(1, 0, 2)  # [d, d, B]
-            LdL = cp.einsum('ijb,jkb->ikb', Ldag, L_k)  # [d, d, B]
+            Ldag = xp.asfortranarray(L_k.conj().transpose(1, 0, 2))  # [d, d, B]
+            LdL = _bmm(Ldag, L_k, xp.zeros_like(self._H_buf), xp)  # [d, d, B]
             self._LdagL.append(LdL)
             self._Ldag.append(Ldag)
 
-        # Pre-allocate dissipator temporaries
-        self._L_rho = cp.zeros_like(self._H_buf)
-        self._LrhoLdag = cp.zeros_like(self._H_buf)
-        self._LdL_rho = cp.zeros_like(self._H_buf)
-        self._rho_LdL = cp.zeros_like(self._H_buf)
+        # Fused dissipator: operator pairs stacked along rows, see
+        # _stack_dissipator_operators
+        self._diss_A, self._diss_C = self._stack_dissipator_operators()
+        n_pairs = len(self.collapse_ops) + 2
+        self._diss_AR = xp.zeros((batch_size, n_pairs * dim, dim), dtype=self.dtype)
+        self._diss_ARh = xp.zeros((batch_size, dim, n_pairs * dim), dtype=self.dtype)
+
+        # Pre-allocate temporaries of the per-operator reference loop
+        self._L_rho = xp.zeros_like(self._H_buf)
+        self._LrhoLdag = xp.zeros_like(self._H_buf)
+        self._LdL_rho = xp.zeros_like(self._H_buf)
+        self._rho_LdL = xp.zeros_like(self._H_buf)
+
+        # Exact dissipator: S_D [B, d², d²] and expm(S_D dt/2) per dt
+        self._S_D = None
+        self._dissipator_props = OrderedDict()
+        self._dissipator_cache_size = _DISSIPATOR_CACHE_SIZE
+        if dissipator == 'exact':
+            self._S_D = self._build_dissipator_superop()
+            self._vec_in = xp.zeros((batch_size, dim * dim, 1), dtype=self.dtype)
+            self._vec_out = xp.zeros_like(self._vec_in)
+
+    def _stack_dissipator_operators(self):
+        """
+        Write L_D[rho] as sum_j A_j rho C_j and stack the pairs row-wise.
+
+        Pairs are (L_k, gamma_k L_k†) for each collapse operator, then (G, I)
+        and (I, G) with G = -0.5 * sum_k gamma_k L_k†L_k, so the
+        anticommutator of all operators costs as much as one extra pair.
+
+        Returns
+        -------
+        A, C : xp.ndarray [B, n_pairs*d, d]
+        """
+        xp = self.xp
+        d, B = self.d, self.B
+        eye = xp.broadcast_to(xp.eye(d, dtype=self.dtype), (B, d, d))
+        G = xp.zeros((B, d, d), dtype=self.dtype)
+        A_blocks, C_blocks = [], []
+        for (L_k, rate_k), Ldag, LdL in zip(self.collapse_ops, self._Ldag, self._LdagL):
+            A_blocks.append(L_k.transpose(2, 0, 1))
+            C_blocks.append(rate_k[:, None, None] * Ldag.transpose(2, 0, 1))
+            G -= 0.5 * rate_k[:, None, None] * LdL.transpose(2, 0, 1)
+        A_blocks += [G, eye]
+        C_blocks += [eye, G]
+        return (xp.ascontiguousarray(xp.concatenate(A_blocks, axis=1)),
+                xp.ascontiguousarray(xp.concatenate(C_blocks, axis=1)))
 
     def _compute_dissipator_action(self, rho, drho_out):
         """
         Compute L_D[rho] = sum_k gamma_k * (L_k rho L_k^dag - 0.5 * {L_k^dag L_k, rho}).
 
+        Fused over all collapse operators: one batched gemm forms every
+        A_j rho, a block transpose lays them side by side, and a second gemm
+        (contraction length n_pairs*d) sums A_j rho C_j. The kernel count
+        does not depend on the number of collapse operators.
+
+        Parameters
+        ----------
+        rho : xp.ndarray [d, d, B]
+        drho_out : xp.ndarray [d, d, B], output (overwritten)
+        """
+        xp = self.xp
+        B, d = self.B, self.d
+
+        # [A_1 rho; A_2 rho; ...]
+        xp.matmul(self._diss_A, rho.transpose(2, 0, 1), out=self._diss_AR)
+        # -> [A_1 rho, A_2 rho, ...]
+        self._diss_ARh.reshape(B, d, -1, d)[...] = \
+            self._diss_AR.reshape(B, -1, d, d).transpose(0, 2, 1, 3)
+        # sum_j A_j rho C_j
+        xp.matmul(self._diss_ARh, self._diss_C, out=drho_out.transpose(2, 0, 1))
+
+    def _compute_dissipator_action_loop(self, rho, drho_out):
+        """
+        Reference per-operator loop for L_D[rho] (four products per L_k).
+
         Parameters
         ----------
-        rho : cp.ndarray [d, d, B]
-        drho_out : cp.ndarray [d, d, B], output (overwritten)
+        rho : xp.ndarray [d, d, B]
+        drho_out : xp.ndarray [d, d, B], output (overwritten)
         """
+        xp = self.xp
         drho_out[:] = 0.0
 
         for idx, (L_k, rate_k) in enumerate(self.collapse_ops):
@@ -93,13 +572,13 @@ class StrangSplitIntegrator:
             LdL = self._LdagL[idx]
 
             # L_k rho -> pre-allocated buffer
-            self._L_rho[:] = cp.einsum('ijb,jkb->ikb', L_k, rho)
+            _bmm(L_k, rho, self._L_rho, xp)
             # L_k rho L_k^dag
-            self._LrhoLdag[:] = cp.einsum('ijb,jkb->ikb', self._L_rho, Ldag)
+            _bmm(self._L_rho, Ldag, self._LrhoLdag, xp)
             # L†L rho
-            self._LdL_rho[:] = cp.einsum('ijb,jkb->ikb', LdL, rho)
+            _bmm(LdL, rho, self._LdL_rho, xp)
             # rho L†L
-            self._rho_LdL[:] = cp.einsum('ijb,jkb->ikb', rho, LdL)
+            _bmm(rho, LdL, self._rho_LdL, xp)
 
             # D[L_k] rho = rate * (L rho L† - 0.5 * (L†L rho + rho L†L))
             drho_out += rate_k[None, None, :] * (
@@ -108,29 +587,338 @@ class StrangSplitIntegrator:
 
     def _compute_step_propagator(self, ti, dt):
         """Compute U = expm(-2*pi*i * H(ti) * dt) for all batch elements."""
+        cache = self.propagator_cache
+        if cache is None:
+            self._fill_propagator(ti, dt)
+            return
+
+        if self.segment_callback is not None:
+            segment = self.segment_callback(ti)
+            if segment is None:
+                self._fill_propagator(ti, dt)
+                return
+            key = (segment, dt)
+            h_ready = False
+        else:
+            self.H_callback(ti, self.B, self._H_buf)
+            key = (_array_digest(self._H_buf), dt)
+            h_ready = True
+
+        entry = cache.get(key)
+        if entry is not None:
+            self._U[:] = entry[0]
+            if self._needs_udag:
+                self._Udag[:] = entry[1]
+            return
+        self._fill_propagator(ti, dt, h_ready=h_ready)
+        cache.put(key, self._U, self._Udag if self._needs_udag else None)
+
+    def _fill_propagator(self, ti, dt, h_ready=False):
+        """Evaluate H(ti) and fill self._U (and self._Udag on NumPy)."""
         # Fill H buffer via callback
-        self.H_callback(ti, self.B, self._H_buf)
+        if not h_ready:
+            self.H_callback(ti, self.B, self._H_buf)
+
+        if self.propagator == 'chebyshev':
+            # Series coefficients for exp(-2*pi*i * dt * [H, .])
+            self._U.set(self._H_buf, 2.0 * np.pi * dt)
+            return
+        if self.propagator == 'eigh':
+            # U = V exp(-2*pi*i * w * dt) V†
+            self._U[:] = batched_expm_hermitian(self._H_buf, 2.0 * np.pi * dt, xp=self.xp,
+                                                   precision=self.precision)
+        else:
+            # A = -2*pi*i * H * dt  (in-place into pre-allocated buffer)
+            self.xp.multiply(self._H_buf, -2.0j * np.pi * dt, out=self._A_buf)
+
+            # Batched matrix exponential (zero-allocation workspace)
+            self._expm_ws.compute(self._A_buf)
+            self._U[:] = self._expm_ws.result
+        if self._needs_udag:
+            self._Udag[:] = self._U.conj().transpose(1, 0, 2)
+
+    def _hamiltonian_step(self, rho, U=None, Udag=None, tmp=None):
+        """
+        rho -> U rho U† (exact unitary evolution), default U = self._U.
+
+        rho may also be a stack [d, d, B, P] of P states evolved by the same
+        U (e.g. rho and drho in integrate_tme), with tmp of the same shape;
+        all P*B products then go through the same two batched gemm calls.
+        """
+        xp = self.xp
+        if U is None:
+            U, Udag = self._U, self._Udag
+        if self.propagator == 'chebyshev':
+            U.apply(rho)
+            return
+        if tmp is None:
+            tmp = self._tmp
+        if xp is np:
+            axes = _stack_transpose_axes(rho.ndim)
+            rho_t, tmp_t = rho.transpose(axes), tmp.transpose(axes)
+            np.matmul(U.transpose(2, 0, 1), rho_t, out=tmp_t)
+            np.matmul(tmp_t, Udag.transpose(2, 0, 1), out=rho_t)
+        else:
+            _cublas_conjugate(U, rho, tmp, self._conjugate_pointers(U, rho, tmp))
+
+    def _conjugate_pointers(self, U, X, tmp):
+        """Device pointer arrays of the matrices of U, X and tmp (cached)."""
+        d, B = self.d, self.B
+        key = (U.data.ptr, X.data.ptr, tmp.data.ptr, X.shape, X.dtype.char)
+        pointers = self._gemm_pointers.get(key)
+        if pointers is not None:
+            self._gemm_pointers.move_to_end(key)
+            return pointers
+        if not (X.flags.f_contiguous and tmp.flags.f_contiguous and U.flags.f_contiguous):
+            raise ValueError("Hamiltonian step needs Fortran-contiguous [d, d, B, ...] arrays")
+
+        # Matrix k = b + B*p of X and tmp uses U[:, :, b]
+        k = np.arange(X.size // (d * d), dtype=np.uint64)
+        step = np.uint64(d * d * X.itemsize)
+        pointers = tuple(
+            cp.asarray(np.uint64(base) + step * idx)
+            for base, idx in ((U.data.ptr, k % np.uint64(B)),
+                              (X.data.ptr, k), (tmp.data.ptr, k))
+        )
+        self._gemm_pointers[key] = pointers
+        if len(self._gemm_pointers) > _GEMM_POINTER_CACHE_SIZE:
+            self._gemm_pointers.popitem(last=False)
+        return pointers
+
+    def _build_dissipator_superop(self):
+        """
+        Batched Lindblad dissipator as a matrix S_D[B, d², d²] acting on
+        row-major vec(rho), using vec(A rho C) = (A kron C^T) vec(rho):
+
+            S_D = sum_k gamma_k (L kron L* - 0.5 L†L kron I - 0.5 I kron (L†L)^T)
+        """
+        xp = self.xp
+        d, B = self.d, self.B
+        n = d * d
+        eye = xp.eye(d, dtype=self.dtype)
+        S = xp.zeros((B, n, n), dtype=self.dtype)
+        for (L_k, rate_k), LdL in zip(self.collapse_ops, self._LdagL):
+            L_b = L_k.transpose(2, 0, 1)
+            LdL_b = LdL.transpose(2, 0, 1)
+            term = xp.einsum('bij,bkl->bikjl', L_b, L_b.conj()).reshape(B, n, n)
+            term -= 0.5 * xp.einsum('bij,kl->bikjl', LdL_b, eye).reshape(B, n, n)
+            term -= 0.5 * xp.einsum('ij,blk->bikjl', eye, LdL_b).reshape(B, n, n)
+            S += rate_k[:, None, None] * term
+        return S
+
+    def _dissipator_propagator(self, tau):
+        """expm(S_D tau) as [B, d², d²], cached for the last few tau."""
+        P = self._dissipator_props.get(tau)
+        if P is None:
+            xp = self.xp
+            P = xp.ascontiguousarray(
+                batched_expm(xp.ascontiguousarray((self._S_D * tau).transpose(1, 2, 0)), xp=xp,
+                             precision=self.precision)
+                .transpose(2, 0, 1).astype(self.dtype, copy=False)
+            )
+            self._dissipator_props[tau] = P
+            while len(self._dissipator_props) > self._dissipator_cache_size:
+                self._dissipator_props.popitem(last=False)
+        else:
+            self._dissipator_props.move_to_end(tau)
+        return P
+
+    def _apply_dissipator_propagator(self, rho, tau):
+        """rho -> unvec(expm(S_D tau) vec(rho)), in place."""
+        B, d = self.B, self.d
+        P = self._dissipator_propagator(tau)
+        self._vec_in.reshape(B, d, d)[...] = rho.transpose(2, 0, 1)
+        self.xp.matmul(P, self._vec_in, out=self._vec_out)
+        rho.transpose(2, 0, 1)[...] = self._vec_out.reshape(B, d, d)
+
+    def _dissipator_step(self, rho, tau):
+        """rho -> exp(L_D tau) rho (exact) or rho + tau * L_D[rho] (Euler)."""
+        if self.dissipator == 'exact':
+            self._apply_dissipator_propagator(rho, tau)
+        else:
+            self._compute_dissipator_action(rho, self._drho)
+            rho += tau * self._drho
+
+    def _dissipator_half_step(self, rho, dt):
+        """rho -> exp(L_D dt/2) rho (exact) or its Euler approximation."""
+        self._dissipator_step(rho, dt / 2.0)
+
+    def _coupled_half_step(self, rho, drho, j_rho, drho_L, dt, t, eval_J, second=False):
+        """
+        Dissipative half step (dt/2) of the coupled TME system, starting at t:
+            rho  -> exp(L_D dt/2) rho
+            drho -> drho + (dt/2) * (L_D[drho] + J[rho])
+
+        eval_J(t) fills j_rho with J[rho] for the current rho. With the
+        exact dissipator drho is propagated exactly and the source integral
+        uses the trapezoidal rule over [t, t + dt/2], which keeps the step
+        symmetric (needed for the composition schemes); the Euler path is
+        explicit and evaluates J at the start of the first half step and at
+        the end of the second one (second=True) of a substep.
+        """
+        h = dt / 2.0
+        if self.dissipator == 'exact':
+            # int_0^h P(h - s) J[rho(s)] ds ~ h/2 (P J[rho(0)] + J[rho(h)])
+            eval_J(t)
+            drho += (h / 2.0) * j_rho
+            self._apply_dissipator_propagator(rho, h)
+            self._apply_dissipator_propagator(drho, h)
+            eval_J(t + h)
+            drho += (h / 2.0) * j_rho
+        else:
+            self._dissipator_step(rho, h)
+            eval_J(t + h if second else t)
+            self._compute_dissipator_action(drho, drho_L)
+            drho += h * (drho_L + j_rho)
+
+    def _step(self, rho, ti, dt):
+        """Advance rho by dt (in place) with the configured scheme."""
+        if self.scheme == 'yoshida4':
+            self._yoshida4_step(rho, ti, dt)
+        else:
+            self._strang_step(rho, ti, dt)
+
+    def _yoshida4_step(self, rho, ti, dt):
+        """
+        S(w1 dt) S(w0 dt) S(w1 dt) with H(ti) held over the whole step.
 
-        # A = -2*pi*i * H * dt  (in-place into pre-allocated buffer)
-        cp.multiply(self._H_buf, -2.0j * np.pi * dt, out=self._A_buf)
+        Adjacent dissipator half-steps of consecutive Strang steps are merged
+        (exact for dissipator='exact'), and U(w1 dt) is reused for the outer
+        two steps: two propagators and four dissipator steps per step.
+        """
+        w1, w0 = _YOSHIDA4_W1, _YOSHIDA4_W0
+
+        self._compute_step_propagator(ti, w1 * dt)
+        self._U, self._U_alt = self._U_alt, self._U
+        self._Udag, self._Udag_alt = self._Udag_alt, self._Udag
+        self._compute_step_propagator(ti, w0 * dt)
+
+        self._dissipator_step(rho, 0.5 * w1 * dt)
+        self._hamiltonian_step(rho, self._U_alt, self._Udag_alt)
+        self._dissipator_step(rho, 0.5 * (w1 + w0) * dt)
+        self._hamiltonian_step(rho, self._U, self._Udag)
+        self._dissipator_step(rho, 0.5 * (w0 + w1) * dt)
+        self._hamiltonian_step(rho, self._U_alt, self._Udag_alt)
+        self._dissipator_step(rho, 0.5 * w1 * dt)
+
+    def _strang_step(self, rho, ti, dt):
+        """One Strang step of rho (in place) with H(ti) held over dt."""
+        # Half-step dissipation
+        self._dissipator_half_step(rho, dt)
 
-        # Batched matrix exponential (zero-allocation workspace)
-        self._expm_ws.compute(self._A_buf)
-        self._U[:] = self._expm_ws.result
-        self._Udag[:] = self._U.conj().transpose(1, 0, 2)
+        # Full-step Hamiltonian (exact)
+        self._compute_step_propagator(ti, dt)
+        self._hamiltonian_step(rho)
 
-    def _hamiltonian_step(self, rho):
-        """rho -> U rho U† (exact unitary evolution)."""
-        self._tmp[:] = cp.einsum('ijb,jkb->ikb', self._U, rho)
-        rho[:] = cp.einsum('ijb,jkb->ikb', self._tmp, self._Udag)
+        # Half-step dissipation
+        self._dissipator_half_step(rho, dt)
 
     def _rho_to_flat(self, rho):
         """Convert [d, d, B] Fortran -> [B, d²] contiguous."""
-        return cp.ascontiguousarray(
+        return self.xp.ascontiguousarray(
             rho.transpose(2, 0, 1).reshape(self.B, self.d * self.d)
         )
 
-    def integrate(self, T, Nt, rho0_cupy, chunk_size=500):
+    def _make_writer(self, Nt, chunk_size, n_parts, trajectory_path, start=0):
+        shape = (Nt, self.B, n_parts * self.d * self.d)
+        packed = self.storage == 'packed'
+        dtype = np.finfo(self.dtype).dtype if packed else np.dtype(self.dtype)
+        if trajectory_path is not None:
+            # Resuming appends to the rows already on disk
+            sink = TrajectoryFileWriter(trajectory_path, shape, dtype=dtype,
+                                        mode='r+' if start else 'w+')
+        else:
+            sink = TensorSink(shape, dtype=_TORCH_DTYPES[dtype])
+        return _ChunkedSnapshotWriter(sink, Nt, chunk_size, n_parts, self.B, self.d, self.xp,
+                                      start=start, dtype=self.dtype, packed=packed)
+
+    def _checkpoint_meta(self, method, T, Nt, trajectory_path):
+        return {
+            'method': method, 'T': float(T), 'Nt': int(Nt), 'B': self.B, 'd': self.d,
+            'propagator': self.propagator, 'dissipator': self.dissipator,
+            'scheme': self.scheme, 'precision': self.precision, 'storage': self.storage,
+            'trajectory_path': os.path.abspath(trajectory_path),
+        }
+
+    def _check_checkpointing(self, checkpoint_path, checkpoint_every, trajectory_path, resume):
+        if (checkpoint_every or resume) and checkpoint_path is None:
+            raise ValueError("checkpoint_every / resume require checkpoint_path")
+        if checkpoint_path is not None and trajectory_path is None:
+            raise ValueError(
+                "Checkpointing requires trajectory_path, so that snapshots "
+                "written before an interruption survive it"
+            )
+
+    def _save_checkpoint(self, checkpoint_path, writer, meta, step, **arrays):
+        """Flush the trajectory up to `step` and write the state after it."""
+        t0 = time.perf_counter()
+        writer.sync()
+        host = {name: _to_host(arr) for name, arr in arrays.items()}
+        nbytes = save_checkpoint(checkpoint_path, host, dict(meta, step=step))
+        elapsed = time.perf_counter() - t0
+
+        stats = self.checkpoint_stats
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        stats['bytes'] = nbytes
+        logger.debug("  checkpoint at step %d: %.1f MB in %.3f s", step, nbytes / 1e6, elapsed)
+
+    def _load_resume(self, checkpoint_path, meta):
+        """Load a checkpoint and check it belongs to the run described by meta."""
+        arrays, saved = load_checkpoint(checkpoint_path)
+        for key, value in meta.items():
+            if saved.get(key) != value:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} does not match this run: "
+                    f"{key}={saved.get(key)!r}, expected {value!r}"
+                )
+        state = {name: self.xp.asarray(arr, dtype=self.dtype, order='F')
+                 for name, arr in arrays.items()}
+        logger.info("Resuming %s from step %d / %d", meta['method'], saved['step'],
+                    meta['Nt'] - 1)
+        return saved['step'], state
+
+    def _log_checkpoint_stats(self, steps, elapsed):
+        stats = self.checkpoint_stats
+        if stats['count']:
+            logger.info("  checkpoints: %d written (%.1f MB each), %.2f s total = %.1f%% "
+                        "of %d steps in %.1f s", stats['count'], stats['bytes'] / 1e6,
+                        stats['seconds'], 100.0 * stats['seconds'] / max(elapsed, 1e-12),
+                        steps, elapsed)
+
+    def resume(self, checkpoint_path, J_callback=None, chunk_size=500, checkpoint_every=0):
+        """
+        Continue an interrupted integrate / integrate_tme run.
+
+        The integrator must be constructed with the same H_callback,
+        collapse operators, batch and options as the original run; T, Nt and
+        the trajectory file are taken from the checkpoint.
+
+        Parameters
+        ----------
+        checkpoint_path : str
+        J_callback : cuQuantum Operator, optional
+            Required when the checkpoint comes from integrate_tme.
+        chunk_size : int
+        checkpoint_every : int
+            Keep checkpointing every this many steps (0: no further checkpoints).
+
+        Returns
+        -------
+        The full trajectory, as returned by the original method.
+        """
+        _, meta = load_checkpoint(checkpoint_path)
+        kwargs = dict(chunk_size=chunk_size, trajectory_path=meta['trajectory_path'],
+                      checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+                      resume=True)
+        if meta['method'] == 'integrate_tme':
+            if J_callback is None:
+                raise ValueError("Resuming integrate_tme requires J_callback")
+            return self.integrate_tme(meta['T'], meta['Nt'], None, J_callback, **kwargs)
+        return self.integrate(meta['T'], meta['Nt'], None, **kwargs)
+
+    def integrate(self, T, Nt, rho0_cupy, chunk_size=500, trajectory_path=None,
+                  checkpoint_path=None, checkpoint_every=0, resume=False):
         """
         Full Strang-split integration of Lindblad equation.
 
@@ -140,53 +928,323 @@ class StrangSplitIntegrator:
             Total time
         Nt : int
             Number of time steps
-        rho0_cupy : cp.ndarray [d, d, B] Fortran order
-            Initial density matrix
+        rho0_cupy : xp.ndarray [d, d, B] Fortran order
+            Initial density matrix (ignored when resuming)
         chunk_size : int
-            Store to CPU every chunk_size steps to limit GPU memory.
+            Snapshots are buffered on the GPU and copied to CPU every
+            chunk_size steps, asynchronously on a separate stream.
+        trajectory_path : str, optional
+            Stream the trajectory to this .npy file on a background thread
+            instead of holding it in RAM.
+        checkpoint_path : str, optional
+            Checkpoint file (.npz). Requires trajectory_path.
+        checkpoint_every : int
+            Write a checkpoint every this many steps (0: never). Each
+            checkpoint flushes the trajectory file; the time spent is
+            accumulated in self.checkpoint_stats.
+        resume : bool
+            Continue from checkpoint_path instead of starting at rho0_cupy
+            (see also resume()).
 
         Returns
         -------
-        torch.Tensor [Nt, B, d^2] on CPU
+        torch.Tensor [Nt, B, d^2] on CPU, or a read-only np.memmap of the
+        same shape if trajectory_path is given.
         """
+        xp = self.xp
         B, d = self.B, self.d
         dt = T / (Nt - 1)
+        self._check_checkpointing(checkpoint_path, checkpoint_every, trajectory_path, resume)
+        self.checkpoint_stats = {'count': 0, 'seconds': 0.0, 'bytes': 0}
+        if checkpoint_path is not None:
+            meta = self._checkpoint_meta('integrate', T, Nt, trajectory_path)
 
-        rho = cp.array(rho0_cupy, dtype=cp.complex128, order='F')
+        if resume:
+            start, state = self._load_resume(checkpoint_path, meta)
+            rho = state['rho']
+            # Rows 0..start are already in the trajectory file
+            writer = self._make_writer(Nt, chunk_size, 1, trajectory_path, start=start + 1)
+        else:
+            start = 0
+            rho = xp.array(rho0_cupy, dtype=self.dtype, order='F')
 
-        # Pre-allocate full solution on CPU
-        sol_cpu = torch.empty(Nt, B, d * d, dtype=torch.complex128, device='cpu')
-        sol_cpu[0] = torch.as_tensor(self._rho_to_flat(rho).get())
+            # Full solution on CPU (or on disk)
+            writer = self._make_writer(Nt, chunk_size, 1, trajectory_path)
+            writer.push(rho)
 
         logger.info("Integrating Lindblad (Strang): %d steps, dt=%.2e, batch=%d, dim=%d",
                      Nt, dt, B, d)
 
-        for i in range(Nt - 1):
-            # Half-step dissipation
-            self._compute_dissipator_action(rho, self._drho)
-            rho += (dt / 2.0) * self._drho
-
-            # Full-step Hamiltonian (exact)
-            self._compute_step_propagator(i, dt)
-            self._hamiltonian_step(rho)
-
-            # Half-step dissipation
-            self._compute_dissipator_action(rho, self._drho)
-            rho += (dt / 2.0) * self._drho
+        t_run = time.perf_counter()
+        for i in range(start, Nt - 1):
+            self._step(rho, i, dt)
 
             # Store snapshot
-            sol_cpu[i + 1] = torch.as_tensor(self._rho_to_flat(rho).get())
+            writer.push(rho)
+
+            if checkpoint_every and (i + 1) % checkpoint_every == 0 and i + 1 < Nt - 1:
+                self._save_checkpoint(checkpoint_path, writer, meta, i + 1, rho=rho)
 
             if (i + 1) % 1000 == 0:
                 logger.info("  ... %d / %d steps done", i + 1, Nt - 1)
 
+        sol_cpu = writer.close()
+        self._log_checkpoint_stats(Nt - 1 - start, time.perf_counter() - t_run)
+
+        if self.propagator_cache is not None:
+            logger.info("  propagator cache: %s", self.propagator_cache.stats())
+
         # NaN check on final state
-        if cp.isnan(rho).any() or cp.isinf(rho).any():
+        if xp.isnan(rho).any() or xp.isinf(rho).any():
             raise RuntimeError("Strang solver failed: NaN/Inf detected")
 
         return sol_cpu
 
-    def integrate_tme(self, T, Nt, rho0_cupy, J_callback, chunk_size=500):
+    def _segment_ends(self, n_cells):
+        """
+        For every grid cell c, the first cell after c in which H differs
+        from H(c) (n_cells if none).
+
+        Uses segment_callback when given (None IDs count as a change at
+        every cell), else evaluates H_callback on every cell and compares.
+        """
+        xp = self.xp
+        changed = np.ones(n_cells, dtype=bool)
+        if self.segment_callback is not None:
+            prev = self.segment_callback(0)
+            for c in range(1, n_cells):
+                segment = self.segment_callback(c)
+                changed[c] = segment is None or segment != prev
+                prev = segment
+        elif n_cells > 0:
+            H_prev = xp.empty_like(self._H_buf)
+            self.H_callback(0, self.B, H_prev)
+            for c in range(1, n_cells):
+                self.H_callback(c, self.B, self._H_buf)
+                changed[c] = not bool(xp.array_equal(self._H_buf, H_prev))
+                xp.copyto(H_prev, self._H_buf)
+        ends = np.empty(n_cells, dtype=np.int64)
+        end = n_cells
+        for c in range(n_cells - 1, -1, -1):
+            ends[c] = end
+            if changed[c]:
+                end = c
+        return ends
+
+    def integrate_adaptive(self, T, Nt, rho0_cupy, rtol=1e-6, atol=1e-8, max_refine=4,
+                           max_coarsen=6, chunk_size=500, trajectory_path=None):
+        """
+        Lindblad integration with adaptive step size (step doubling).
+
+        Each trial step of length h is compared against two steps of h/2;
+        the step is accepted when max|rho_2 - rho_1| / (atol + rtol*|rho_2|)
+        <= 1 and the two-half-step result is kept. Step sizes are dyadic
+        multiples of the grid spacing dt = T/(Nt-1), from dt/2**max_refine
+        (around pulse edges) up to dt*2**max_coarsen (idle or slowly varying
+        segments), and steps are aligned so that a step of >= dt starts on a
+        grid point and H_callback(ti) stays well defined. A step at the
+        finest level is accepted regardless of the error estimate.
+
+        A step never crosses a grid cell in which H changes: the segments
+        are found once, from segment_callback when given, else by
+        evaluating H_callback on every cell, and steps are cut at the next
+        change. Coarsening therefore only pays off for piecewise-constant
+        H (idle stretches, constant drive); with H varying from cell to
+        cell the steps stay at or below the grid spacing.
+
+        Snapshots on the requested grid that fall inside an accepted step
+        are linearly interpolated between its end points, so they carry an
+        O(h^2) interpolation error on top of the tolerance; keep max_coarsen
+        small if intermediate snapshots (not just the final state) matter.
+
+        Parameters
+        ----------
+        T, Nt, rho0_cupy, chunk_size, trajectory_path
+            As in integrate.
+        rtol, atol : float
+            Relative / absolute tolerance of the local error estimate.
+        max_refine : int
+            Number of times a grid cell may be halved.
+        max_coarsen : int
+            log2 of the largest step, in grid cells.
+
+        Returns
+        -------
+        torch.Tensor [Nt, B, d^2] on CPU, or a read-only np.memmap
+        """
+        xp = self.xp
+        B, d = self.B, self.d
+        dt = T / (Nt - 1)
+
+        # Positions are counted in units of dt / 2**max_refine
+        per_cell = 2 ** max_refine
+        total = (Nt - 1) * per_cell
+        unit = dt / per_cell
+        j_max = max_refine + max_coarsen
+        order = 4 if self.scheme == 'yoshida4' else 2
+
+        segment_ends = self._segment_ends(Nt - 1)
+
+        rho = xp.array(rho0_cupy, dtype=self.dtype, order='F')
+        rho_prev = xp.zeros_like(rho)
+        rho_full = xp.zeros_like(rho)
+        rho_interp = xp.zeros_like(rho)
+
+        writer = self._make_writer(Nt, chunk_size, 1, trajectory_path)
+        writer.push(rho)
+
+        logger.info("Integrating Lindblad (adaptive): grid of %d points, dt=%.2e, "
+                    "rtol=%.1e, atol=%.1e, batch=%d, dim=%d", Nt, dt, rtol, atol, B, d)
+
+        # Every level uses dissipator steps of two lengths (h/2 and h/4, times
+        # the composition weights): keep all of them while stepping
+        n_taus = 2 if self.scheme == 'yoshida4' else 1
+        cache_size = self._dissipator_cache_size
+        self._dissipator_cache_size = max(cache_size, 2 * n_taus * (j_max + 1))
+
+        pos = 0
+        next_grid = 1
+        j = max_refine  # error-controlled level, start with one grid cell
+        n_accepted = n_rejected = 0
+        while pos < total:
+            ti = pos // per_cell
+            # Largest aligned step that stays inside the segment of H(ti)
+            limit = segment_ends[ti] * per_cell
+            js = j
+            while js > 0 and (pos % 2 ** js or pos + 2 ** js > limit):
+                js -= 1
+            n = 2 ** js
+            h = n * unit
+
+            xp.copyto(rho_prev, rho)
+            xp.copyto(rho_full, rho)
+            self._step(rho_full, ti, h)
+            self._step(rho, ti, h / 2.0)
+            self._step(rho, (pos + n // 2) // per_cell, h / 2.0)
+
+            err = float(xp.max(xp.abs(rho - rho_full) / (atol + rtol * xp.abs(rho))))
+            if err > 1.0 and js > 0:
+                xp.copyto(rho, rho_prev)
+                j = max(js - max(1, int(np.ceil(np.log2(err) / (order + 1)))), 0)
+                n_rejected += 1
+                continue
+
+            # Accepted: emit every grid point in (pos, pos + n]
+            n_accepted += 1
+            end = pos + n
+            while next_grid < Nt and next_grid * per_cell <= end:
+                frac = (next_grid * per_cell - pos) / n
+                if frac == 1.0:
+                    writer.push(rho)
+                else:
+                    xp.multiply(rho_prev, 1.0 - frac, out=rho_interp)
+                    rho_interp += frac * rho
+                    writer.push(rho_interp)
+                next_grid += 1
+            pos = end
+
+            # Local error ~ h**(order+1): grow when doubling h stays in tolerance
+            if js == j and err * 2 ** (order + 1) < 0.5 and j < j_max:
+                j += 1
+
+        sol_cpu = writer.close()
+        self._dissipator_cache_size = cache_size
+        while len(self._dissipator_props) > cache_size:
+            self._dissipator_props.popitem(last=False)
+
+        self.adaptive_stats = {'accepted': n_accepted, 'rejected': n_rejected,
+                               'uniform_steps': Nt - 1}
+        logger.info("  adaptive steps: %d accepted, %d rejected (grid has %d)",
+                    n_accepted, n_rejected, Nt - 1)
+        if self.propagator_cache is not None:
+            logger.info("  propagator cache: %s", self.propagator_cache.stats())
+
+        if xp.isnan(rho).any() or xp.isinf(rho).any():
+            raise RuntimeError("Strang solver failed: NaN/Inf detected")
+
+        return sol_cpu
+
+    def integrate_observables(self, T, Nt, rho0_cupy, observables=None, stride=1,
+                              callback=None):
+        """
+        Strang-split integration that only records expectation values.
+
+        Nothing of size d^2 per step leaves the GPU: <O_k>(t) = Tr(O_k rho(t))
+        is evaluated on-device every `stride` steps, so memory scales with
+        the number of observables instead of Nt * d^2.
+
+        Parameters
+        ----------
+        T : float
+            Total time
+        Nt : int
+            Number of time steps
+        rho0_cupy : xp.ndarray [d, d, B] Fortran order
+            Initial density matrix
+        observables : list of xp.ndarray, optional
+            Each O_k is [d, d] (shared by the batch) or [d, d, B].
+        stride : int
+            Record every stride-th time index (0, stride, 2*stride, ...).
+        callback : callable(ti, t, rho), optional
+            Called on the recorded time indices with the device rho, e.g. for
+            custom reductions. Must not modify rho.
+
+        Returns
+        -------
+        times : np.ndarray [n_rec]
+            Recorded times.
+        values : torch.Tensor [n_rec, B, K] on CPU, or None
+            Expectation values, None if no observables were given.
+        """
+        xp = self.xp
+        B, d = self.B, self.d
+        dt = T / (Nt - 1)
+        stride = max(1, int(stride))
+        rec_idx = np.arange(0, Nt, stride)
+
+        rho = xp.array(rho0_cupy, dtype=self.dtype, order='F')
+
+        O = None
+        if observables:
+            O = xp.stack([
+                xp.broadcast_to(xp.asarray(O_k, dtype=self.dtype).reshape(d, d, -1), (d, d, B))
+                for O_k in observables
+            ])  # [K, d, d, B]
+            values_dev = xp.empty((len(rec_idx), B, len(observables)), dtype=self.dtype)
+
+        def record(n, ti):
+            if O is not None:
+                # Tr(O_k rho) = sum_ij O_k[i, j] rho[j, i]
+                xp.einsum('kijb,jib->bk', O, rho, out=values_dev[n])
+            if callback is not None:
+                callback(ti, ti * dt, rho)
+
+        logger.info("Integrating Lindblad observables (Strang): %d steps, stride=%d, "
+                    "batch=%d, dim=%d, n_obs=%d", Nt, stride, B, d,
+                    0 if O is None else O.shape[0])
+
+        record(0, 0)
+        for i in range(Nt - 1):
+            self._step(rho, i, dt)
+
+            if (i + 1) % stride == 0:
+                record((i + 1) // stride, i + 1)
+
+            if (i + 1) % 1000 == 0:
+                logger.info("  ... %d / %d steps done", i + 1, Nt - 1)
+
+        if self.propagator_cache is not None:
+            logger.info("  propagator cache: %s", self.propagator_cache.stats())
+
+        if xp.isnan(rho).any() or xp.isinf(rho).any():
+            raise RuntimeError("Strang solver failed: NaN/Inf detected")
+
+        values = torch.as_tensor(_to_host(values_dev)) if O is not None else None
+        return rec_idx * dt, values
+
+    def integrate_tme(self, T, Nt, rho0_cupy, J_callback, chunk_size=500,
+                      trajectory_path=None, checkpoint_path=None, checkpoint_every=0,
+                      resume=False):
         """
         Strang-split integration of tangent master equation.
 
@@ -198,79 +1256,104 @@ class StrangSplitIntegrator:
         ----------
         T : float
         Nt : int
-        rho0_cupy : cp.ndarray [d, d, B]
+        rho0_cupy : xp.ndarray [d, d, B]
         J_callback : cuQuantum Operator
             J_action with .compute_action(t, dummy, in_state, out_state)
         chunk_size : int
+            Snapshots are copied to CPU every chunk_size steps (see integrate).
+        trajectory_path : str, optional
+            Stream the trajectory to this .npy file (see integrate).
+        checkpoint_path, checkpoint_every, resume
+            Periodic checkpoints of (rho, drho, step), see integrate.
 
         Returns
         -------
-        torch.Tensor [Nt, B, 2*d^2] on CPU
+        torch.Tensor [Nt, B, 2*d^2] on CPU, or a read-only np.memmap
         """
+        xp = self.xp
         B, d = self.B, self.d
         dt = T / (Nt - 1)
-        dummy = cp.zeros((1, B), dtype=cp.float64, order='F')
+        dummy = xp.zeros((1, B), dtype=xp.float64, order='F')
+        self._check_checkpointing(checkpoint_path, checkpoint_every, trajectory_path, resume)
+        self.checkpoint_stats = {'count': 0, 'seconds': 0.0, 'bytes': 0}
+        if checkpoint_path is not None:
+            meta = self._checkpoint_meta('integrate_tme', T, Nt, trajectory_path)
 
-        rho = cp.array(rho0_cupy, dtype=cp.complex128, order='F')
-        drho = cp.zeros_like(rho)  # delta_rho_0 = 0
+        # rho and drho are the two halves of one [d, d, B, 2] stack, so the
+        # Hamiltonian step conjugates both with U in one batched call
+        pair = xp.zeros((d, d, B, 2), dtype=self.dtype, order='F')
+        pair_tmp = xp.zeros_like(pair)
+        rho, drho = pair[..., 0], pair[..., 1]
+        if resume:
+            start, state = self._load_resume(checkpoint_path, meta)
+            rho[...] = state['rho']
+            drho[...] = state['drho']
+        else:
+            start = 0
+            rho[...] = rho0_cupy  # delta_rho_0 = 0
 
-        drho_L = cp.zeros_like(rho)  # L[drho] workspace
-        j_rho = cp.zeros_like(rho)   # J[rho] workspace
+        drho_L = xp.zeros_like(rho)  # L[drho] workspace
+        j_rho = xp.zeros_like(rho)   # J[rho] workspace
 
         # DenseMixedState wrappers for cuQuantum J action
         # clone() shares the underlying buffer, so compute_action reads current rho
         rho_s = self.state_template.clone(rho)
         j_out_s = self.state_template.clone(j_rho)
 
-        # Pre-allocate solution on CPU
-        sol_cpu = torch.empty(Nt, B, 2 * d * d, dtype=torch.complex128, device='cpu')
-
-        # Store initial state
-        rho_flat = self._rho_to_flat(rho).get()
-        drho_flat = self._rho_to_flat(drho).get()
-        sol_cpu[0] = torch.as_tensor(np.concatenate([rho_flat, drho_flat], axis=1))
+        # Solution on CPU (or on disk); store initial state
+        if resume:
+            writer = self._make_writer(Nt, chunk_size, 2, trajectory_path, start=start + 1)
+        else:
+            writer = self._make_writer(Nt, chunk_size, 2, trajectory_path)
+            writer.push(rho, drho)
 
         logger.info("Integrating TME (Strang): %d steps, dt=%.2e, batch=%d, dim=%d",
                      Nt, dt, B, d)
 
-        for i in range(Nt - 1):
-            t = i * dt
-
-            # --- Half-step dissipation for rho ---
-            self._compute_dissipator_action(rho, self._drho)
-            rho += (dt / 2.0) * self._drho
-
-            # --- Half-step dissipation for drho + J[rho] source ---
-            self._compute_dissipator_action(drho, drho_L)
+        def eval_J(t):
             # J[rho]: use cuQuantum action for the dH/db commutator
             J_callback.compute_action(t, dummy, rho_s, j_out_s)
-            drho += (dt / 2.0) * (drho_L + j_rho)
+
+        def substep(ti, t, tau):
+            # --- Half-step dissipation for rho, drho + J[rho] source ---
+            self._coupled_half_step(rho, drho, j_rho, drho_L, tau, t, eval_J)
 
             # --- Full-step Hamiltonian (exact) for both rho and drho ---
-            self._compute_step_propagator(i, dt)
-            self._hamiltonian_step(rho)
-            # drho propagates with same U: drho -> U drho U†
-            self._tmp[:] = cp.einsum('ijb,jkb->ikb', self._U, drho)
-            drho[:] = cp.einsum('ijb,jkb->ikb', self._tmp, self._Udag)
+            # drho propagates with the same U: drho -> U drho U†
+            self._compute_step_propagator(ti, tau)
+            self._hamiltonian_step(pair, tmp=pair_tmp)
 
-            # --- Half-step dissipation for rho ---
-            self._compute_dissipator_action(rho, self._drho)
-            rho += (dt / 2.0) * self._drho
+            # --- Half-step dissipation for rho, drho + J[rho] source ---
+            self._coupled_half_step(rho, drho, j_rho, drho_L, tau, t + tau / 2.0, eval_J, second=True)
 
-            # --- Half-step dissipation for drho + J[rho] source ---
-            self._compute_dissipator_action(drho, drho_L)
-            J_callback.compute_action(t + dt, dummy, rho_s, j_out_s)
-            drho += (dt / 2.0) * (drho_L + j_rho)
+        t_run = time.perf_counter()
+        for i in range(start, Nt - 1):
+            t = i * dt
+
+            if self.scheme == 'yoshida4':
+                w1, w0 = _YOSHIDA4_W1, _YOSHIDA4_W0
+                substep(i, t, w1 * dt)
+                substep(i, t + w1 * dt, w0 * dt)
+                substep(i, t + (w1 + w0) * dt, w1 * dt)
+            else:
+                substep(i, t, dt)
 
             # Store snapshot
-            rho_flat = self._rho_to_flat(rho).get()
-            drho_flat = self._rho_to_flat(drho).get()
-            sol_cpu[i + 1] = torch.as_tensor(np.concatenate([rho_flat, drho_flat], axis=1))
+            writer.push(rho, drho)
+
+            if checkpoint_every and (i + 1) % checkpoint_every == 0 and i + 1 < Nt - 1:
+                self._save_checkpoint(checkpoint_path, writer, meta, i + 1, rho=rho, drho=drho)
 
             if (i + 1) % 1000 == 0:
                 logger.info("  ... %d / %d steps done", i + 1, Nt - 1)
 
-        if cp.isnan(rho).any() or cp.isinf(rho).any():
+        sol_cpu = writer.close()
+        self._log_checkpoint_stats(Nt - 1 - start, time.perf_counter() - t_run)
+
+        if self.propagator_cache is not None:
+            logger.info("  propagator cache: %s", self.propagator_cache.stats())
+
+        if xp.isnan(rho).any() or xp.isinf(rho).any():
             raise RuntimeError("Strang TME solver failed: NaN/Inf detected")
 
         return sol_cpu
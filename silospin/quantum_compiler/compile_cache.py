@@ -0,0 +1,204 @@
+"""On-disk cache of compiled GST programs.
+
+GateSetTomographyQuantumCompiler turns a GST file and the gate parameters
+into, per AWG core, a compiled sequencer program (ELF), the waveforms to
+upload and a command table. All of it is a pure function of the inputs, so
+CompileCache stores those artifacts under a content hash of
+
+    GST file contents, gate parameters, channel mapping, padding,
+    n_inner / n_outer, arbitrary gate definitions, target devices and the
+    installed zhinst version (the ELFs come from its sequencer compiler)
+
+and a repeated compilation of byte-identical inputs goes straight to the
+upload. Entries are single pickle files in the cache directory, written
+atomically; the cache is pruned by total size (least recently used first)
+and optionally by age.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import zhinst.core
+    ZHINST_VERSION = zhinst.core.__version__
+except ImportError:
+    ZHINST_VERSION = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the stored artifacts changes
+CACHE_VERSION = 3
+
+_SUFFIX = '.gstc'
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (np.ndarray, set, tuple)):
+        return list(obj)
+    return repr(obj)
+
+
+def _canonical(obj):
+    """Stable JSON text of nested dicts (int and str keys are both allowed)."""
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    return obj
+
+
+def _file_digest(path):
+    if path is None or not os.path.exists(path):
+        return 'missing'
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def compile_cache_key(gst_file_path, gate_parameters, channel_mapping, added_padding,
+                      n_inner, n_outer, arbgate_picklefile_location=None, device_ids=()):
+    """
+    Content hash identifying a compiled GST program.
+
+    Parameters:
+        gst_file_path (str): GST file; its contents (not its path or mtime) are hashed.
+        gate_parameters (dict): gate parameters as passed to the compiler.
+        channel_mapping (dict): channel mapping of the HDAWGs.
+        added_padding (float): added padding to gate pulses.
+        n_inner, n_outer (int): inner and outer loop counts.
+        arbgate_picklefile_location (str): pickle file with the arbitrary gate definitions.
+        device_ids (iterable of str): target HDAWG serials.
+
+    The installed zhinst.core version is hashed as well, so entries compiled by another LabOne release are not reused.
+
+    Returns:
+        key (str): hex SHA-256 digest.
+    """
+    inputs = {
+        'version': CACHE_VERSION,
+        'gst_file': _file_digest(gst_file_path),
+        'arb_gates': _file_digest(arbgate_picklefile_location),
+        'gate_parameters': _canonical(gate_parameters),
+        'channel_mapping': _canonical(channel_mapping),
+        'added_padding': added_padding,
+        'n_inner': n_inner,
+        'n_outer': n_outer,
+        'devices': sorted(device_ids),
+        'zhinst': ZHINST_VERSION,
+    }
+    text = json.dumps(inputs, sort_keys=True, default=_json_default)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CompileCache:
+    """
+    Directory of compiled GST program artifacts keyed by compile_cache_key.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the entries (created if needed).
+    max_bytes : int, optional
+        Total size above which the least recently used entries are evicted.
+        None disables size based eviction.
+    max_age : float, optional
+        Entries not used for longer than max_age seconds are evicted. None
+        disables age based eviction.
+    """
+
+    def __init__(self, cache_dir, max_bytes=1 << 30, max_age=None):
+        self.cache_dir = str(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def load(self, key):
+        """Stored artifacts for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                entry = pickle.load(handle)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+            logger.warning("Discarding unreadable compile cache entry %s: %s", path, exc)
+            os.remove(path)
+            self.misses += 1
+            return None
+        if entry.get('version') != CACHE_VERSION:
+            self.misses += 1
+            return None
+        # Mark as recently used for the LRU eviction
+        os.utime(path)
+        self.hits += 1
+        return entry['artifacts']
+
+    def store(self, key, artifacts):
+        """Write artifacts for key atomically, then prune the cache. Returns the entry size."""
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                pickle.dump({'version': CACHE_VERSION, 'artifacts': artifacts}, handle,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        size = os.path.getsize(path)
+        self.evict(keep=key)
+        return size
+
+    def entries(self):
+        """(path, size, last use time) of every entry, least recently used first."""
+        out = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                out.append((path, stat.st_size, stat.st_mtime))
+        return sorted(out, key=lambda e: e[2])
+
+    def evict(self, keep=None):
+        """Drop entries older than max_age, then LRU entries beyond max_bytes."""
+        keep_path = None if keep is None else self._path(keep)
+        entries = self.entries()
+        now = time.time()
+        removed = []
+        if self.max_age is not None:
+            for e in entries:
+                if now - e[2] > self.max_age and e[0] != keep_path:
+                    removed.append(e)
+        if self.max_bytes is not None:
+            total = sum(e[1] for e in entries if e not in removed)
+            for e in entries:
+                if total <= self.max_bytes:
+                    break
+                if e in removed or e[0] == keep_path:
+                    continue
+                removed.append(e)
+                total -= e[1]
+        for path, _, _ in removed:
+            os.remove(path)
+        if removed:
+            logger.info("Evicted %d compile cache entries from %s", len(removed), self.cache_dir)
+        return len(removed)
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.remove(path)
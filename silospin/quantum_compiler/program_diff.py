@@ -0,0 +1,37 @@
+"""Differences between two compilations of a GST program.
+
+Used by GateSetTomographyQuantumCompiler.patch to upload only what changed
+between sweep points. Both functions work on the per-core artifacts stored
+by the compiler (and the compile cache): waveforms keyed by wave index and
+command tables as dicts (CommandTable.as_dict()).
+"""
+import numpy as np
+
+
+def changed_waveforms(old, new):
+    """
+    Wave indices of new whose samples differ from old (or are missing in old).
+
+    Parameters:
+        old, new (dict): waveforms of one core keyed by wave index.
+
+    Returns:
+        wave_idxs (list): sorted indices to upload.
+    """
+    return sorted(idx for idx in new if idx not in old or not np.array_equal(old[idx], new[idx]))
+
+
+def changed_command_table_entries(old, new):
+    """
+    Indices of the command table entries that differ between two tables.
+
+    Parameters:
+        old, new (dict): command tables as dicts with a 'table' list of entries carrying an 'index'.
+
+    Returns:
+        entry_idxs (list): sorted entry indices that were added, removed or modified.
+    """
+    old_entries = {entry['index']: entry for entry in old.get('table', [])}
+    new_entries = {entry['index']: entry for entry in new.get('table', [])}
+    return sorted(idx for idx in old_entries.keys() | new_entries.keys()
+                  if old_entries.get(idx) != new_entries.get(idx))
@@ -0,0 +1,202 @@
+"""Array-backed intermediate representation (IR) of a parsed GST program.
+
+gst_file_parser produces, per line of the GST file, lists of gate strings
+per RF and plunger channel. ProgramIR stores the same program once, in
+flat integer arrays:
+
+  - an interned gate table: every distinct gate string gets an opcode, with
+    its kind ('pi_2', 'pi', 'arb', 'z', 'z0z', 'delay', 'plunger' or
+    'other') and, for delays, its duration in ns precomputed;
+  - opcodes: one int32 array holding the gate sequences of all lines and
+    channels back to back, addressed by starts/lengths [n_lines, n_channels];
+  - side tables for arbitrary gates: label, amplitude and the values in
+    brackets ('amp*L[tau&phase&...]') per arbitrary-gate opcode.
+
+Questions the compiler stages otherwise answer by re-scanning strings
+(which gates are arbitrary, which delay a 't' gate encodes, which channels
+play a pi pulse at a position) become array lookups. The IR is a plain
+NumPy container: ProgramIR.save / ProgramIR.load write it to a single .npz
+file, and it is pickled as part of the compile cache entries.
+"""
+import numpy as np
+
+# Gate kinds, opcode kind codes are indices into this tuple
+GATE_KINDS = ('pi_2', 'pi', 'arb', 'z', 'z0z', 'delay', 'plunger', 'other')
+KIND_PI_2, KIND_PI, KIND_ARB, KIND_Z, KIND_Z0Z, KIND_DELAY, KIND_PLUNGER, KIND_OTHER = range(len(GATE_KINDS))
+
+_PI_2_GATES = {'x', 'y', 'xxx', 'yyy'}
+_PI_GATES = {'xx', 'yy', 'mxxm', 'myym'}
+
+# Channel groups of gst_file_parser's sequence table, in storage order
+_GROUPS = ('rf', 'plunger')
+
+
+def gate_kind(gate):
+    """Kind of a gate string (one of GATE_KINDS)."""
+    if gate in _PI_2_GATES:
+        return 'pi_2'
+    if gate in _PI_GATES:
+        return 'pi'
+    if gate == 'p':
+        return 'plunger'
+    if gate == 'z0z':
+        return 'z0z'
+    if gate.find('*') != -1:
+        return 'arb'
+    if gate[0] == 'z':
+        return 'z'
+    if gate[0] == 't':
+        return 'delay'
+    return 'other'
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _parse_arb_gate(gate):
+    """(label, amplitude, bracket values) of an arbitrary gate 'amp*L[v0&v1&...]' (nan for unparsable numbers)."""
+    star = gate.find('*')
+    open_idx = gate.find('[')
+    close_idx = gate.find(']')
+    values = tuple(_to_float(v) for v in gate[open_idx+1:close_idx].split('&') if v != '')
+    return gate[star+1], _to_float(gate[:star]), values
+
+
+class ProgramIR:
+    """
+    Array-backed IR of a GST program (see module docstring).
+
+    Attributes
+    ----------
+    lines : np.ndarray [n_lines], int
+        GST line numbers (as used by gst_file_parser, starting at 1).
+    channels : list of (str, int)
+        (group, channel index) of every channel, group 'rf' or 'plunger'.
+    gates : np.ndarray [n_opcodes], str
+        Interned gate table; the opcode of a gate is its index.
+    kinds : np.ndarray [n_opcodes], int8
+        Index into GATE_KINDS per opcode.
+    durations : np.ndarray [n_opcodes], int64
+        Delay in ns of 'delay' opcodes, -1 otherwise.
+    opcodes : np.ndarray [n_total], int32
+        Gate sequences of all (line, channel) pairs back to back.
+    starts, lengths : np.ndarray [n_lines, n_channels], int64
+        Segment of opcodes holding each (line, channel) sequence.
+    arb_opcodes : np.ndarray [n_arb], int32
+        Opcodes of the arbitrary gates, with their side tables arb_labels,
+        arb_amps, and arb_values / arb_value_offsets (bracket values of
+        arbitrary gate k are arb_values[arb_value_offsets[k]:arb_value_offsets[k+1]]).
+    """
+
+    def __init__(self, lines, channels, gates, opcodes, starts, lengths):
+        self.lines = np.asarray(lines, dtype=np.int64)
+        self.channels = [(str(group), int(ch)) for group, ch in channels]
+        self.gates = np.asarray(gates, dtype=str)
+        self.opcodes = np.asarray(opcodes, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self._line_pos = {int(line): i for i, line in enumerate(self.lines)}
+        self._channel_pos = {ch: i for i, ch in enumerate(self.channels)}
+
+        kinds = [gate_kind(g) for g in self.gates]
+        self.kinds = np.array([GATE_KINDS.index(k) for k in kinds], dtype=np.int8)
+        self.durations = np.array([int(g[1:]) if k == 'delay' and g[1:].isdigit() else -1
+                                   for g, k in zip(self.gates, kinds)], dtype=np.int64)
+
+        arb = [i for i, k in enumerate(kinds) if k == 'arb']
+        parsed = [_parse_arb_gate(self.gates[i]) for i in arb]
+        self.arb_opcodes = np.array(arb, dtype=np.int32)
+        self.arb_labels = np.array([p[0] for p in parsed], dtype=str)
+        self.arb_amps = np.array([p[1] for p in parsed], dtype=np.float64)
+        self.arb_value_offsets = np.cumsum([0] + [len(p[2]) for p in parsed]).astype(np.int64)
+        self.arb_values = np.array([v for p in parsed for v in p[2]], dtype=np.float64)
+
+    @classmethod
+    def from_sequence_table(cls, sequence_table):
+        """Build the IR from the sequence table returned by gst_file_parser."""
+        lines = sorted(sequence_table)
+        channels = []
+        if lines:
+            first = sequence_table[lines[0]]
+            channels = [(group, ch) for group in _GROUPS for ch in first[group]]
+
+        table = {}
+        opcodes = []
+        starts = np.zeros((len(lines), len(channels)), dtype=np.int64)
+        lengths = np.zeros_like(starts)
+        for i, line in enumerate(lines):
+            for j, (group, ch) in enumerate(channels):
+                seq = sequence_table[line][group][ch]
+                starts[i, j] = len(opcodes)
+                lengths[i, j] = len(seq)
+                opcodes.extend(table.setdefault(gate, len(table)) for gate in seq)
+        gates = sorted(table, key=table.get)
+        return cls(lines, channels, gates, opcodes, starts, lengths)
+
+    @property
+    def n_lines(self):
+        return len(self.lines)
+
+    def sequence(self, line, group, channel):
+        """Opcode array (a view) of one channel on one GST line."""
+        i = self._line_pos[int(line)]
+        j = self._channel_pos[(group, int(channel))]
+        start = self.starts[i, j]
+        return self.opcodes[start:start + self.lengths[i, j]]
+
+    def line_table(self, line):
+        """
+        Opcodes of one GST line as an [n_channels, n_gates] array, rows in self.channels order.
+
+        Every channel of a line plays one gate (or delay) per gate slot, so
+        the sequences of a line have equal lengths; raises ValueError if not.
+        """
+        i = self._line_pos[int(line)]
+        lengths = self.lengths[i]
+        if len(lengths) == 0:
+            return np.zeros((0, 0), dtype=self.opcodes.dtype)
+        if np.any(lengths != lengths[0]):
+            raise ValueError(f"Gate sequences of line {line} have different lengths: {lengths.tolist()}")
+        return self.opcodes[self.starts[i][:, None] + np.arange(lengths[0])]
+
+    def kind_mask(self, line, group, channel, kind):
+        """Boolean array marking the positions of one channel's sequence with gates of the given kind."""
+        return self.kinds[self.sequence(line, group, channel)] == GATE_KINDS.index(kind)
+
+    def arb_gate(self, opcode):
+        """(label, amplitude, bracket values) of an arbitrary-gate opcode."""
+        k = int(np.searchsorted(self.arb_opcodes, opcode))
+        if k == len(self.arb_opcodes) or self.arb_opcodes[k] != opcode:
+            raise ValueError(f"Opcode {opcode} ({str(self.gates[opcode])!r}) is not an arbitrary gate")
+        values = self.arb_values[self.arb_value_offsets[k]:self.arb_value_offsets[k+1]]
+        return str(self.arb_labels[k]), float(self.arb_amps[k]), tuple(values.tolist())
+
+    def gate_strings(self, line):
+        """Gate strings of one line in gst_file_parser's layout: {"rf": {ch: [...]}, "plunger": {ch: [...]}}."""
+        out = {group: {} for group in _GROUPS}
+        for group, ch in self.channels:
+            out[group][ch] = [str(g) for g in self.gates[self.sequence(line, group, ch)]]
+        return out
+
+    def sequence_table(self):
+        """The full sequence table in gst_file_parser's layout."""
+        return {int(line): self.gate_strings(line) for line in self.lines}
+
+    def save(self, path):
+        """Write the IR to a single .npz file."""
+        groups = np.array([group for group, _ in self.channels], dtype=str)
+        channel_idxs = np.array([ch for _, ch in self.channels], dtype=np.int64)
+        np.savez(path, lines=self.lines, groups=groups, channel_idxs=channel_idxs, gates=self.gates,
+                 opcodes=self.opcodes, starts=self.starts, lengths=self.lengths)
+
+    @classmethod
+    def load(cls, path):
+        """Read an IR written by save."""
+        with np.load(path, allow_pickle=False) as data:
+            channels = list(zip(data['groups'].tolist(), data['channel_idxs'].tolist()))
+            return cls(data['lines'], channels, data['gates'], data['opcodes'], data['starts'],
+                       data['lengths'])
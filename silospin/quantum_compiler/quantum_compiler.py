@@ -3,7 +3,11 @@ import pandas as pd
 import os
 from math import ceil
 import json
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from operator import itemgetter
 from pkg_resources import resource_filename
 import inspect
@@ -18,7 +22,12 @@ from silospin.drivers.zi_hdawg_driver import HdawgDriver
 from silospin.math.math_helpers import gauss, rectangular
 from silospin.quantum_compiler.quantum_compiler_helpers import *
 from silospin.quantum_compiler.quantum_compiler_io import *
+from silospin.quantum_compiler.compile_cache import CompileCache, compile_cache_key
+from silospin.quantum_compiler.waveform_upload import check_upload_mode, upload_waveforms, waveform_settings
+from silospin.quantum_compiler.program_diff import changed_command_table_entries, changed_waveforms
+from silospin.quantum_compiler.program_ir import ProgramIR
 
+logger = logging.getLogger(__name__)
 
 class GateSetTomographyQuantumCompiler:
     """
@@ -40,18 +49,28 @@ class GateSetTomographyQuantumCompiler:
         Dictionary of rectangular 'pi' and 'pi/2' waveforms to be uploaded to each core of HDAWG. Dict keys correspond to qubit (AWG core) indices. Values are 2 element lists containing waveforms in the form of numpy arrays (['pi/2', 'pi']).
     _gate_sequences : dict
         Dictionary of quantum gate sequences for each AWG core read in from GST file. Outer dictonary keys correspond to GST line number. Inner keys correspond to qubit (AWG core) indices and values are lists of gate strings.
+    _program_ir : ProgramIR
+        Array-backed IR of the parsed GST program (interned gate table, opcode arrays per line and channel, arbitrary gate side tables). Built once per compilation and consumed by the later compiler stages.
     _ct_idxs : dict
         Dictionary of command table entries executed in HDAWG FPGA sequencer. Outer dictonary keys correspond to GST line number. Inner keys correspond to qubit (AWG core) indices and values are lists of gate strings.
     _command_tables : dict
-        Command table uplaoded to HDAWG containing phase change instructions for each gate.
+        Command table (CommandTable) uplaoded to each HDAWG core, containing phase change instructions for each gate.
     _sequencer_code : dict
         Dictionary of sequencer code uploaded to each HDAWG coer.
     _channel_idxs : dict
         Grouping of channel indices for  each core.
     _channel_osc_idxs : dict
         Grouping of oscillator indices for  each core.
+    _compile_cache : CompileCache
+        On-disk cache of compiled artifacts (None if caching is disabled).
+    _core_timings : dict
+        Seconds spent compiling ("compile", 0 on a cache hit), waiting for the data server connection ("wait") and uploading ("upload") the program of each core. Outer keys are AWG indices, inner keys core indices.
+    _load_time : float
+        Wall time of the concurrent compile and upload stage.
+    _waveform_round_trips : int
+        Number of data server calls used to upload the waveforms.
     """
-    def __init__(self, gst_file_path, awgs, gate_parameters, n_inner=1, n_outer=1, added_padding=0):
+    def __init__(self, gst_file_path, awgs, gate_parameters, n_inner=1, n_outer=1, added_padding=0, cache_dir=None, cache_max_bytes=1 << 30, cache_max_age=None, n_workers=None, waveform_upload='wave'):
         """
         Constructor method for CompileGateSetTomographyProgram.
         Parameters:
@@ -67,6 +86,16 @@ class GateSetTomographyQuantumCompiler:
                 Number of outer frames (over entire GST file) to loop over.
             added_padding : float
                 Added padding to gate pulses in ns.
+            cache_dir : str
+                Directory of the on-disk compile cache (see CompileCache). When the GST file, gate parameters, channel mapping, padding, n_inner/n_outer, arbitrary gate definitions and zhinst version match a cached compilation, its ELFs, waveforms and command tables are uploaded directly. None disables caching.
+            cache_max_bytes : int
+                Size above which least recently used cache entries are evicted.
+            cache_max_age : float
+                Cache entries unused for longer than this many seconds are evicted (None keeps them).
+            n_workers : int
+                Number of threads loading the AWG cores concurrently (compilations run one at a time, overlapping the uploads of other cores). Defaults to one per core.
+            waveform_upload : str
+                'wave' (default) uses one setVector per waveform, 'core' uploads the waveforms of each core in one transaction and 'device' those of each HDAWG in one transaction (see silospin.quantum_compiler.waveform_upload). The batched modes are not yet verified on hardware.
         """
         ##Add additional try-catch statements here
 
@@ -75,16 +104,195 @@ class GateSetTomographyQuantumCompiler:
             raise TypeError("Padding should not exceed 5 ns!!")
         except TypeError:
             raise
+        check_upload_mode(waveform_upload)
 
 
        ##change here ...
-        sample_rate = 2.4e9
         self._gst_path = gst_file_path
         self._awgs = awgs
         channel_mapping = self._awgs["hdawg1"]._channel_mapping
         awg_core_split = self._awgs["hdawg1"]._hdawg_core_split
-        arb_dc_waveforms_dict = {}
         self._channel_mapping = channel_mapping
+        self._n_inner = n_inner
+        self._n_outer = n_outer
+        self._added_padding = added_padding
+        self._n_workers = n_workers
+        self._waveform_upload = waveform_upload
+
+        self._set_gate_parameters(gate_parameters, awg_core_split)
+
+        ## Compiled artifacts are a function of the inputs only: reuse them when cached
+        self._compile_cache = None
+        if cache_dir is not None:
+            self._compile_cache = CompileCache(cache_dir, max_bytes=cache_max_bytes, max_age=cache_max_age)
+        artifacts, cache_hit = self._prepare_artifacts(self._gst_path, gate_parameters, self._gate_parameters, awg_core_split)
+
+        ## Sequencer compilation (on a miss, one core at a time) overlaps the uploads of the other cores
+        self._load_program(artifacts, n_workers, waveform_upload)
+        if self._compile_cache is not None and not cache_hit:
+            self._compile_cache.store(self._cache_key, artifacts)
+        self._artifacts = artifacts
+
+    def _split_gate_parameters(self, gate_parameters, awg_core_split):
+        """
+        Splits the gate parameters per HDAWG.
+
+        Returns:
+            split_parameters (dict): outer keys AWG indices, inner keys "rf" and "p".
+        """
+        split_parameters = {}
+        gate_param_all_rf = gate_parameters["rf"]
+        gate_param_all_dc = gate_parameters["p"]
+
+        for awg in self._channel_mapping:
+            split_parameters[awg] = {"rf": {} , "p": {}}
+        for gt_idx in gate_param_all_rf:
+            split_parameters[awg_core_split[gt_idx][0]]["rf"][gt_idx] = gate_param_all_rf[gt_idx]
+        for gt_idx in gate_param_all_dc:
+            split_parameters[awg_core_split[gt_idx][0]]["p"][gt_idx] = gate_param_all_dc[gt_idx]
+        return split_parameters
+
+    def _set_gate_parameters(self, gate_parameters, awg_core_split):
+        """
+        Splits the gate parameters per HDAWG and configures oscillators and output amplitudes of each HDAWG.
+
+        Returns:
+            changed (bool): False if the split parameters equal the current ones, in which case the HDAWGs are not reconfigured.
+        """
+        split_parameters = self._split_gate_parameters(gate_parameters, awg_core_split)
+        if split_parameters == getattr(self, "_gate_parameters", None):
+            return False
+        self._gate_parameters = split_parameters
+        self._gate_parameters_all = gate_parameters
+        for awg in self._awgs:
+            config_hdawg(self._awgs[awg], self._gate_parameters[awg], self._channel_mapping[awg])
+        return True
+
+    def _prepare_artifacts(self, gst_path, gate_parameters, split_parameters, awg_core_split):
+        """
+        Compiled artifacts of a GST file and gate parameters, from the compile cache when possible.
+
+        Both paths set the same compiler attributes (_program_ir, _gate_sequences, _ct_idxs_all, _sequencer_code, _command_tables as CommandTable objects, _gate_npoints, _waveforms, _gate_lengths, _arb_waveforms_all and _arb_dc_waveforms_dict).
+
+        Parameters:
+            gst_path (str): GST file.
+            gate_parameters (dict): gate parameters of all HDAWGs.
+            split_parameters (dict): gate_parameters split per HDAWG (see _split_gate_parameters).
+
+        Returns:
+            artifacts (dict): see _compile.
+            cache_hit (bool): True if the artifacts come from the cache.
+        """
+        if self._compile_cache is not None:
+            arbgate_picklefile_location = inspect.signature(gst_file_parser).parameters['arbgate_picklefile_location'].default
+            device_ids = [self._awgs[awg]._connection_settings["hdawg_id"] for awg in self._awgs]
+            self._cache_key = compile_cache_key(gst_path, gate_parameters, self._channel_mapping, self._added_padding, self._n_inner, self._n_outer, arbgate_picklefile_location, device_ids)
+            artifacts = self._compile_cache.load(self._cache_key)
+            if artifacts is not None:
+                self._restore_compiler_state(artifacts)
+                return artifacts, True
+        return self._compile(gst_path, gate_parameters, split_parameters, awg_core_split, self._n_inner, self._n_outer, self._added_padding), False
+
+    def _restore_compiler_state(self, artifacts):
+        """
+        Sets the compiler attributes from compiled artifacts (a cache entry, or the loaded program when a patch fails to compile).
+        """
+        self._program_ir = artifacts["program_ir"]
+        self._gate_sequences = self._program_ir.sequence_table()
+        self._ct_idxs_all = artifacts["ct_idxs"]
+        self._sequencer_code = artifacts["sequencer_code"]
+        self._command_tables = {}
+        for awg_idx in artifacts["command_tables"]:
+            ## All cores of an HDAWG share one validation schema
+            ct_schema = self._awgs[awg_idx]._hdawg.awgs[0].commandtable.load_validation_schema()
+            self._command_tables[awg_idx] = {core_idx: command_table_from_dict(table, ct_schema) for core_idx, table in artifacts["command_tables"][awg_idx].items()}
+        self._gate_npoints = artifacts["gate_npoints"]
+        self._waveforms = artifacts["gate_waveforms"]
+        self._gate_lengths = artifacts["gate_lengths"]
+        self._arb_waveforms_all = artifacts["arb_waveforms"]
+        self._arb_dc_waveforms_dict = artifacts["arb_dc_waveforms"]
+
+    def patch(self, gst_file_path=None, gate_parameters=None):
+        """
+        Updates the loaded program for a new GST file and/or new gate parameters, skipping sequencer recompilation whenever possible.
+
+        The new inputs go through the compiler pipeline (or the compile cache) and the result is diffed against the loaded program. When the sequencer code is unchanged (same gate structure, command table indices and waveform lengths, e.g. amplitude or phase sweeps), the ELFs are kept: only changed waveforms are uploaded (grouped as set by waveform_upload) and only command tables with changed entries are re-uploaded (the HDAWG takes a command table as a whole). Oscillator frequencies and output amplitudes are only re-set if they changed. Otherwise the program is recompiled and uploaded in full.
+
+        If the new inputs fail to compile, the exception is raised with the GST file, gate parameters and compiled state of the loaded program left in place.
+
+        Parameters:
+            gst_file_path (str): new GST file (defaults to the current one).
+            gate_parameters (dict): new gate parameters (defaults to the current ones).
+
+        Returns:
+            report (dict): "recompiled" (bool), "configured" (bool, HDAWG nodes re-set), "waveforms" and "command_table_entries" (changed indices per AWG and core index) and "time" (s).
+        """
+        t_start = time.perf_counter()
+        awg_core_split = self._awgs["hdawg1"]._hdawg_core_split
+        gst_path = self._gst_path if gst_file_path is None else gst_file_path
+        if gate_parameters is None:
+            gate_parameters = self._gate_parameters_all
+
+        old = self._artifacts
+        split_parameters = self._split_gate_parameters(gate_parameters, awg_core_split)
+        try:
+            new, cache_hit = self._prepare_artifacts(gst_path, gate_parameters, split_parameters, awg_core_split)
+        except Exception:
+            self._restore_compiler_state(old)
+            raise
+        self._gst_path = gst_path
+        configured = self._set_gate_parameters(gate_parameters, awg_core_split)
+        report = {"recompiled": False, "configured": configured, "waveforms": {}, "command_table_entries": {}}
+
+        if new["sequencer_code"] != old["sequencer_code"]:
+            self._load_program(new, self._n_workers, self._waveform_upload)
+            report["recompiled"] = True
+        else:
+            new["elf"] = old["elf"]
+            self._waveform_round_trips = 0
+            for awg_idx in self._channel_mapping:
+                daq = self._awgs[awg_idx]._daq
+                device_id = self._awgs[awg_idx]._connection_settings["hdawg_id"]
+                report["waveforms"][awg_idx] = {}
+                report["command_table_entries"][awg_idx] = {}
+                device_settings = []
+                for core_idx in self._channel_mapping[awg_idx]:
+                    waveforms = new["waveforms"][awg_idx][core_idx]
+                    wave_idxs = changed_waveforms(old["waveforms"][awg_idx][core_idx], waveforms)
+                    settings = waveform_settings(device_id, core_idx, {idx: waveforms[idx] for idx in wave_idxs})
+                    if self._waveform_upload == 'device':
+                        device_settings += settings
+                    else:
+                        self._waveform_round_trips += upload_waveforms(daq, settings, batched=self._waveform_upload == 'core')
+
+                    command_table = new["command_tables"][awg_idx][core_idx]
+                    entry_idxs = changed_command_table_entries(old["command_tables"][awg_idx][core_idx], command_table)
+                    if len(entry_idxs) > 0:
+                        self._awgs[awg_idx]._hdawg.awgs[core_idx-1].commandtable.upload_to_device(command_table)
+
+                    report["waveforms"][awg_idx][core_idx] = wave_idxs
+                    report["command_table_entries"][awg_idx][core_idx] = entry_idxs
+                ## One transaction per HDAWG, as in _load_program
+                if self._waveform_upload == 'device':
+                    self._waveform_round_trips += upload_waveforms(daq, device_settings)
+
+        if self._compile_cache is not None and not cache_hit:
+            self._compile_cache.store(self._cache_key, new)
+        self._artifacts = new
+        report["time"] = time.perf_counter() - t_start
+        logger.info("Patched program in %.3f s (recompiled: %s)", report["time"], report["recompiled"])
+        return report
+
+    def _compile(self, gst_path, gate_parameters, split_parameters, awg_core_split, n_inner, n_outer, added_padding):
+        """
+        Parses the GST file and generates the waveforms, command tables and sequencer code of every AWG core.
+
+        Returns:
+            artifacts (dict): "waveforms", "command_tables" (as dicts) and "elf" (filled in by _load_program) keyed by AWG and core index, plus the "program_ir", "ct_idxs" and "sequencer_code" of the program and the compiler state restored on a cache hit ("gate_npoints", "gate_waveforms", "gate_lengths", "arb_waveforms", "arb_dc_waveforms").
+        """
+        sample_rate = 2.4e9
+        channel_mapping = self._channel_mapping
+        arb_dc_waveforms_dict = {}
 
         rf_cores = []
         plunger_channels = []
@@ -98,21 +306,6 @@ class GateSetTomographyQuantumCompiler:
                     plunger_channels.append((awg, channel_mapping[awg][idx]['gate_idx'][0]))
                     plunger_channels.append((awg, channel_mapping[awg][idx]['gate_idx'][1]))
 
-
-        self._gate_parameters = {}
-        gate_param_all_rf = gate_parameters["rf"]
-        gate_param_all_dc = gate_parameters["p"]
-
-        for awg in channel_mapping:
-            self._gate_parameters[awg] = {"rf": {} , "p": {}}
-        for gt_idx in gate_param_all_rf:
-            self._gate_parameters[awg_core_split[gt_idx][0]]["rf"][gt_idx] = gate_param_all_rf[gt_idx]
-        for gt_idx in gate_param_all_dc:
-            self._gate_parameters[awg_core_split[gt_idx][0]]["p"][gt_idx] = gate_param_all_dc[gt_idx]
-
-        for awg in self._awgs:
-            config_hdawg(self._awgs[awg], self._gate_parameters[awg], channel_mapping[awg])
-
         tau_pi_2_set = []
         for idx in gate_parameters["rf"]:
             tau_pi_2_set.append((idx, gate_parameters["rf"][idx]["tau_pi_2"]))
@@ -156,8 +349,8 @@ class GateSetTomographyQuantumCompiler:
         standard_rf = (hdawg_std_rf, standard_rf_idx)
 
         self._gate_npoints = {}
-        for awg in self._gate_parameters:
-            self._gate_npoints[awg] = make_gate_npoints(self._gate_parameters[awg], sample_rate)
+        for awg in split_parameters:
+            self._gate_npoints[awg] = make_gate_npoints(split_parameters[awg], sample_rate)
         self._waveforms = generate_waveforms(self._gate_npoints, channel_mapping, added_padding, standard_rf, n_std)
 
         dc_lengths = {}
@@ -179,29 +372,24 @@ class GateSetTomographyQuantumCompiler:
 
         self._gate_lengths = make_gate_lengths(dc_lengths, tau_waveform_pi_2_std, tau_waveform_pi_std, channel_mapping)
 
-        self._gate_sequences, arbitrary_gates, arbitrary_waveforms, arbitrary_z = gst_file_parser(self._gst_path, self._gate_lengths, channel_mapping, awg_core_split, sample_rate=sample_rate)
+        self._gate_sequences, arbitrary_gates, arbitrary_waveforms, arbitrary_z = gst_file_parser(gst_path, self._gate_lengths, channel_mapping, awg_core_split, sample_rate=sample_rate)
+        self._program_ir = ProgramIR.from_sequence_table(self._gate_sequences)
+        ir = self._program_ir
         self._arb_waveforms_all = arbitrary_waveforms
         for awg_idx in arb_dc_waveforms_dict:
             for core_idx in arb_dc_waveforms_dict[awg_idx]:
-                for line in range(len(self._gate_sequences)):
-                    arb_dc_waveforms_dict[awg_idx][core_idx][line+1] = {}
-
+                for line in ir.lines:
+                    arb_dc_waveforms_dict[awg_idx][core_idx][int(line)] = {}
 
-        dc_gate_sequences = {}
+        dc_channels = [ch for group, ch in ir.channels if group == 'plunger']
         dc_arb_gates = {}
-        for line in self._gate_sequences:
+        for line in ir.lines:
+            line = int(line)
             dc_arb_gates[line] = {}
-            dc_gate_sequences[line] = self._gate_sequences[line]['plunger']
-            for dc_idx in dc_gate_sequences[line]:
-                itr = 0
-                for gt in dc_gate_sequences[line][dc_idx]:
-                    if gt.find('*') != -1:
-                        dc_arb_gates[line][itr] = {}
-                        for dc_gt_idx in dc_gate_sequences[line]:
-                            dc_arb_gates[line][itr][dc_gt_idx] = dc_gate_sequences[line][dc_gt_idx][itr]
-                    else:
-                        pass
-                    itr += 1
+            dc_opcodes = {dc_idx: ir.sequence(line, 'plunger', dc_idx) for dc_idx in dc_channels}
+            for dc_idx in dc_channels:
+                for itr in np.flatnonzero(ir.kind_mask(line, 'plunger', dc_idx, 'arb')):
+                    dc_arb_gates[line][int(itr)] = {dc_gt_idx: str(ir.gates[dc_opcodes[dc_gt_idx][itr]]) for dc_gt_idx in dc_channels}
 
 
         for line in dc_arb_gates:
@@ -256,9 +444,9 @@ class GateSetTomographyQuantumCompiler:
 
         ct_idxs_all = {}
         taus_std = (tau_waveform_pi_2_std, tau_waveform_pi_std)
-        for idx in self._gate_sequences:
-            gate_sequence = self._gate_sequences[idx]
-            ct_idxs, arbgate_counter = make_command_table_indices(gate_sequence, channel_mapping, awg_core_split, arbitrary_waveforms, plunger_set_npoints_tups, taus_std, self._gate_lengths, arbgate_counter, arbitrary_z, idx, arb_dc_waveforms_dict_temp)
+        for idx in ir.lines:
+            idx = int(idx)
+            ct_idxs, arbgate_counter = make_command_table_indices(ir, channel_mapping, awg_core_split, arbitrary_waveforms, plunger_set_npoints_tups, taus_std, self._gate_lengths, arbgate_counter, arbitrary_z, idx, arb_dc_waveforms_dict_temp)
             ct_idxs_all[idx] = ct_idxs
         self._ct_idxs_all = ct_idxs_all
 
@@ -405,18 +593,102 @@ class GateSetTomographyQuantumCompiler:
 
         self._sequencer_code = sequencer_code
 
+        elfs = {}
+        command_tables = {}
         for awg_idx in self._channel_mapping:
+            elfs[awg_idx] = {}
+            command_tables[awg_idx] = {}
             for core_idx in self._channel_mapping[awg_idx]:
-                daq = self._awgs[awg_idx]._daq
+                command_tables[awg_idx][core_idx] = self._command_tables[awg_idx][core_idx].as_dict()
+
+        return {"elf": elfs, "waveforms": waveforms_to_awg, "command_tables": command_tables, "program_ir": self._program_ir, "ct_idxs": self._ct_idxs_all, "sequencer_code": self._sequencer_code,
+                "gate_npoints": self._gate_npoints, "gate_waveforms": self._waveforms, "gate_lengths": self._gate_lengths, "arb_waveforms": self._arb_waveforms_all, "arb_dc_waveforms": self._arb_dc_waveforms_dict}
+
+    def _load_program(self, artifacts, n_workers=None, waveform_upload='wave'):
+        """
+        Compiles (when no ELF is cached) and uploads the program of every AWG core, one thread per core.
+
+        Sequencer compilations are serialized with one lock: zhinst does not document compile_sequencer_program (zhinst.core.compile_seqc) as safe to call from several threads at once. Uploads going through the same data server connection are serialized with a per-connection lock, uploads to separate connections overlap, and the compilation of one core overlaps the uploads of the others.
+
+        Parameters:
+            artifacts (dict): output of _compile (or the compile cache); compiled ELFs are added to artifacts["elf"].
+            n_workers (int): number of threads, defaults to the number of cores.
+            waveform_upload (str): 'wave', 'core' or 'device' grouping of the waveform uploads.
+        """
+        cores = [(awg_idx, core_idx) for awg_idx in self._channel_mapping for core_idx in self._channel_mapping[awg_idx]]
+        self._core_timings = {awg_idx: {} for awg_idx in self._channel_mapping}
+        if not cores:
+            self._waveform_round_trips = 0
+            self._load_time = 0.0
+            return
+        locks = {id(self._awgs[awg_idx]._daq): threading.Lock() for awg_idx in self._channel_mapping}
+        compile_lock = threading.Lock()
+
+        t_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_workers or len(cores)) as pool:
+            futures = [pool.submit(self._load_core, artifacts, awg_idx, core_idx, locks[id(self._awgs[awg_idx]._daq)], waveform_upload, compile_lock) for awg_idx, core_idx in cores]
+            timings = [future.result() for future in futures]
+        self._waveform_round_trips = sum(t.pop("round_trips") for t in timings)
+
+        ## One transaction per HDAWG once all of its ELFs are loaded
+        if waveform_upload == 'device':
+            for awg_idx in self._channel_mapping:
                 device_id = self._awgs[awg_idx]._connection_settings["hdawg_id"]
-                sequence_program = Sequence()
-                sequence_program.code = self._sequencer_code[awg_idx][core_idx]
-                elf, info = self._awgs[awg_idx]._hdawg.awgs[core_idx-1].compile_sequencer_program(sequence_program.code)
-                self._awgs[awg_idx]._hdawg.awgs[core_idx-1].elf.data(elf)
-
-                for wave_idx in waveforms_to_awg[awg_idx][core_idx]:
-                    daq.setVector(f"/{device_id}/awgs/"+str(core_idx-1)+"/waveform/waves/"+str(wave_idx), waveforms_to_awg[awg_idx][core_idx][wave_idx])
-                self._awgs[awg_idx]._hdawg.awgs[core_idx-1].commandtable.upload_to_device(self._command_tables[awg_idx][core_idx])
+                settings = []
+                for core_idx in self._channel_mapping[awg_idx]:
+                    settings += waveform_settings(device_id, core_idx, artifacts["waveforms"][awg_idx][core_idx])
+                self._waveform_round_trips += upload_waveforms(self._awgs[awg_idx]._daq, settings)
+        self._load_time = time.perf_counter() - t_start
+
+        for (awg_idx, core_idx), timing in zip(cores, timings):
+            self._core_timings[awg_idx][core_idx] = timing
+            logger.info("%s core %d: compile %.3f s, upload %.3f s", awg_idx, core_idx, timing["compile"], timing["upload"])
+        logger.info("Loaded %d cores in %.3f s (%.3f s of serial per-core work, %d waveform round trips)", len(cores), self._load_time, sum(t["compile"] + t["upload"] for t in timings), self._waveform_round_trips)
+
+    def _load_core(self, artifacts, awg_idx, core_idx, upload_lock, waveform_upload='wave', compile_lock=None):
+        """
+        Compiles (if needed) and uploads the sequencer program, waveforms and command table of one AWG core.
+
+        With waveform_upload='device' the waveforms are left to _load_program. compile_lock (shared by all cores) serializes the sequencer compilation.
+
+        Returns:
+            timing (dict): seconds spent in "compile" (including waiting for compile_lock), waiting for the connection ("wait") and in "upload", and the number of waveform "round_trips".
+        """
+        awg = self._awgs[awg_idx]._hdawg.awgs[core_idx-1]
+        daq = self._awgs[awg_idx]._daq
+        device_id = self._awgs[awg_idx]._connection_settings["hdawg_id"]
+
+        t_start = time.perf_counter()
+        elf = artifacts["elf"][awg_idx].get(core_idx)
+        if elf is None:
+            sequence_program = Sequence()
+            sequence_program.code = artifacts["sequencer_code"][awg_idx][core_idx]
+            ## Passing the sample rate keeps the toolkit from reading system.clocks.sampleclock.freq over the shared session
+            with compile_lock or nullcontext():
+                elf, info = awg.compile_sequencer_program(sequence_program.code, samplerate=2.4e9)
+            artifacts["elf"][awg_idx][core_idx] = elf
+        t_compiled = time.perf_counter()
+
+        with upload_lock:
+            t_locked = time.perf_counter()
+            awg.elf.data(elf)
+            round_trips = 0
+            if waveform_upload != 'device':
+                settings = waveform_settings(device_id, core_idx, artifacts["waveforms"][awg_idx][core_idx])
+                round_trips = upload_waveforms(daq, settings, batched=waveform_upload == 'core')
+            awg.commandtable.upload_to_device(artifacts["command_tables"][awg_idx][core_idx])
+        t_uploaded = time.perf_counter()
+
+        return {"compile": t_compiled - t_start, "wait": t_locked - t_compiled, "upload": t_uploaded - t_locked, "round_trips": round_trips}
+
+    def save_program_ir(self, path):
+        """
+        Writes the IR of the parsed GST program to a .npz file (read back with ProgramIR.load).
+
+        Parameters:
+            path (str): output file.
+        """
+        self._program_ir.save(path)
 
     def compile_program(self):
         """
@@ -1,8 +1,11 @@
 from math import ceil
 import pickle
 
+import numpy as np
+
 from silospin.math.math_helpers import *
 from silospin.experiment.setup_experiment_helpers import unpickle_qubit_parameters
+from silospin.quantum_compiler.program_ir import ProgramIR, KIND_PI_2, KIND_PI, KIND_ARB, KIND_Z, KIND_Z0Z, KIND_DELAY, KIND_PLUNGER
 
 import zhinst
 from zhinst.toolkit import Session
@@ -109,23 +112,23 @@ def make_gate_lengths(dc_times, t_pi_2_max, t_pi_max, channel_map):
 
 def make_command_table_indices(gt_seqs, channel_map, awg_core_split, arb_gates, plunger_tup_lengths, taus_std, gate_lengths, arbgate_counter, arbZs, line, arb_dc_dict, pickle_file_location='C:\\Users\\Sigillito Lab\\Desktop\\experimental_workspaces\\quantum_dot_workspace_bluefors1\\experiment_parameters\\bluefors1_arb_gates.pickle'):
     '''
-    Generates a dictionary with lists of command table executions for each core, provided the output of 'gst_file_parser'.
-    This is the core of the quantum compiler, as it interprets longs RF and DC gate strings, converting them to FPGA instructions for amplitude and phase modulation.\n
-    Outer-most keys "plunger" and "rf", containing instructions to be addressed separatley on the dedicated RF and DC cores.
-    Outputs a dictionary with outer keys "rf" and "plunger", corresponding to executions for dedicated RF and DC AWG cores. The values for the "rf" keys are dictionaries with outer keys corresponding to each core and "plunger"
-    has values of dictionaries with keys corresponding to each DC channel. Each of these core and channel keys have values of lists of command table (CT) indices (integers) to be addressed on the AWG cores. \n
+    Generates a dictionary with lists of command table executions for each core, provided the gate sequences output by 'gst_file_parser' (or the program IR built from them).
+    This is the core of the quantum compiler, as it interprets the RF and DC gate sequences, converting them to FPGA instructions for amplitude and phase modulation.\n
+    Outputs a dictionary with outer keys corresponding to AWG indices and inner keys to core indices, each with a dictionary of command table (CT) indices (integers) keyed by gate slot, to be addressed on the AWG cores. \n
     Each command table index maps to an entry of a CT, determining the waveform, amplitude, and phase to be played when the CT entry is executed. Phase changes for each gate are computed on-the-fly.
     Note that this function supports the following gates:  'x', 'xxx', 'xx', 'mxxm', 'y', 'yyy', 'y y', 'myym', 'arbZ', 'p', 't'. See 'Quantum Compiler' tab for a more elaborate description.  \n
+    Gates are read as opcodes of the IR: gate kinds, delay lengths and arbitrary gate labels come from its gate table, and which gates play on the other channels of each gate slot is counted once per line over the opcode arrays. \n
     Note: this function is currently configured for 1 HDAWG unit with 4 AWG cores. \n
 
     Parameters:
-                    gt_seqs (dict): dictionary output of 'gst_file_parser', representing sequence of RF and DC gate strings on each core.
+                    gt_seqs (ProgramIR or dict): IR of the GST program (see 'program_ir'), or the gate sequences of this line as output by 'gst_file_parser' ({"rf": {ch: [...]}, "plunger": {ch: [...]}}), which are converted to an IR first.
                     taus_std (list): list of standard pi/2 and pi pulse lengths in ns ([tau_pi2, tau_pi]).
-                    taus_p (list): list of tuples, each with elements (ch_idx, tau_p) representing the channel index and corresponding plunger pulse length.
-                    n_arbZ (int): the accumulated number of previously seen arbitrary-Z rotations over all lines in GST file being read.
+                    plunger_tup_lengths (list): list of tuples, each with elements (ch_idx, tau_p) representing the channel index and corresponding plunger pulse length.
+                    arbZs (dict): arbitrary Z rotations of each core, mapping the gate string to (command table index, rotation angle).
+                    line (int): GST line to compile.
 
     Returns:
-       ct_idxs (dict), arbZ (list): dictonary of command table indices to execute, list of tuples of (arbitrary Z comman table index, rotation angle).
+       ct_idxs (dict), arbgate_counter (dict): dictonary of command table indices to execute, updated count of arbitrary gate command table entries of each core.
      '''
 
     ct_idxs = {}
@@ -142,20 +145,34 @@ def make_command_table_indices(gt_seqs, channel_map, awg_core_split, arb_gates,
     ct_idx_incr_pi_2_p_fr = {0: 48, -90: 49, -180: 50, -270: 51, 90: 51, 180: 53,  270:  54, 360: 20, -360: 20}
     ct_idx_z0z = 55
     phi_ls_gt = {'x':  0, 'y': 90, 'xx':  0, 'yy': 90 , 'xxx':  180, 'yyy': -90, 'mxxm': 180, 'myym': -90}
-    pi_gt_set = {'xx', 'yy', 'mxxm', 'myym'}
-    pi_2_gt_set = {'x', 'y', 'xxx', 'yyy'}
-
-    rf_gate_sequence = gt_seqs['rf']
-    dc_gate_sequence = gt_seqs['plunger']
+    arb_rf_gt_map = {'X': 'x', 'Y': 'y', 'U': 'xxx', 'V': 'yyy'}
+    init_gate_map = {'X': 1, 'Y': 2, 'U': 3, 'V': 4}
+    incr_gate_map = {0: 5, -90 : 6, -180: 7, -270: 8, 90: 9, 180: 10, 270: 11, -360: 5, 360: 5}
 
+    if isinstance(gt_seqs, ProgramIR):
+        program_ir = gt_seqs
+    else:
+        program_ir = ProgramIR.from_sequence_table({line: gt_seqs})
+
+    gates = program_ir.gates.tolist()
+    kinds = program_ir.kinds
+    durations = program_ir.durations
+    ops = program_ir.line_table(line)
+    line_kinds = kinds[ops]
+    rf_rows = [row for row, (group, _) in enumerate(program_ir.channels) if group == 'rf']
+    dc_rows = [row for row, (group, _) in enumerate(program_ir.channels) if group == 'plunger']
+    rf_chs = [program_ir.channels[row][1] for row in rf_rows]
+    dc_chs = [program_ir.channels[row][1] for row in dc_rows]
+    rf_kinds = line_kinds[rf_rows]
+    dc_kinds = line_kinds[dc_rows]
+    dc_pos = {dc_idx: i for i, dc_idx in enumerate(dc_chs)}
 
     arbgate_dict = unpickle_qubit_parameters(pickle_file_location)
-    plunger_len_set = set([gate_lengths['plunger'][item]['p'] for item in gate_lengths['plunger']])
     plunger_len_tups = [(item, gate_lengths['plunger'][item]['p']) for item in gate_lengths['plunger']]
 
     N_p = len(plunger_tup_lengths)
     if len(plunger_len_tups) == 0:
-        p_std_idx = 0     
+        p_std_idx = 0
     else:
         p_tup_std = max(plunger_len_tups, key=lambda x:x[1])
         p_std_idx = 0
@@ -165,12 +182,6 @@ def make_command_table_indices(gt_seqs, channel_map, awg_core_split, arb_gates,
             else:
                 p_std_idx += 1
 
-    ct_idx_p1_pi = 3*N_p
-    ct_idx_p2_pi = 3*N_p + 1
-    ct_idx_p1_pi_2 = 3*N_p + 2
-    ct_idx_p2_pi_2 = 3*N_p + 3
-    ct_idx_p1_p2_pi = 3*N_p + 4
-    ct_idx_p1_p2_pi_2 = 3*N_p + 6
     ct_idx_p_z0z = 3*N_p + 7
     ct_p_idx_tau_pi = 3*N_p + 7
     ct_p_idx_tau_pi_2 = 3*N_p + 8
@@ -185,656 +196,263 @@ def make_command_table_indices(gt_seqs, channel_map, awg_core_split, arb_gates,
                 N_arb_tot += 1
                 arb_gate_taus.append(ceil(1e9*len(arb_gates[i][j][k][1])/sample_rate))
 
-    for rf_idx in rf_gate_sequence:
-        arb_gate_counter = 0
+    ## Delay lengths -> (1-based) position of the first plunger / arbitrary gate of that length
+    plunger_delay_idxs = {}
+    for idx_p, itm in enumerate(plunger_len_tups, 1):
+        plunger_delay_idxs.setdefault(itm[1], idx_p)
+    arb_delay_idxs = {}
+    for idx_a, tau_a in enumerate(arb_gate_taus, 1):
+        arb_delay_idxs.setdefault(tau_a, idx_a)
+    ## Positions and lengths of the plunger channels in plunger_tup_lengths
+    p_tup_pos = {}
+    p_tup_len = {}
+    for itr, item in enumerate(plunger_tup_lengths):
+        p_tup_pos.setdefault(item[0], itr)
+        p_tup_len.setdefault(item[0], item[1])
+
+    ## Per gate slot: RF pi and pi/2 gates, plungers, and plungers longer / shorter than the standard pulses
+    n_pi_rf = (rf_kinds == KIND_PI).sum(axis=0)
+    n_pi_2_rf = (rf_kinds == KIND_PI_2).sum(axis=0)
+    dc_is_p = dc_kinds == KIND_PLUNGER
+    n_p_dc = dc_is_p.sum(axis=0)
+    taus_p = np.array([int(gate_lengths['plunger'][dc_idx]['p']) if dc_is_p[i].any() else 0 for i, dc_idx in enumerate(dc_chs)]).reshape(-1, 1)
+    p_gt_pi = (dc_is_p & (taus_p > taus_std[1])).any(axis=0)
+    p_lt_pi = (dc_is_p & (taus_p < taus_std[1])).any(axis=0)
+    p_gt_pi_2 = (dc_is_p & (taus_p > taus_std[0])).any(axis=0)
+    p_lt_pi_2 = (dc_is_p & (taus_p < taus_std[0])).any(axis=0)
+
+    for row, rf_idx in zip(rf_rows, rf_chs):
         awg_idx = awg_core_split[rf_idx][0]
         core_idx = awg_core_split[rf_idx][1]
         N_z = len(arbZs[awg_idx][core_idx])
-        rf_diff_idxs = list(set([i for i in rf_gate_sequence.keys()]).difference({rf_idx}))
-        gate_sequence = rf_gate_sequence[rf_idx]
+        gate_sequence = ops[row]
+        gate_kinds = line_kinds[row]
         n_gates = len(gate_sequence)
-        gt_0 = gate_sequence[0]
-        ct_idx_tau_pi = 56 + len(arbZs[awg_idx][core_idx])
-        ct_idx_tau_pi_2 = 57 + len(arbZs[awg_idx][core_idx])
+        ct_idx_tau_pi = 56 + N_z
+        ct_idx_tau_pi_2 = 57 + N_z
 
         ##Compute initial phase
-        if gt_0 in {'x', 'y', 'xxx', 'yyy', 'mxxm', 'myym', 'xx', 'yy'}:
-            phi_l = phi_ls_gt[gt_0]
-        elif gt_0.find('*') != -1:
-              if gt_0[gt_0.find('*')+1] == 'X':
-                   phi_l = phi_ls_gt['x']
-              elif gt_0[gt_0.find('*')+1] == 'Y':
-                   phi_l = phi_ls_gt['y']
-              elif gt_0[gt_0.find('*')+1] == 'U':
-                   phi_l = phi_ls_gt['xxx']
-              elif gt_0[gt_0.find('*')+1] == 'V':
-                   phi_l = phi_ls_gt['yyy']
-              else:
-                   pass
+        op_0 = gate_sequence[0]
+        if kinds[op_0] in (KIND_PI, KIND_PI_2):
+            phi_l = phi_ls_gt[gates[op_0]]
+        elif kinds[op_0] == KIND_ARB:
+            label = program_ir.arb_gate(op_0)[0]
+            if label in arb_rf_gt_map:
+                phi_l = phi_ls_gt[arb_rf_gt_map[label]]
         else:
             phi_l = 0
 
-        rf_gt_idx  = 0
-        non_rf_idx = 0
-
+        rf_gt_idx = 0
         for idx in range(n_gates):
-            gt = gate_sequence[idx]
-            rf_gates_other = set([rf_gate_sequence[j][idx] for j in rf_diff_idxs])
-            pi_2_intersect = rf_gates_other.intersection(pi_2_gt_set)
-            pi_intersect = rf_gates_other.intersection(pi_gt_set)
-            p_intersect = set([dc_gate_sequence[seq][idx] for seq in dc_gate_sequence]).intersection({'p'})
-            p_intersect_tups = set([(seq, dc_gate_sequence[seq][idx]) for seq in dc_gate_sequence])
-
-            if gt in {'x', 'y', 'mxxm', 'myym', 'xxx', 'yyy', 'xx', 'yy'}:
+            op = gate_sequence[idx]
+            kind = gate_kinds[idx]
+            ## pi/2 and pi gates on the other RF channels
+            pi_intersect = n_pi_rf[idx] - (kind == KIND_PI) > 0
+            if kind == KIND_ARB:
+                label = program_ir.arb_gate(op)[0]
+
+            if kind == KIND_PI or kind == KIND_PI_2:
+                rf_gt_idx += 1
+            elif kind == KIND_ARB and label in arb_rf_gt_map:
                 rf_gt_idx += 1
-            elif gt.find('*') != -1:
-                if gt[gt.find('*')+1] in {'X', 'Y', 'U', 'V'}:
-                    rf_gt_idx += 1
-                else:
-                    pass
-            else:
-                non_rf_idx += 1
             # initial pi gate
-            if gt in pi_gt_set and rf_gt_idx == 1:
-                if len(p_intersect) != 0:
-                    for tup in p_intersect_tups:
-                        if tup[1] == 'p':
-                            tau_p = int(gate_lengths['plunger'][tup[0]]['p'])
-                            #Plunger frame
-                            if tau_p > taus_std[1]:
-                                gt_str = gt+'_p_fr'
-                                break
-                            #Pi frame
-                            else:
-                                gt_str = gt+'_pi_fr'
-                        else:
-                            gt_str = gt+'_pi_fr'
+            if kind == KIND_PI and rf_gt_idx == 1:
+                #Plunger frame if a plunger outlasts the pi pulse, else pi frame
+                if p_gt_pi[idx]:
+                    gt_str = gates[op]+'_p_fr'
                 else:
-                    gt_str = gt+'_pi_fr'
+                    gt_str = gates[op]+'_pi_fr'
                 ct_idxs[awg_idx][core_idx][idx] = initial_gates[gt_str]
            # initial pi/2 gate
-            elif gt in pi_2_gt_set and rf_gt_idx == 1:
-                if len(p_intersect) != 0:
-                    for tup in p_intersect_tups:
-                        if tup[1] == 'p':
-                            #Obtain DC pulse length
-                            tau_p = int(gate_lengths['plunger'][tup[0]]['p'])
-                            #No pi pulses, just pi/2 and plunger ==> plunger > pi/2
-                            if len(pi_intersect) == 0 and tau_p > taus_std[0]:
-                                gt_str = gt+'_p_fr'
-                                break
-                            #Pi pulses, with pi/2 and plunger ==> plunger > pi
-                            elif len(pi_intersect) != 0 and tau_p > taus_std[1]:
-                                gt_str = gt+'_p_fr'
-                                break
-                           #Pi pulses, with pi/2 and plunger ==> plunger < pi
-                            elif len(pi_intersect) != 0 and tau_p < taus_std[1]:
-                                gt_str = gt+'_pi_fr'
-                            elif len(pi_intersect) == 0 and tau_p < taus_std[0]:
-                                gt_str = gt+'_pi2_fr'
-                            else:
-                                pass
-                        else:
-                            pass
-                elif len(pi_intersect) != 0:
-                    gt_str = gt+'_pi_fr'
+            elif kind == KIND_PI_2 and rf_gt_idx == 1:
+                if n_p_dc[idx] != 0:
+                    #Pi pulses, with pi/2 and plunger ==> plunger > pi or plunger < pi
+                    if pi_intersect:
+                        if p_gt_pi[idx]:
+                            gt_str = gates[op]+'_p_fr'
+                        elif p_lt_pi[idx]:
+                            gt_str = gates[op]+'_pi_fr'
+                    #No pi pulses, just pi/2 and plunger ==> plunger > pi/2 or plunger < pi/2
+                    else:
+                        if p_gt_pi_2[idx]:
+                            gt_str = gates[op]+'_p_fr'
+                        elif p_lt_pi_2[idx]:
+                            gt_str = gates[op]+'_pi2_fr'
+                elif pi_intersect:
+                    gt_str = gates[op]+'_pi_fr'
                 else:
-                    gt_str = gt+'_pi2_fr'
+                    gt_str = gates[op]+'_pi2_fr'
                 ct_idxs[awg_idx][core_idx][idx] = initial_gates[gt_str]
 
            # z0z gate
-            elif gt == 'z0z':
+            elif kind == KIND_Z0Z:
                 ct_idxs[awg_idx][core_idx][idx] = ct_idx_z0z
 
             # z gate
-            elif gt[0] == 'z':
-                ct_idxs[awg_idx][core_idx][idx] = arbZs[awg_idx][core_idx][gt][0]
+            elif kind == KIND_Z:
+                ct_idxs[awg_idx][core_idx][idx] = arbZs[awg_idx][core_idx][gates[op]][0]
             #  delays
-            elif gt[0] == 't':
-                gt_t_str = int(gt[1:len(gt)])
+            elif kind == KIND_DELAY:
+                gt_t_str = durations[op]
                 if gt_t_str == int(taus_std[1]):
                     ct_idxs[awg_idx][core_idx][idx] = ct_idx_tau_pi
                 # std pi/2 delays
                 elif gt_t_str == int(taus_std[0]):
                     ct_idxs[awg_idx][core_idx][idx] = ct_idx_tau_pi_2
                 # plunger delays
-                else:
-                    if gt_t_str in plunger_len_set:
-                        idx_p = 0
-                        for itm in plunger_len_tups:
-                            idx_p += 1
-                            if gt_t_str == itm[1]:
-                                ct_idx_t_p  = 58 + idx_p + N_z
-                                ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_p
-                                break
-                            else:
-                                continue
-                    ##Arb gate delays  (need to test with arb gate)
-                    elif gt_t_str in set(arb_gate_taus):
-                        idx_a = 0
-                        for itm in arb_gate_taus:
-                            idx_a += 1
-                            if gt_t_str == itm:
-                                ct_idx_t_a  = 58 + idx_a + N_z + N_p
-                                ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_a
-                                break
-                            else:
-                                continue
-                    else:
-                        pass
+                elif gt_t_str in plunger_delay_idxs:
+                    ct_idxs[awg_idx][core_idx][idx] = 58 + plunger_delay_idxs[gt_t_str] + N_z
+                ##Arb gate delays  (need to test with arb gate)
+                elif gt_t_str in arb_delay_idxs:
+                    ct_idxs[awg_idx][core_idx][idx] = 58 + arb_delay_idxs[gt_t_str] + N_z + N_p
             ##Arbitrary gates
-            elif gt.find('*') != -1:
-                if gt[gt.find('*')+1] in arbgate_dict.keys():
-                    if gt[gt.find('*')+1] in {'X', 'Y', 'U', 'V'}:
+            elif kind == KIND_ARB:
+                if label in arbgate_dict:
+                    if label in arb_rf_gt_map:
                         ##Initial gate
                         if rf_gt_idx == 1:
-                            init_gate_map = {'X': 1, 'Y': 2, 'U': 3, 'V': 4}
-                            ct_idx_g_a = 58 + N_z + N_p + N_arb_tot + init_gate_map[gt[gt.find('*')+1]]+arbgate_counter[awg_idx][core_idx]
+                            ct_idx_g_a = 58 + N_z + N_p + N_arb_tot + init_gate_map[label]+arbgate_counter[awg_idx][core_idx]
                             arbgate_counter[awg_idx][core_idx] += 11
                         ##Incremented gate
                         elif rf_gt_idx > 1:
-                           if gt[gt.find('*')+1] == 'X':
-                               phi_l, phi_a = compute_accumulated_phase('X', phi_l)
-                           elif gt[gt.find('*')+1] == 'Y':
-                               phi_l, phi_a = compute_accumulated_phase('Y', phi_l)
-                           elif gt[gt.find('*')+1] == 'U':
-                               phi_l, phi_a = compute_accumulated_phase('U', phi_l)
-                           elif gt[gt.find('*')+1] == 'V':
-                               phi_l, phi_a = compute_accumulated_phase('V', phi_l)
-                           else:
-                               pass
-                           incr_gate_map = {0: 5, -90 : 6, -180: 7, -270: 8, 90: 9, 180: 10, 270: 11, -360: 5, 360: 5}
+                           phi_l, phi_a = compute_accumulated_phase(label, phi_l)
                            ct_idx_g_a = 58 + N_z + N_p + N_arb_tot + incr_gate_map[phi_a]+arbgate_counter[awg_idx][core_idx]
                            arbgate_counter[awg_idx][core_idx] += 11
-                        else:
-                            pass
                     else:
                          ct_idx_g_a = 59 + N_z + N_p + N_arb_tot + arbgate_counter[awg_idx][core_idx]
                          arbgate_counter[awg_idx][core_idx] += 1
-                else:
-                    pass
                 ct_idxs[awg_idx][core_idx][idx] = ct_idx_g_a
 
             ## Incremented RF gates (non-arbitrary)
             elif rf_gt_idx > 1:
-                ##Compute phase
-                if gt in {'x', 'y', 'xxx', 'yyy', 'xx', 'yy', 'mxxm', 'myym'}:
-                    phi_l, phi_a = compute_accumulated_phase(gt, phi_l)
-                else:
-                    pass
                 ##Incremented pi gate
-                if gt in pi_gt_set:
-                     if len(p_intersect) != 0:
-                        for tup in p_intersect_tups:
-                            if tup[1] == 'p':
-                                tau_p = int(gate_lengths['plunger'][tup[0]]['p'])
-                                #Plunger frame
-                                if tau_p > taus_std[1]:
-                                    ct_idx_incr = ct_idx_incr_pi_p_fr[phi_a]
-                                    break
-                                #Pi frame
-                                else:
-                                    ct_idx_incr = ct_idx_incr_pi_pi_fr[phi_a]
-                            else:
-                                ct_idx_incr = ct_idx_incr_pi_pi_fr[phi_a]
-                     else:
-                         ct_idx_incr = ct_idx_incr_pi_pi_fr[phi_a]
-                     ct_idxs[awg_idx][core_idx][idx] = ct_idx_incr
+                if kind == KIND_PI:
+                    phi_l, phi_a = compute_accumulated_phase(gates[op], phi_l)
+                    if p_gt_pi[idx]:
+                        ct_idx_incr = ct_idx_incr_pi_p_fr[phi_a]
+                    else:
+                        ct_idx_incr = ct_idx_incr_pi_pi_fr[phi_a]
+                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_incr
                 ##Incremented pi/2 gate
-                elif gt in pi_2_gt_set:
-                    if len(p_intersect) != 0:
-                        for tup in p_intersect_tups:
-                            if tup[1] == 'p':
-                                #Obtain DC pulse length
-                                tau_p = int(gate_lengths['plunger'][tup[0]]['p'])
-                                #No pi pulses, just pi/2 and plunger ==> plunger > pi/2
-                                if len(pi_intersect) == 0 and tau_p > taus_std[0]:
-                                    ct_idx_incr = ct_idx_incr_pi_2_p_fr[phi_a]
-                                    break
-                                #Pi pulses, with pi/2 and plunger ==> plunger > pi
-                                elif len(pi_intersect) != 0 and tau_p > taus_std[1]:
-                                    ct_idx_incr = ct_idx_incr_pi_2_p_fr[phi_a]
-                                    break
-                               #Pi pulses, with pi/2 and plunger ==> plunger < pi
-                                elif len(pi_intersect) != 0 and tau_p < taus_std[1]:
-                                    ct_idx_incr = ct_idx_incr_pi_2_pi_fr[phi_a]
-                                elif len(pi_intersect) == 0 and tau_p < taus_std[0]:
-                                    ct_idx_incr = ct_idx_incr_pi_2_pi_2_fr[phi_a]
-                                else:
-                                    pass
-                            else:
-                                pass
-                    elif len(pi_intersect) != 0:
+                elif kind == KIND_PI_2:
+                    phi_l, phi_a = compute_accumulated_phase(gates[op], phi_l)
+                    if n_p_dc[idx] != 0:
+                        if pi_intersect:
+                            if p_gt_pi[idx]:
+                                ct_idx_incr = ct_idx_incr_pi_2_p_fr[phi_a]
+                            elif p_lt_pi[idx]:
+                                ct_idx_incr = ct_idx_incr_pi_2_pi_fr[phi_a]
+                        else:
+                            if p_gt_pi_2[idx]:
+                                ct_idx_incr = ct_idx_incr_pi_2_p_fr[phi_a]
+                            elif p_lt_pi_2[idx]:
+                                ct_idx_incr = ct_idx_incr_pi_2_pi_2_fr[phi_a]
+                    elif pi_intersect:
                         ct_idx_incr = ct_idx_incr_pi_2_pi_fr[phi_a]
                     else:
                         ct_idx_incr = ct_idx_incr_pi_2_pi_2_fr[phi_a]
                     ct_idxs[awg_idx][core_idx][idx] = ct_idx_incr
-            ## Consider throwing error here
-                else:
-                    pass
 
-    ##Start here
-    if len(dc_gate_sequence.keys()) == 0:
-        pass
-    else:
+    if len(dc_chs) == 0:
+        return ct_idxs, arbgate_counter
 
-        idx_temp = list(dc_gate_sequence.keys())[0]
-        n_gates = len(dc_gate_sequence[idx_temp])
-
-        check_dc_p_channels = {}
-        for i in range(n_gates):
-            check_dc_p_channels[i] = {}
-            for dc_idx in dc_gate_sequence:
-                check_dc_p_channels[i][dc_idx] = 0
-
-        for dc_idx in dc_gate_sequence:
-            arb_gate_counter = 0
-            awg_idx = awg_core_split[dc_idx][0]
-            core_idx = awg_core_split[dc_idx][1]
-            dc_diff_idxs = list(set([i for i in dc_gate_sequence.keys()]).difference({dc_idx}))
-            rf_diff_idxs = list(set([i for i in rf_gate_sequence.keys()]))
-            gate_sequence = dc_gate_sequence[dc_idx]
-            n_gates = len(gate_sequence)
-
-            ##Loop through all gates
-            for idx in range(n_gates):
-                gt = gate_sequence[idx]
-                dc_gates_other = set([dc_gate_sequence[j][idx] for j in dc_diff_idxs])
-                p_gates_other = dc_gates_other.intersection({'p'})
-                rf_gates_other = set([rf_gate_sequence[j][idx] for j in rf_diff_idxs])
-                pi_2_intersect = rf_gates_other.intersection(pi_2_gt_set)
-                pi_intersect = rf_gates_other.intersection(pi_gt_set)
-
-                if gt == 'p':
-                    itr = 0
-                    p_dc_intersect = {}
-                    for j in dc_gate_sequence.keys():
-                        gt_dc = dc_gate_sequence[j][idx]
-                        if gt_dc == 'p':
-                            itr = 0
-                            for item in plunger_tup_lengths:
-                                if j == item[0]:
-                                    p_dc_intersect[itr] = item[1]
-
-                                else:
-                                    itr += 1
-                        else:
-                            pass
-                    p_dc_diff_max_idx = max(p_dc_intersect, key=p_dc_intersect.get)
-
-                    if len(p_gates_other) == 0 and len(pi_2_intersect) == 0 and len(pi_intersect) == 0:
-                        itr = 0
-                        for item in plunger_tup_lengths:
-                            if dc_idx == item[0]:
-                                break
-                            else:
-                                itr += 1
-                        if dc_idx%2 != 0:
-                            ct_idx_p = itr
-                        else:
-                            ct_idx_p = itr + N_p
-                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                    elif len(p_gates_other) != 0 and len(pi_2_intersect) == 0 and len(pi_intersect) == 0:
-                        itr = 0
-                        for item in plunger_tup_lengths:
-                            if dc_idx == item[0]:
-                                tau_p_gt = item[1]
-                                break
-                            else:
-                                itr += 1
-
-                        p_diff_taus = {}
-                        for j in dc_gate_sequence.keys():
-                            gt_dc = dc_gate_sequence[j][idx]
-                            if gt_dc == 'p':
-                                for item in plunger_tup_lengths:
-                                    if j == item[0]:
-                                        p_diff_taus[j] = item[1]
-                                        break
-                                    else:
-                                        pass
-                            else:
-                                pass
-                        p_diff_max_idx = max(p_diff_taus, key=p_diff_taus.get)
-
-                        itr_diff_idx = 0
-                        for item in plunger_tup_lengths:
-                            if p_diff_max_idx == item[0]:
-                                break
-                            else:
-                                itr_diff_idx += 1
-
-                        ## CH 1
-                        if dc_idx%2 != 0:
-                            if check_dc_p_channels[idx][dc_idx] == 0:
-                                if dc_gate_sequence[dc_idx+1][idx] == 'p':
-                                    ct_idx_p = itr_diff_idx + 2*N_p
-                                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                elif dc_gate_sequence[dc_idx+1][idx][0] == 't':
-                                    ##only p1
-                                    ct_idx_p = itr_diff_idx
-                                    ct_idxs[awg_idx][core_idx][idx] =  ct_idx_p
-
-                                else:
-                                    ##Throw error instead
-                                    pass
-                                check_dc_p_channels[idx][dc_idx] += 1
-                                check_dc_p_channels[idx][dc_idx+1] += 1
-                            else:
-                               pass
-
-
-                       ## CH 2
-                        elif dc_idx%2 == 0:
-                            if check_dc_p_channels[idx][dc_idx] == 0:
-                                if dc_gate_sequence[dc_idx-1][idx] == 'p':
-                                    ##p1, p2 simulataneous
-                                    ct_idx_p = itr_diff_idx + 2*N_p
-                                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                elif dc_gate_sequence[dc_idx-1][idx][0] == 't':
-                                    ##only p2
-                                    ct_idx_p = itr_diff_idx + N_p
-                                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                else:
-                                    ##Throw error instead
-                                    pass
-                                check_dc_p_channels[idx][dc_idx] += 1
-                                check_dc_p_channels[idx][dc_idx-1] += 1
-                            else:
-                               pass
-                        else:
-                            pass
+    ## Gate slots whose index was already generated for the other channel of the core
+    check_dc_p_channels = np.zeros((len(dc_chs), ops.shape[1]), dtype=bool)
 
-                    ##Case 4
-                    elif len(pi_intersect) != 0:
-                        if p_dc_intersect[p_dc_diff_max_idx] > taus_std[1]:
-                            use_p_std = 1
-                        else:
-                            use_p_std = 0
-
-                        ##Work in p std frame
-                        if use_p_std == 1:
-                            ##CH 1
-                            if dc_idx%2 != 0:
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx+1][idx] == 'p':
-                                        ##p1, p2 simulataneous in p std frame
-                                        ct_idx_p = p_std_idx + 2*N_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    elif dc_gate_sequence[dc_idx+1][idx][0] == 't':
-                                        ##only p1 in p std frame
-                                        ct_idx_p = p_std_idx
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx+1] += 1
-                                else:
-                                   pass
-
-
-                           ## CH 2
-                            elif dc_idx%2 == 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx-1][idx] == 'p':
-                                        ##p1, p2 simulataneous in p frmae
-                                        ct_idx_p = p_std_idx + 2*N_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    elif dc_gate_sequence[dc_idx-1][idx][0] == 't':
-                                        ##only p2 in pi frame
-                                        ct_idx_p = N_p + p_std_idx
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx-1] += 1
-                                else:
-                                   pass
-
-                            else:
-                                pass
-
-
-                        else:
-                            ## PI frame
-                            ##CH 1
-                            if dc_idx%2 != 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx+1][idx] == 'p':
-                                        ##p1, p2 simulataneous in pi frame
-                                        ct_idx_p = 3*N_p + 4
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    elif dc_gate_sequence[dc_idx+1][idx][0] == 't':
-                                        ##only p1
-                                        ct_idx_p = 3*N_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx+1] += 1
-                                else:
-                                   pass
-
-                           ## CH 2
-                            elif dc_idx%2 == 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx-1][idx] == 'p':
-                                        ##p1, p2 simulataneous
-                                        ct_idx_p = 3*N_p + 4
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    elif dc_gate_sequence[dc_idx-1][idx][0] == 't':
-                                        ##only p2
-                                        ct_idx_p = 3*N_p + 1
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx-1] += 1
-                                else:
-                                   pass
-
-                            else:
-                                pass
-
-                    #Case 5: working in  pi/2 frame
-                    elif len(pi_2_intersect) != 0 and len(pi_intersect) == 0:
-                        if p_dc_intersect[p_dc_diff_max_idx] > taus_std[0]:
-                            use_p_std = 1
-                        else:
-                            use_p_std = 0
-
-                        ##Work in p std frame
-                        if use_p_std == 1:
-                            ##CH 1
-                            if dc_idx%2 != 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx+1][idx] == 'p':
-                                        ##p1, p2 simulataneous in p std frame
-                                        ct_idx_p = p_std_idx + 2*N_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    elif dc_gate_sequence[dc_idx+1][idx][0] == 't':
-                                        ##only p1 in p std frame
-                                        ct_idx_p = p_std_idx
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx+1] += 1
-                                else:
-                                   pass
-
-
-                           ## CH 2
-                            elif dc_idx%2 == 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx-1][idx] == 'p':
-                                        ##p1, p2 simulataneous in p frmae
-                                        ct_idx_p = p_std_idx + 2*N_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    elif dc_gate_sequence[dc_idx-1][idx][0] == 't':
-                                        ##only p2 in pi frame
-                                        ct_idx_p = N_p + p_std_idx
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx-1] += 1
-                                else:
-                                   pass
-
-                            else:
-                                pass
-
-
-                        else:
-                            ## PI/2 frame
-                            ##CH 1
-                            if dc_idx%2 != 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx+1][idx] == 'p':
-                                        ##p1, p2 simulataneous in pi/2 frame
-                                        ct_idx_p = 3*N_p + 5
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    elif dc_gate_sequence[dc_idx+1][idx][0] == 't':
-                                        ##only p1
-                                        ct_idx_p = 3*N_p + 2
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx+1] += 1
-                                else:
-                                   pass
-
-                           ## CH 2
-                            elif dc_idx%2 == 0:
-                                ## Check if index already generated for the other channel
-                                if check_dc_p_channels[idx][dc_idx] == 0:
-                                    if dc_gate_sequence[dc_idx-1][idx] == 'p':
-                                        ##p1, p2 simulataneous
-                                        ct_idx_p = 3*N_p + 5
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    elif dc_gate_sequence[dc_idx-1][idx][0] == 't':
-                                        ##only p2
-                                        ct_idx_p = 3*N_p + 3
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
-                                    else:
-                                        ##Throw error instead
-                                        pass
-                                    check_dc_p_channels[idx][dc_idx] += 1
-                                    check_dc_p_channels[idx][dc_idx-1] += 1
-                                else:
-                                   pass
-
-                            else:
-                                pass
-
-                elif gt == 'z0z':
-                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_p_z0z
-
-                elif gt[0] == 't':
-                    if dc_idx%2 != 0:
-                        if dc_gate_sequence[dc_idx+1][idx][0] != 't':
-                            dual_channel = 0
-                        else:
-                            dual_channel = 1
+    def set_dc_pair(dc_idx, awg_idx, core_idx, idx, ct_idx_both, ct_idx_single):
+        ## Index for both channels of the core if the other channel also plays a plunger, for this one only if it idles
+        if dc_idx%2 != 0:
+            other_idx = dc_idx + 1
+        else:
+            other_idx = dc_idx - 1
+        if check_dc_p_channels[dc_pos[dc_idx], idx]:
+            return
+        other_kind = dc_kinds[dc_pos[other_idx], idx]
+        if other_kind == KIND_PLUNGER:
+            ct_idxs[awg_idx][core_idx][idx] = ct_idx_both
+        elif other_kind == KIND_DELAY:
+            ct_idxs[awg_idx][core_idx][idx] = ct_idx_single
+        check_dc_p_channels[dc_pos[dc_idx], idx] = True
+        check_dc_p_channels[dc_pos[other_idx], idx] = True
+
+    for row, dc_idx in zip(dc_rows, dc_chs):
+        awg_idx = awg_core_split[dc_idx][0]
+        core_idx = awg_core_split[dc_idx][1]
+        gate_sequence = ops[row]
+        gate_kinds = line_kinds[row]
+        ch_1 = dc_idx%2 != 0
+
+        ##Loop through all gates
+        for idx in range(len(gate_sequence)):
+            op = gate_sequence[idx]
+            kind = gate_kinds[idx]
+            pi_intersect = n_pi_rf[idx] != 0
+            pi_2_intersect = n_pi_2_rf[idx] != 0
+
+            if kind == KIND_PLUNGER:
+                p_chs = [dc_chs[i] for i in np.flatnonzero(dc_is_p[:, idx])]
+                p_lengths = [p_tup_len[j] for j in p_chs if j in p_tup_len]
+                p_max = max(p_lengths)
+                p_gates_other = n_p_dc[idx] > 1
+
+                if not p_gates_other and not pi_2_intersect and not pi_intersect:
+                    itr = p_tup_pos.get(dc_idx, len(plunger_tup_lengths))
+                    if ch_1:
+                        ct_idx_p = itr
                     else:
-                        if dc_gate_sequence[dc_idx-1][idx][0] != 't':
-                            dual_channel = 0
-                        else:
-                            dual_channel = 1
-
-                    if dual_channel == 0:
-                        pass
+                        ct_idx_p = itr + N_p
+                    ct_idxs[awg_idx][core_idx][idx] = ct_idx_p
+                elif p_gates_other and not pi_2_intersect and not pi_intersect:
+                    ## Frame of the longest plunger in this gate slot
+                    p_diff_max_idx = [j for j in p_chs if j in p_tup_len][p_lengths.index(p_max)]
+                    itr_diff_idx = p_tup_pos[p_diff_max_idx]
+                    set_dc_pair(dc_idx, awg_idx, core_idx, idx, itr_diff_idx + 2*N_p, itr_diff_idx if ch_1 else itr_diff_idx + N_p)
+
+                ##Case 4: pi pulses, p std frame if a plunger outlasts the pi pulse, else pi frame
+                elif pi_intersect:
+                    if p_max > taus_std[1]:
+                        set_dc_pair(dc_idx, awg_idx, core_idx, idx, p_std_idx + 2*N_p, p_std_idx if ch_1 else N_p + p_std_idx)
                     else:
-                        gt_t_str = int(gt[1:len(gt)])
-                        ## pi delays
-                        if gt_t_str == int(taus_std[1]):
-                            ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_pi
-                        # std pi/2 delays
-                        elif gt_t_str == int(taus_std[0]):
-                            ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_pi_2
-
-                        # plunger delays
-                        else:
-                            if gt_t_str in plunger_len_set:
-                                idx_t_p = 0
-                                for itm in plunger_len_tups:
-                                    idx_t_p += 1
-                                    if gt_t_str == itm[1]:
-                                        ct_idx_t_p  = ct_p_idx_tau_p_std + idx_t_p
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_p
-                                        break
-                                    else:
-                                        continue
-
-                            elif gt_t_str in set(arb_gate_taus):
-                                idx_a = 0
-                                for itm in arb_gate_taus:
-                                    idx_a += 1
-                                    if gt_t_str == itm:
-                                        ct_idx_t_a =  ct_p_idx_tau_p_std+ N_p+idx_a
-                                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_a
-                                        break
-                                    else:
-                                        continue
-                            else:
-                                pass
-
-                elif gt.find('*') != -1:
-                    if gt[gt.find('*')+1] in arbgate_dict.keys():
-                        ## PI/2 frame
-                        ##CH 1
-                        if dc_idx%2 != 0:
-                            if check_dc_p_channels[idx][dc_idx] == 0:
-                                ct_idx_t_a = ct_p_idx_tau_p_std+ N_p+len(arb_gate_taus) + arb_dc_dict[awg_idx][core_idx][line][idx][1]
-                                ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_a
-                                check_dc_p_channels[idx][dc_idx] += 1
-                                check_dc_p_channels[idx][dc_idx+1] += 1
-                            else:
-                               pass
-
-                       ## CH 2
-                        elif dc_idx%2 == 0:
-                            if check_dc_p_channels[idx][dc_idx] == 0:
-                                ct_idx_t_a = ct_p_idx_tau_p_std+ N_p+len(arb_gate_taus) + arb_dc_dict[awg_idx][core_idx][line][idx][1]
-                                ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_a
-                                check_dc_p_channels[idx][dc_idx] += 1
-                                check_dc_p_channels[idx][dc_idx-1] += 1
-                            else:
-                               pass
+                        set_dc_pair(dc_idx, awg_idx, core_idx, idx, 3*N_p + 4, 3*N_p if ch_1 else 3*N_p + 1)
 
-                        else:
-                            pass
+                #Case 5: pi/2 pulses, p std frame if a plunger outlasts the pi/2 pulse, else pi/2 frame
+                elif pi_2_intersect:
+                    if p_max > taus_std[0]:
+                        set_dc_pair(dc_idx, awg_idx, core_idx, idx, p_std_idx + 2*N_p, p_std_idx if ch_1 else N_p + p_std_idx)
                     else:
-                        pass
-            else:
-                continue
+                        set_dc_pair(dc_idx, awg_idx, core_idx, idx, 3*N_p + 5, 3*N_p + 2 if ch_1 else 3*N_p + 3)
+
+            elif kind == KIND_Z0Z:
+                ct_idxs[awg_idx][core_idx][idx] = ct_idx_p_z0z
+
+            elif kind == KIND_DELAY:
+                ## Delay command table entries only when both channels of the core idle
+                if ch_1:
+                    dual_channel = dc_kinds[dc_pos[dc_idx+1], idx] == KIND_DELAY
+                else:
+                    dual_channel = dc_kinds[dc_pos[dc_idx-1], idx] == KIND_DELAY
+                if dual_channel:
+                    gt_t_str = durations[op]
+                    ## pi delays
+                    if gt_t_str == int(taus_std[1]):
+                        ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_pi
+                    # std pi/2 delays
+                    elif gt_t_str == int(taus_std[0]):
+                        ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_pi_2
+                    # plunger delays
+                    elif gt_t_str in plunger_delay_idxs:
+                        ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_p_std + plunger_delay_idxs[gt_t_str]
+                    elif gt_t_str in arb_delay_idxs:
+                        ct_idxs[awg_idx][core_idx][idx] = ct_p_idx_tau_p_std + N_p + arb_delay_idxs[gt_t_str]
+
+            elif kind == KIND_ARB:
+                if program_ir.arb_gate(op)[0] in arbgate_dict:
+                    if not check_dc_p_channels[dc_pos[dc_idx], idx]:
+                        other_idx = dc_idx + 1 if ch_1 else dc_idx - 1
+                        ct_idx_t_a = ct_p_idx_tau_p_std + N_p + len(arb_gate_taus) + arb_dc_dict[awg_idx][core_idx][line][idx][1]
+                        ct_idxs[awg_idx][core_idx][idx] = ct_idx_t_a
+                        check_dc_p_channels[dc_pos[dc_idx], idx] = True
+                        check_dc_p_channels[dc_pos[other_idx], idx] = True
     return ct_idxs, arbgate_counter
 
 def make_rf_command_table(n_std, arbZs, arbitrary_waveforms, plunger_length_set, awgidx, coreidx, awg):
@@ -1316,6 +934,21 @@ def make_dc_command_table(n_std, arbitrary_waveforms, plunger_length_tups, awgid
                 continue
     return ct
 
+def command_table_from_dict(table, ct_schema):
+    '''
+    Rebuilds a command table from its dict form (as returned by CommandTable.as_dict, e.g. stored in a compile cache entry). \n
+
+    Parameters:
+                    table (dict): command table as a dict.
+                    ct_schema (dict): command table validation schema of the HDAWG (awg.commandtable.load_validation_schema()).
+
+    Returns:
+       ct (CommandTable): command table with the header and entries of table.
+    '''
+    ct = CommandTable(ct_schema)
+    ct.update(table)
+    return ct
+
 def make_waveform_placeholders(waveform_lengths):
     '''
     Generates sequencer code for waveform placeholders on HDAWG FPGAs.
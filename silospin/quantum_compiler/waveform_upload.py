@@ -0,0 +1,67 @@
+"""Waveform upload to HDAWG cores.
+
+Writing each waveform with its own daq.setVector costs one round trip to
+the data server per wave, which dominates the upload of programs with many
+arbitrary gates (hundreds of waves per core). ziDAQServer.set accepts a
+list of (path, value) pairs, vectors included, and applies them in a
+single transaction, so the waves can be grouped per core or per device:
+
+    'wave'   - one setVector per waveform (the original behaviour, default)
+    'core'   - one transaction per AWG core
+    'device' - one transaction per HDAWG, after every core's ELF is loaded
+
+The batched modes are opt-in until verified on hardware.
+
+Waveforms must be written after the ELF of their core is uploaded, since
+loading a sequencer program reinitialises the waveform memory.
+"""
+
+# Supported grouping of waveform uploads
+_UPLOAD_MODES = ('wave', 'core', 'device')
+
+
+def check_upload_mode(mode):
+    if mode not in _UPLOAD_MODES:
+        raise ValueError(f"Unknown waveform upload mode {mode!r}, expected one of {_UPLOAD_MODES}")
+
+
+def waveform_path(device_id, core_idx, wave_idx):
+    """Node of waveform wave_idx of AWG core core_idx (1-based, as in the channel mapping)."""
+    return f"/{device_id}/awgs/{core_idx-1}/waveform/waves/{wave_idx}"
+
+
+def waveform_settings(device_id, core_idx, waveforms):
+    """
+    (path, vector) pairs writing the waveforms of one core.
+
+    Parameters:
+        device_id (str): HDAWG serial.
+        core_idx (int): AWG core index (1-based).
+        waveforms (dict): waveforms keyed by wave index, as produced by zhinst.utils.convert_awg_waveform.
+
+    Returns:
+        settings (list): [(node path, waveform)] in wave index order.
+    """
+    return [(waveform_path(device_id, core_idx, wave_idx), waveforms[wave_idx]) for wave_idx in sorted(waveforms)]
+
+
+def upload_waveforms(daq, settings, batched=True):
+    """
+    Writes waveforms to the data server.
+
+    Parameters:
+        daq (ziDAQServer): data server connection.
+        settings (list): (path, waveform) pairs, e.g. from waveform_settings.
+        batched (bool): one transactional daq.set for all pairs if True, else one daq.setVector per pair.
+
+    Returns:
+        round_trips (int): number of calls made to the data server.
+    """
+    if not settings:
+        return 0
+    if batched:
+        daq.set(settings)
+        return 1
+    for path, waveform in settings:
+        daq.setVector(path, waveform)
+    return len(settings)
@@ -0,0 +1,127 @@
+"""Sinks for trajectory snapshots produced by StrangSplitIntegrator.
+
+TensorSink keeps the whole trajectory in a CPU torch tensor (the default).
+TrajectoryFileWriter streams it into a .npy file on a background thread so
+that runs larger than host memory can be integrated; the result is read
+back lazily as a read-only memmap with open_trajectory.
+"""
+import logging
+import queue
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TensorSink:
+    """Writes snapshot blocks into a pre-allocated CPU torch tensor."""
+
+    def __init__(self, shape, dtype=None):
+        import torch
+
+        self.tensor = torch.empty(*shape, dtype=dtype or torch.complex128, device='cpu')
+
+    def write(self, start, block):
+        """Copy block [n, ...] into rows start:start+n."""
+        import torch
+
+        self.tensor[start:start + block.shape[0]] = torch.from_numpy(block)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        return self.tensor
+
+
+class TrajectoryFileWriter:
+    """
+    Streams snapshot blocks into a .npy file on a background thread.
+
+    The file is created up front with np.lib.format.open_memmap, so its
+    header describes the full [Nt, ...] array and every block is written at
+    its final offset. write() hands a copy of the block to the writer
+    thread and returns immediately; at most `max_pending` blocks are queued,
+    which bounds host memory and applies back-pressure if the disk is
+    slower than the integration.
+
+    Parameters
+    ----------
+    path : str
+        Output file (conventionally ending in .npy).
+    shape : tuple of int
+        Full trajectory shape, e.g. (Nt, B, d*d).
+    dtype : np.dtype
+    max_pending : int
+        Maximum number of queued blocks.
+    mode : str
+        'w+' creates (or truncates) the file; 'r+' reopens an existing
+        trajectory of the same shape and dtype, e.g. to resume a run.
+    """
+
+    def __init__(self, path, shape, dtype=np.complex128, max_pending=2, mode='w+'):
+        self.path = str(path)
+        self.shape = tuple(shape)
+        if mode == 'r+':
+            self._mm = np.lib.format.open_memmap(self.path, mode='r+')
+            if self._mm.shape != self.shape or self._mm.dtype != np.dtype(dtype):
+                raise ValueError(
+                    f"Existing trajectory {self.path} has shape {self._mm.shape} "
+                    f"and dtype {self._mm.dtype}, expected {self.shape} and {np.dtype(dtype)}"
+                )
+        elif mode == 'w+':
+            self._mm = np.lib.format.open_memmap(self.path, mode='w+', dtype=dtype,
+                                                 shape=self.shape)
+        else:
+            raise ValueError(f"Unknown mode {mode!r}, expected 'w+' or 'r+'")
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self.bytes_written = 0
+        self._thread = threading.Thread(target=self._run, name='TrajectoryFileWriter', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is not None:
+                    continue
+                start, block = item
+                self._mm[start:start + block.shape[0]] = block
+                self.bytes_written += block.nbytes
+            except BaseException as exc:  # re-raised on the caller's thread
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def write(self, start, block):
+        """Queue block [n, ...] for rows start:start+n."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put((start, np.array(block, copy=True)))
+
+    def flush(self):
+        """Block until every queued block is written and flushed to disk."""
+        self._queue.join()
+        self._mm.flush()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        """Wait for queued blocks, flush the file and reopen it lazily."""
+        self._queue.put(None)
+        self._thread.join()
+        self._mm.flush()
+        self._mm = None
+        if self._error is not None:
+            raise self._error
+        logger.info("Wrote %.1f MB trajectory to %s", self.bytes_written / 1e6, self.path)
+        return open_trajectory(self.path)
+
+
+def open_trajectory(path):
+    """Open a trajectory written by TrajectoryFileWriter as a read-only memmap."""
+    return np.load(path, mmap_mode='r')
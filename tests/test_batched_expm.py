@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import scipy.linalg
+
+from silospin.batched_expm import (BatchedExpmWorkspace, _PADE_ORDERS, _PRECISIONS, _THETA,
+                                   _candidate_orders, _select_pade_order, batched_expm)
+
+# Max relative error against scipy per precision
+_RTOL = {'double': 1e-11, 'single': 1e-4, 'mixed': 1e-4}
+
+_D = 5
+_B = 40
+
+
+def _batch(norms, d=_D, seed=0):
+    """A [d, d, B] with ||A[:, :, b]||_1 = norms[b], and expm(A) from scipy."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(len(norms), d, d)) + 1j * rng.normal(size=(len(norms), d, d))
+    A = X / np.abs(X).sum(axis=1).max(axis=1)[:, None, None] * np.asarray(norms)[:, None, None]
+    expected = np.stack([scipy.linalg.expm(a) for a in A], axis=2)
+    return np.ascontiguousarray(A.transpose(1, 2, 0)), expected
+
+
+def _max_rel_error(result, expected):
+    return (np.abs(result - expected).max(axis=(0, 1)) / np.abs(expected).max(axis=(0, 1))).max()
+
+
+# 1-norms from 1e-4 to ~30: every adaptive degree, with and without squaring
+_NORMS = np.logspace(-4, 1.5, _B)
+
+
+@pytest.mark.parametrize('precision', list(_PRECISIONS))
+@pytest.mark.parametrize('pade_order', ['adaptive'] + list(_PADE_ORDERS))
+@pytest.mark.parametrize('scaling', ['global', 'bucketed'])
+def test_batched_expm_matches_scipy(scaling, pade_order, precision):
+    A, expected = _batch(_NORMS)
+    result = batched_expm(A, xp=np, scaling=scaling, pade_order=pade_order, precision=precision)
+    assert result.dtype == _PRECISIONS[precision][1]
+    assert _max_rel_error(result, expected) < _RTOL[precision]
+
+
+@pytest.mark.parametrize('precision', list(_PRECISIONS))
+@pytest.mark.parametrize('pade_order', ['adaptive'] + list(_PADE_ORDERS))
+@pytest.mark.parametrize('scaling', ['global', 'bucketed'])
+def test_workspace_matches_scipy(scaling, pade_order, precision):
+    A, expected = _batch(_NORMS)
+    ws = BatchedExpmWorkspace(_D, _B, xp=np, scaling=scaling, pade_order=pade_order, precision=precision)
+    for _ in range(2):  # buffers are reused across calls
+        result = ws.compute(A)
+        assert result.dtype == _PRECISIONS[precision][1]
+        assert _max_rel_error(result, expected) < _RTOL[precision]
+
+
+@pytest.mark.parametrize('scaling', ['global', 'bucketed'])
+def test_outlier_does_not_change_small_elements(scaling):
+    # One large-norm element forces squaring; the others must stay accurate
+    A, expected = _batch([1e-3] * 7 + [40.0])
+    result = batched_expm(A, xp=np, scaling=scaling)
+    assert _max_rel_error(result, expected) < _RTOL['double']
+
+
+def test_zero_batch_is_identity():
+    result = batched_expm(np.zeros((3, 3, 4), dtype=complex), xp=np)
+    np.testing.assert_array_equal(result, np.repeat(np.eye(3)[:, :, None], 4, axis=2))
+
+
+def test_adaptive_order_is_cheapest_within_theta():
+    orders = _candidate_orders('adaptive')
+    assert [_select_pade_order(0.9 * _THETA[m], orders) for m in orders] == list(orders)
+    assert _select_pade_order(100.0, orders) == 13
+    assert _candidate_orders('adaptive', 'single') == (3, 5, 7)
+
+
+@pytest.mark.parametrize('kwargs', [{'scaling': 'per-element'}, {'pade_order': 11}, {'precision': 'half'}])
+def test_unknown_options(kwargs):
+    A, _ = _batch([0.1])
+    with pytest.raises(ValueError):
+        batched_expm(A, xp=np, **kwargs)
+    with pytest.raises(ValueError):
+        BatchedExpmWorkspace(_D, 1, xp=np, **kwargs)
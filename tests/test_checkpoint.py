@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from silospin.checkpoint import load_checkpoint, save_checkpoint
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _HCallback:
+    """H(ti) = H0 (1 + 0.02 ti); raises at time index fail_at (a crashed run)."""
+
+    def __init__(self, H0, fail_at=None):
+        self.H0 = H0
+        self.fail_at = fail_at
+
+    def __call__(self, ti, B, out):
+        if ti == self.fail_at:
+            raise _Interrupted(ti)
+        out[...] = self.H0 * (1.0 + 0.02 * ti)
+
+
+class _J:
+    """J(t)[rho] = -i sin(t) [V, rho]."""
+
+    def __init__(self, V):
+        self.V = V
+
+    def compute_action(self, t, dummy, rho, out):
+        out[...] = -1j * np.sin(t) * (np.einsum('ijb,jkb->ikb', self.V, rho) - np.einsum('ijb,jkb->ikb', rho, self.V))
+
+
+def _problem(d=3, B=2):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    H0 = np.asfortranarray(0.5 * (X + X.conj().transpose(1, 0, 2)))
+    L = np.zeros((d, d, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((d, d, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    return H0, [(L, np.full(B, 0.1))], rho0
+
+
+def _integrator(H0, collapse_ops, fail_at=None, **kwargs):
+    d, _, B = H0.shape
+    return StrangSplitIntegrator(_HCallback(H0, fail_at), collapse_ops, B, d, _TemplateState(), xp=np, **kwargs)
+
+
+@pytest.mark.parametrize('options', [{}, {'dissipator': 'exact', 'scheme': 'yoshida4'}, {'storage': 'packed'}])
+def test_resume_is_bit_exact(tmp_path, options):
+    H0, collapse_ops, rho0 = _problem()
+    T, Nt = 1.0, 61
+    expected = _integrator(H0, collapse_ops, **options).integrate(T, Nt, rho0, chunk_size=7).numpy()
+
+    trajectory, checkpoint = str(tmp_path / 'traj.npy'), str(tmp_path / 'ckpt.npz')
+    with pytest.raises(_Interrupted):
+        _integrator(H0, collapse_ops, fail_at=45, **options).integrate(
+            T, Nt, rho0, chunk_size=7, trajectory_path=trajectory, checkpoint_path=checkpoint, checkpoint_every=10)
+    assert load_checkpoint(checkpoint)[1]['step'] == 40
+
+    result = _integrator(H0, collapse_ops, **options).resume(checkpoint, chunk_size=7)
+    np.testing.assert_array_equal(np.asarray(result), expected)
+
+
+def test_resume_tme_is_bit_exact(tmp_path):
+    H0, collapse_ops, rho0 = _problem()
+    V = np.asfortranarray(np.repeat(np.diag([1.0, 0.0, -1.0]).astype(complex)[:, :, None], 2, axis=2))
+    T, Nt = 1.0, 41
+    expected = _integrator(H0, collapse_ops, dissipator='exact').integrate_tme(T, Nt, rho0, _J(V)).numpy()
+
+    trajectory, checkpoint = str(tmp_path / 'traj.npy'), str(tmp_path / 'ckpt.npz')
+    with pytest.raises(_Interrupted):
+        _integrator(H0, collapse_ops, fail_at=25, dissipator='exact').integrate_tme(
+            T, Nt, rho0, _J(V), trajectory_path=trajectory, checkpoint_path=checkpoint, checkpoint_every=8)
+    with pytest.raises(ValueError):
+        _integrator(H0, collapse_ops, dissipator='exact').resume(checkpoint)
+
+    result = _integrator(H0, collapse_ops, dissipator='exact').resume(checkpoint, J_callback=_J(V))
+    np.testing.assert_array_equal(np.asarray(result), expected)
+
+
+def test_resume_rejects_other_runs(tmp_path):
+    H0, collapse_ops, rho0 = _problem()
+    trajectory, checkpoint = str(tmp_path / 'traj.npy'), str(tmp_path / 'ckpt.npz')
+    with pytest.raises(_Interrupted):
+        _integrator(H0, collapse_ops, fail_at=15).integrate(
+            1.0, 31, rho0, trajectory_path=trajectory, checkpoint_path=checkpoint, checkpoint_every=10)
+    with pytest.raises(ValueError):
+        _integrator(H0, collapse_ops, dissipator='exact').resume(checkpoint)
+
+
+def test_checkpointing_requires_trajectory_file(tmp_path):
+    H0, collapse_ops, rho0 = _problem()
+    with pytest.raises(ValueError):
+        _integrator(H0, collapse_ops).integrate(1.0, 11, rho0, checkpoint_path=str(tmp_path / 'ckpt.npz'), checkpoint_every=5)
+    with pytest.raises(ValueError):
+        _integrator(H0, collapse_ops).integrate(1.0, 11, rho0, checkpoint_every=5)
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / 'ckpt.npz'
+    rho = np.arange(8, dtype=complex).reshape(2, 2, 2) * (1 + 1j)
+    save_checkpoint(path, {'rho': rho}, {'step': 3, 'method': 'integrate'})
+    arrays, meta = load_checkpoint(path)
+    np.testing.assert_array_equal(arrays['rho'], rho)
+    assert meta['step'] == 3 and meta['method'] == 'integrate'
+    assert not (tmp_path / 'ckpt.npz.tmp').exists()
@@ -0,0 +1,137 @@
+"""
+Golden test of make_command_table_indices.
+
+The expected command table indices in data/command_table_indices.json were
+produced by the string-based implementation (before the ProgramIR port) on
+the synthetic GST programs built by _make_case; the IR-based implementation
+must reproduce them exactly, for both the IR and the gt_seqs dict entry
+points. Cases on which the string-based implementation raised record the
+exception name instead.
+"""
+import json
+import os
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("zhinst")
+
+from silospin.quantum_compiler.program_ir import ProgramIR
+from silospin.quantum_compiler.quantum_compiler_helpers import channel_mapper, make_command_table_indices
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'data', 'command_table_indices.json')
+
+_RF_GATES = ['x', 'y', 'xxx', 'yyy', 'xx', 'yy', 'mxxm', 'myym', '0.5*X[10&0]', '1*Y[1&2]', '0.2*U[3]', '1*V[]', '0.3*G[4&5]', '0.1*H[1]']
+_Z_GATES = ['z0.5z', 'z1.0z', 'z-0.3z']
+_PLUNGER_LENGTHS = [16, 27, 40, 48, 64, 96]
+
+
+def _make_case(seed):
+    """Random single-HDAWG GST program and compiler inputs; same seed, same case."""
+    rng = random.Random(seed)
+    n_rf = rng.choice([1, 2, 3])
+    n_dc_cores = rng.choice([0, 1, 2])
+    grouping = {"hdawg1": {"rf": list(range(1, n_rf + 1)), "dc": list(range(n_rf + 1, n_rf + 1 + n_dc_cores))}}
+    channel_map, split = channel_mapper(grouping, {"hdawg1": 1})
+    rf_chs = [ch for ch in split if channel_map[split[ch][0]][split[ch][1]]['rf'] == 1]
+    dc_chs = [ch for ch in split if channel_map[split[ch][0]][split[ch][1]]['rf'] == 0]
+    taus_std = (rng.choice([16, 20, 27]), rng.choice([40, 47, 54]))
+    gate_lengths = {"rf": {ch: {"pi": taus_std[1], "pi_2": taus_std[0]} for ch in rf_chs},
+                    "plunger": {ch: {"p": rng.choice(_PLUNGER_LENGTHS)} for ch in dc_chs}}
+    plunger_tups = [(ch, rng.choice(_PLUNGER_LENGTHS + [200])) for ch in dc_chs]
+    arb_gates = {"hdawg1": {c: [(label, np.zeros(rng.choice([48, 96, 160])))
+                                for label in rng.sample(['X', 'Y', 'G'], rng.randint(0, 2))]
+                            for c in channel_map["hdawg1"]}}
+    arb_taus = [int(np.ceil(1e9 * len(w) / 2.4e9)) for c in arb_gates["hdawg1"] for _, w in arb_gates["hdawg1"][c]]
+    delays = sorted(set([taus_std[0], taus_std[1]] + _PLUNGER_LENGTHS + arb_taus + [33, 500]))
+    arbZs = {"hdawg1": {c: {z: (60 + k, 0.1) for k, z in enumerate(_Z_GATES)} for c in channel_map["hdawg1"]}}
+
+    table = {}
+    for line in range(1, rng.randint(1, 4) + 1):
+        rf = {ch: [] for ch in rf_chs}
+        dc = {ch: [] for ch in dc_chs}
+        for _ in range(rng.randint(1, 8)):
+            if rng.random() < 0.15 and rf_chs:
+                z_ch = rng.choice(rf_chs)
+                for ch in rf_chs:
+                    rf[ch].append(rng.choice(_Z_GATES) if ch == z_ch else 'z0z')
+                for ch in dc_chs:
+                    dc[ch].append('z0z')
+                continue
+            delay = 't' + str(rng.choice(delays))
+            for ch in rf_chs:
+                rf[ch].append(rng.choice(_RF_GATES) if rng.random() < 0.6 else delay)
+            dc_arb = rng.random() < 0.15
+            for ch in dc_chs:
+                if dc_arb:
+                    dc[ch].append('0.4*G[1&2]' if rng.random() < 0.7 else delay)
+                else:
+                    dc[ch].append('p' if rng.random() < 0.5 else delay)
+        table[line] = {'rf': rf, 'plunger': dc}
+
+    # Arbitrary DC gates and their command table entries, as built by the compiler
+    arb_dc = {"hdawg1": {c: {line: {} for line in table} for c in channel_map["hdawg1"]}}
+    for line in table:
+        for dc_idx in dc_chs:
+            for itr, gate in enumerate(table[line]['plunger'][dc_idx]):
+                if '*' in gate:
+                    for ch in dc_chs:
+                        if table[line]['plunger'][ch][itr][0] != 't':
+                            awg, core = split[ch]
+                            arb_dc[awg][core][line][itr] = table[line]['plunger'][ch if ch % 2 else ch - 1][itr]
+    arb_dc_dict = {}
+    for awg in arb_dc:
+        arb_dc_dict[awg] = {}
+        for core in arb_dc[awg]:
+            arb_dc_dict[awg][core] = {}
+            count = 0
+            for line in arb_dc[awg][core]:
+                arb_dc_dict[awg][core][line] = {}
+                for itr in arb_dc[awg][core][line]:
+                    count += 1
+                    arb_dc_dict[awg][core][line][itr] = (arb_dc[awg][core][line][itr], count)
+    inputs = (channel_map, split, arb_gates, plunger_tups, taus_std, gate_lengths)
+    return table, inputs, arbZs, arb_dc_dict
+
+
+def _run(seed, pickle_file_location, use_ir):
+    """ct_idxs of all lines and the final arbgate counter, in JSON form, or the name of the raised exception."""
+    table, (channel_map, split, arb_gates, plunger_tups, taus_std, gate_lengths), arbZs, arb_dc_dict = _make_case(seed)
+    program_ir = ProgramIR.from_sequence_table(table)
+    counter = {awg: {core: 0 for core in channel_map[awg]} for awg in channel_map}
+    ct_idxs = {}
+    try:
+        for line in sorted(table):
+            gt_seqs = program_ir if use_ir else table[line]
+            ct_idxs[line], counter = make_command_table_indices(gt_seqs, channel_map, split, arb_gates, plunger_tups, taus_std, gate_lengths,
+                                                                counter, arbZs, line, arb_dc_dict, pickle_file_location=pickle_file_location)
+    except Exception as exc:
+        return {'error': type(exc).__name__}
+    return json.loads(json.dumps({'ct_idxs': ct_idxs, 'counter': counter}, default=int))
+
+
+@pytest.fixture(scope='module')
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='module')
+def arbgate_pickle(tmp_path_factory):
+    path = tmp_path_factory.mktemp('arbgates') / 'arb_gates.pickle'
+    with open(path, 'wb') as f:
+        pickle.dump({'X': 1, 'Y': 1, 'U': 1, 'V': 1, 'G': 1}, f)
+    return str(path)
+
+
+@pytest.mark.parametrize('use_ir', [True, False], ids=['program_ir', 'gt_seqs'])
+def test_matches_string_implementation(golden, arbgate_pickle, use_ir):
+    for seed, expected in golden.items():
+        assert _run(int(seed), arbgate_pickle, use_ir) == expected, f"seed {seed}"
+
+
+def test_golden_cases_cover_compiled_programs(golden):
+    n_ok = sum('ct_idxs' in expected for expected in golden.values())
+    assert n_ok >= len(golden) // 2
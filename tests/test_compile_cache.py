@@ -0,0 +1,148 @@
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from silospin.quantum_compiler import compile_cache
+from silospin.quantum_compiler.compile_cache import CACHE_VERSION, CompileCache, compile_cache_key
+
+
+@pytest.fixture
+def gst_file(tmp_path):
+    path = tmp_path / 'gst.txt'
+    path.write_text('x y t40 xx\nmxxm z0.5z p\n')
+    return str(path)
+
+
+def _key(gst_file, **overrides):
+    args = {
+        'gate_parameters': {"rf": {1: {"i_amp": 0.5, "mod_freq": 6e7, "tau_pi": 80}}, "p": {3: {"p_amp": 0.2, "tau": 40}}},
+        'channel_mapping': {"hdawg1": {1: {"rf": 1, "core_idx": 1}, 2: {"rf": 0, "core_idx": 2}}},
+        'added_padding': 0,
+        'n_inner': 1,
+        'n_outer': 1,
+        'arbgate_picklefile_location': None,
+        'device_ids': ['dev8446'],
+    }
+    args.update(overrides)
+    return compile_cache_key(gst_file, **args)
+
+
+def test_key_is_stable(gst_file, tmp_path):
+    key = _key(gst_file)
+    assert key == _key(gst_file)
+    # Dict order, numpy scalars and the file location do not matter, the file contents do
+    assert key == _key(gst_file, gate_parameters={"p": {3: {"tau": 40, "p_amp": np.float64(0.2)}},
+                                                  "rf": {1: {"tau_pi": 80, "mod_freq": 6e7, "i_amp": 0.5}}})
+    copy = tmp_path / 'copy.txt'
+    shutil.copy(gst_file, copy)
+    assert key == _key(str(copy))
+
+
+@pytest.mark.parametrize('override', [
+    {'gate_parameters': {"rf": {1: {"i_amp": 0.6, "mod_freq": 6e7, "tau_pi": 80}}, "p": {3: {"p_amp": 0.2, "tau": 40}}}},
+    {'added_padding': 2},
+    {'n_inner': 2},
+    {'n_outer': 3},
+    {'device_ids': ['dev8447']},
+    {'channel_mapping': {"hdawg1": {1: {"rf": 1, "core_idx": 1}}}},
+])
+def test_key_changes_with_inputs(gst_file, override):
+    assert _key(gst_file, **override) != _key(gst_file)
+
+
+def test_key_changes_with_file_contents(gst_file):
+    key = _key(gst_file)
+    with open(gst_file, 'a') as f:
+        f.write('yyy\n')
+    assert _key(gst_file) != key
+
+
+def test_key_includes_zhinst_version(gst_file, monkeypatch):
+    monkeypatch.setattr(compile_cache, 'ZHINST_VERSION', '23.06.0')
+    key = _key(gst_file)
+    assert _key(gst_file) == key
+    monkeypatch.setattr(compile_cache, 'ZHINST_VERSION', '24.01.0')
+    assert _key(gst_file) != key
+
+
+def _artifacts(n_bytes=1000):
+    return {"elf": {"hdawg1": {1: b"\0" * n_bytes}}, "command_tables": {"hdawg1": {1: {"table": []}}}}
+
+
+def test_store_and_load(tmp_path):
+    cache = CompileCache(tmp_path / 'cache')
+    assert cache.load('a') is None
+    cache.store('a', _artifacts())
+    assert cache.load('a') == _artifacts()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def _set_last_use(cache, key, t):
+    os.utime(cache._path(key), (t, t))
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = CompileCache(tmp_path, max_bytes=None)
+    size = cache.store('a', _artifacts())
+    cache.store('b', _artifacts())
+    cache.store('c', _artifacts())
+    now = time.time()
+    _set_last_use(cache, 'a', now - 30)
+    _set_last_use(cache, 'b', now - 20)
+    _set_last_use(cache, 'c', now - 10)
+    cache.load('a')  # most recently used now
+
+    cache.max_bytes = 2 * size
+    assert cache.evict() == 1
+    assert cache.load('b') is None
+    assert cache.load('a') is not None and cache.load('c') is not None
+
+
+def test_store_keeps_new_entry_over_budget(tmp_path):
+    cache = CompileCache(tmp_path, max_bytes=10)
+    cache.store('a', _artifacts())
+    cache.store('b', _artifacts())
+    assert [os.path.basename(path) for path, _, _ in cache.entries()] == ['b.gstc']
+
+
+def test_age_eviction(tmp_path):
+    cache = CompileCache(tmp_path, max_age=60)
+    cache.store('old', _artifacts())
+    cache.store('new', _artifacts())
+    _set_last_use(cache, 'old', time.time() - 120)
+    assert cache.evict() == 1
+    assert cache.load('old') is None
+    assert cache.load('new') is not None
+
+
+@pytest.mark.parametrize('contents', [b'', b'not a pickle', pickle.dumps({'version': CACHE_VERSION, 'artifacts': 1})[:-5]])
+def test_corrupt_entry_is_discarded(tmp_path, contents):
+    cache = CompileCache(tmp_path)
+    with open(cache._path('a'), 'wb') as f:
+        f.write(contents)
+    assert cache.load('a') is None
+    assert not os.path.exists(cache._path('a'))
+    assert cache.misses == 1
+    # The key can be stored and loaded again
+    cache.store('a', _artifacts())
+    assert cache.load('a') == _artifacts()
+
+
+def test_entry_of_other_cache_version_is_a_miss(tmp_path):
+    cache = CompileCache(tmp_path)
+    with open(cache._path('a'), 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION - 1, 'artifacts': _artifacts()}, f)
+    assert cache.load('a') is None
+    assert cache.misses == 1
+
+
+def test_clear(tmp_path):
+    cache = CompileCache(tmp_path)
+    cache.store('a', _artifacts())
+    cache.store('b', _artifacts())
+    cache.clear()
+    assert cache.entries() == []
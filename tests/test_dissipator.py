@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import scipy.linalg
+
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+def _random(d, B, rng, hermitian=False):
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    if hermitian:
+        X = 0.5 * (X + X.conj().transpose(1, 0, 2))
+    return np.asfortranarray(X)
+
+
+def _integrator(d, B, n_ops, precision='double', dissipator='euler', seed=0):
+    rng = np.random.default_rng(seed)
+    collapse_ops = [(_random(d, B, rng), rng.uniform(0.05, 1.0, size=B)) for _ in range(n_ops)]
+
+    def H_callback(ti, B, out):
+        out[...] = 0.0
+
+    integrator = StrangSplitIntegrator(H_callback, collapse_ops, B, d, _TemplateState(), xp=np,
+                                       precision=precision, dissipator=dissipator)
+    rho = _random(d, B, rng, hermitian=True).astype(integrator.dtype)
+    return integrator, collapse_ops, rho
+
+
+def _reference_dissipator(collapse_ops, rho):
+    out = np.zeros_like(rho, dtype=np.complex128)
+    for L, rates in collapse_ops:
+        for b in range(rho.shape[2]):
+            l, r = L[:, :, b], rho[:, :, b]
+            LdL = l.conj().T @ l
+            out[:, :, b] += rates[b] * (l @ r @ l.conj().T - 0.5 * (LdL @ r + r @ LdL))
+    return out
+
+
+@pytest.mark.parametrize('n_ops', [1, 2, 5])
+@pytest.mark.parametrize('d', [2, 5])
+def test_fused_matches_loop(d, n_ops):
+    integrator, collapse_ops, rho = _integrator(d, 7, n_ops)
+    fused = np.zeros_like(rho, order='F')
+    looped = np.zeros_like(rho, order='F')
+    integrator._compute_dissipator_action(rho, fused)
+    integrator._compute_dissipator_action_loop(rho, looped)
+    np.testing.assert_allclose(fused, looped, atol=1e-13)
+    np.testing.assert_allclose(fused, _reference_dissipator(collapse_ops, rho), atol=1e-13)
+
+
+def test_fused_matches_loop_single_precision():
+    integrator, collapse_ops, rho = _integrator(4, 6, 3, precision='single')
+    fused = np.zeros_like(rho, order='F')
+    looped = np.zeros_like(rho, order='F')
+    integrator._compute_dissipator_action(rho, fused)
+    integrator._compute_dissipator_action_loop(rho, looped)
+    assert fused.dtype == np.complex64
+    np.testing.assert_allclose(fused, looped, rtol=1e-5, atol=1e-5 * np.abs(looped).max())
+
+
+def test_exact_dissipator_step_matches_liouvillian_expm():
+    d, B, tau = 3, 4, 0.3
+    integrator, collapse_ops, rho = _integrator(d, B, 2, dissipator='exact')
+    expected = np.empty_like(rho)
+    for b in range(B):
+        # Column-stacked superoperator of L_D for element b
+        S = np.zeros((d * d, d * d), dtype=complex)
+        for col in range(d * d):
+            E = np.zeros((d, d, 1), dtype=complex)
+            E[col % d, col // d, 0] = 1.0
+            S[:, col] = _reference_dissipator([(L[:, :, b:b+1], rates[b:b+1]) for L, rates in collapse_ops], E)[:, :, 0].reshape(-1, order='F')
+        expected[:, :, b] = (scipy.linalg.expm(S * tau) @ rho[:, :, b].reshape(-1, order='F')).reshape(d, d, order='F')
+    stepped = rho.copy(order='F')
+    integrator._dissipator_step(stepped, tau)
+    np.testing.assert_allclose(stepped, expected, atol=1e-12)
@@ -0,0 +1,93 @@
+"""
+Array allocations per BatchedExpmWorkspace.compute call.
+
+After a warm-up call, compute() with scaling='global' must not allocate any
+array memory, for every Padé degree (norms picked from the theta_m table),
+with and without squaring, in all precisions. On NumPy this is the
+tracemalloc peak during one call: an array temporary shows up as a peak
+that grows with the batch size, what remains is a few hundred bytes of
+Python objects. On CuPy no memory pool malloc may happen.
+"""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from silospin.batched_expm import BatchedExpmWorkspace, HAS_CUPY, _PRECISIONS, _candidate_orders, _theta_table
+
+if HAS_CUPY:
+    import cupy as cp
+    from cupy.cuda.memory_hook import MemoryHook
+
+    class _MallocCounter(MemoryHook):
+        name = 'MallocCounter'
+
+        def __init__(self):
+            self.count = 0
+
+        def malloc_preprocess(self, device_id, size, mem_size):
+            self.count += 1
+
+# Python-object overhead allowed per NumPy call (bytes, independent of B)
+_NUMPY_SLACK = 16 << 10
+
+_D = 6
+_B = 2048
+
+
+def _make_batch(d, B, norm, seed=0):
+    """A = -i H, every element scaled to ||A||_1 = norm, layout [d, d, B]."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(B, d, d)) + 1j * rng.normal(size=(B, d, d))
+    H = 0.5 * (X + X.conj().transpose(0, 2, 1))
+    H /= np.abs(H).sum(axis=1).max(axis=1)[:, None, None]
+    return np.ascontiguousarray((-1j * norm * H).transpose(1, 2, 0))
+
+
+def _cases():
+    """(precision, 1-norm) per Padé degree, plus one that needs squaring."""
+    out = []
+    for precision in _PRECISIONS:
+        theta = _theta_table(precision)
+        orders = _candidate_orders('adaptive', precision)
+        out += [pytest.param(precision, 0.9 * theta[m], id=f"{precision}-m{m}") for m in orders]
+        out.append(pytest.param(precision, 12.0 * theta[orders[-1]], id=f"{precision}-m{orders[-1]}-s4"))
+    return out
+
+
+def _numpy_peak(B, precision, norm):
+    """Peak traced bytes above the baseline during one (warm) compute call."""
+    ws = BatchedExpmWorkspace(_D, B, xp=np, scaling='global', precision=precision)
+    A = _make_batch(_D, B, norm)
+    ws.compute(A)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        ws.compute(A)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('precision, norm', _cases())
+def test_numpy_compute_does_not_allocate(precision, norm):
+    peak = _numpy_peak(_B, precision, norm)
+    peak_small = _numpy_peak(_B // 8, precision, norm)
+    assert peak < _NUMPY_SLACK
+    # Peak must not scale with the batch size
+    assert peak - peak_small < _NUMPY_SLACK
+
+
+@pytest.mark.skipif(not HAS_CUPY, reason="CuPy not available")
+@pytest.mark.parametrize('precision, norm', _cases())
+def test_cupy_compute_does_not_allocate(precision, norm):
+    ws = BatchedExpmWorkspace(_D, _B, xp=cp, scaling='global', precision=precision)
+    A = cp.asarray(_make_batch(_D, _B, norm))
+    ws.compute(A)
+    cp.cuda.Stream.null.synchronize()
+    counter = _MallocCounter()
+    with counter:
+        ws.compute(A)
+        cp.cuda.Stream.null.synchronize()
+    assert counter.count == 0
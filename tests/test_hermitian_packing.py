@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from silospin.hermitian_packing import pack_hermitian, packed_dim, split_packed, unpack_hermitian
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+def _hermitian(shape, d, dtype=np.complex128, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=shape + (d, d)) + 1j * rng.normal(size=shape + (d, d))
+    return (0.5 * (X + np.swapaxes(X, -1, -2).conj())).astype(dtype)
+
+
+@pytest.mark.parametrize('dtype, real_dtype', [(np.complex128, np.float64), (np.complex64, np.float32)])
+@pytest.mark.parametrize('shape', [(), (7,), (3, 4)])
+@pytest.mark.parametrize('d', [1, 2, 5])
+def test_round_trip(d, shape, dtype, real_dtype):
+    rho = _hermitian(shape, d, dtype)
+    packed = pack_hermitian(rho)
+    assert packed.shape == shape + (d * d,) and packed.dtype == real_dtype
+    unpacked = unpack_hermitian(packed)
+    assert unpacked.dtype == dtype
+    np.testing.assert_array_equal(unpacked, rho)
+
+
+def test_layout():
+    rho = np.array([[1.0, 2 + 3j, 4 - 5j], [2 - 3j, 6.0, 7 + 8j], [4 + 5j, 7 - 8j, 9.0]])
+    packed = pack_hermitian(rho)
+    diag, re, im = split_packed(packed)
+    np.testing.assert_array_equal(diag, [1, 6, 9])
+    np.testing.assert_array_equal(re, [2, 4, 7])
+    np.testing.assert_array_equal(im, [3, -5, 8])
+
+
+def test_out_arguments():
+    rho = _hermitian((6,), 3)
+    buffer = np.full((2, 6, 9), np.nan)
+    pack_hermitian(rho, out=buffer[1])
+    assert np.isnan(buffer[0]).all()
+    out = np.empty((6, 3, 3), dtype=complex)
+    assert unpack_hermitian(buffer[1], out=out) is out
+    np.testing.assert_array_equal(out, rho)
+
+
+def test_packed_dim_rejects_non_square_lengths():
+    assert packed_dim(16) == 4
+    with pytest.raises(ValueError):
+        packed_dim(10)
+
+
+def test_packed_integration_matches_full():
+    d, B = 3, 4
+    H0 = _hermitian((B,), d, seed=1).transpose(1, 2, 0)
+
+    def H_callback(ti, B, out):
+        out[...] = H0
+
+    L = np.zeros((d, d, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((d, d, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    results = {}
+    for storage in ('full', 'packed'):
+        integrator = StrangSplitIntegrator(H_callback, [(L, np.full(B, 0.2))], B, d, _TemplateState(), xp=np,
+                                           storage=storage)
+        results[storage] = np.asarray(integrator.integrate(1.0, 21, rho0))
+    assert results['packed'].shape == (21, B, d * d) and results['packed'].dtype == np.float64
+    full = results['full'].reshape(21, B, d, d)
+    np.testing.assert_allclose(unpack_hermitian(results['packed']), full, atol=1e-15)
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+def _pulse_problem(width, start=100, Nt=257, T=1.0, B=4):
+    """Resonant pi pulse of `width` grid cells inside an idle stretch, rho0 = |0><0|."""
+    dt = T / (Nt - 1)
+    sx = np.array([[0, 1], [1, 0]], dtype=complex)
+    drive = (0.5 / (width * dt)) * 0.5 * sx
+
+    def H_callback(ti, B, out):
+        out[...] = (drive if start <= ti < start + width else 0 * sx)[:, :, None]
+
+    L = np.zeros((2, 2, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((2, 2, B), dtype=complex, order='F')
+    rho0[0, 0, :] = 1.0
+    return H_callback, [(L, np.full(B, 1e-3))], rho0
+
+
+@pytest.mark.parametrize('dissipator', ['euler', 'exact'])
+@pytest.mark.parametrize('width', [4, 16, 20, 30, 40])
+def test_short_pulse_matches_uniform(width, dissipator):
+    H_callback, collapse_ops, rho0 = _pulse_problem(width)
+    results = []
+    for adaptive in (False, True):
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, 4, 2, _TemplateState(),
+                                           xp=np, dissipator=dissipator)
+        run = integrator.integrate_adaptive if adaptive else integrator.integrate
+        results.append(np.asarray(run(1.0, 257, rho0)))
+    uniform, adaptive = results
+    assert uniform[-1, 0, 3].real > 0.99
+    np.testing.assert_allclose(adaptive[-1], uniform[-1], atol=1e-4)
+    assert integrator.adaptive_stats['accepted'] < 256
+
+
+class _RecordingDict(OrderedDict):
+    """OrderedDict that records every key inserted."""
+
+    def __init__(self):
+        super().__init__()
+        self.inserted = []
+
+    def __setitem__(self, key, value):
+        self.inserted.append(key)
+        super().__setitem__(key, value)
+
+
+def test_exact_dissipator_cache_holds_every_level():
+    H_callback, collapse_ops, rho0 = _pulse_problem(40)
+    integrator = StrangSplitIntegrator(H_callback, collapse_ops, 4, 2, _TemplateState(),
+                                       xp=np, dissipator='exact')
+    integrator._dissipator_props = _RecordingDict()
+    integrator.integrate_adaptive(1.0, 257, rho0)
+    # Each half-step exponential is computed once, not once per revisit of its level
+    taus = integrator._dissipator_props.inserted
+    assert len(taus) == len(set(taus))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+_SX = np.array([[0, 1], [1, 0]], dtype=complex)
+_SZ = np.array([[1, 0], [0, -1]], dtype=complex)
+_V = 0.5 * _SZ
+_OMEGA = 3.0
+_T = 2.0
+_B = 2
+
+
+def _commutator(A, rho):
+    return np.einsum('ij,jkb->ikb', A, rho) - np.einsum('ijb,jk->ikb', rho, A)
+
+
+class _TimeDependentJ:
+    """J(t)[rho] = -i cos(omega t) [V, rho]."""
+
+    def compute_action(self, t, dummy, rho, out):
+        out[...] = -1j * np.cos(_OMEGA * t) * _commutator(_V, rho)
+
+
+def _problem():
+    H0 = np.stack([0.7 * _SX + 0.3 * _SZ, 1.1 * _SX - 0.2 * _SZ], axis=2)
+
+    def H_callback(ti, B, out):
+        out[...] = H0
+
+    L = np.zeros((2, 2, _B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rates = np.array([0.3, 0.5])
+    rho0 = np.zeros((2, 2, _B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    rho0[0, 1, :] = rho0[1, 0, :] = 0.2
+    return H0, H_callback, L, rates, rho0
+
+
+def _reference_drho(H0, L, rates, rho0):
+    """drho(T) [B, d, d] of the coupled TME from a tight-tolerance ODE solve."""
+    def liouvillian(r, b):
+        H, l = H0[:, :, b], L[:, :, b]
+        LdL = l.conj().T @ l
+        return (-2j * np.pi * (H @ r - r @ H)
+                + rates[b] * (l @ r @ l.conj().T - 0.5 * (LdL @ r + r @ LdL)))
+
+    def rhs(t, y):
+        y = y.view(complex).reshape(2, 2, 2, _B)
+        out = np.empty_like(y)
+        source = -1j * np.cos(_OMEGA * t) * _commutator(_V, y[0])
+        for b in range(_B):
+            out[0, :, :, b] = liouvillian(y[0, :, :, b], b)
+            out[1, :, :, b] = liouvillian(y[1, :, :, b], b) + source[:, :, b]
+        return out.reshape(-1).view(float)
+
+    y0 = np.stack([rho0, np.zeros_like(rho0)]).reshape(-1).view(float)
+    sol = solve_ivp(rhs, (0.0, _T), y0, rtol=1e-12, atol=1e-12)
+    return sol.y[:, -1].view(complex).reshape(2, 2, 2, _B)[1].transpose(2, 0, 1)
+
+
+@pytest.mark.parametrize('scheme, order', [('strang', 2), ('yoshida4', 4)])
+def test_time_dependent_source_convergence(scheme, order):
+    H0, H_callback, L, rates, rho0 = _problem()
+    reference = _reference_drho(H0, L, rates, rho0)
+    errors = []
+    for Nt in (41, 81):
+        integrator = StrangSplitIntegrator(H_callback, [(L, rates)], _B, 2, _TemplateState(),
+                                           xp=np, dissipator='exact', scheme=scheme)
+        out = np.asarray(integrator.integrate_tme(_T, Nt, rho0, _TimeDependentJ()))
+        drho = out[-1, :, 4:].reshape(_B, 2, 2)
+        errors.append(np.abs(drho - reference).max())
+    assert errors[1] < 1e-3
+    assert np.log2(errors[0] / errors[1]) > order - 0.2
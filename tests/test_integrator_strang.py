@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+import scipy.linalg
+
+from silospin.integrator_strang import StrangSplitIntegrator
+from silospin.trajectory_writer import TrajectoryFileWriter
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+class _HCallback:
+    """H(ti) = H0 (1 + slope ti)."""
+
+    def __init__(self, H0, slope=0.02):
+        self.H0 = H0
+        self.slope = slope
+
+    def __call__(self, ti, B, out):
+        out[...] = self.H0 * (1.0 + self.slope * ti)
+
+
+def _problem(d=3, B=4):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    H0 = np.asfortranarray(0.5 * (X + X.conj().transpose(1, 0, 2)))
+    L = np.zeros((d, d, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((d, d, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    return H0, [(L, np.linspace(0.05, 0.3, B))], rho0
+
+
+def _integrator(H0, collapse_ops, **kwargs):
+    d, _, B = H0.shape
+    return StrangSplitIntegrator(_HCallback(H0), collapse_ops, B, d, _TemplateState(), xp=np, **kwargs)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 30, 500])
+def test_chunk_size_does_not_change_result(chunk_size):
+    H0, collapse_ops, rho0 = _problem()
+    expected = _integrator(H0, collapse_ops).integrate(1.0, 31, rho0, chunk_size=31).numpy()
+    result = _integrator(H0, collapse_ops).integrate(1.0, 31, rho0, chunk_size=chunk_size).numpy()
+    assert result.shape == (31, 4, 9)
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('stride', [1, 4])
+def test_observables_match_full_trajectory(stride):
+    H0, collapse_ops, rho0 = _problem()
+    d, _, B = H0.shape
+    Nt = 29
+    full = _integrator(H0, collapse_ops).integrate(1.0, Nt, rho0).numpy().reshape(Nt, B, d, d)
+    shared = np.diag([1.0, 0.0, -1.0]).astype(complex)
+    per_element = H0
+    recorded = []
+    times, values = _integrator(H0, collapse_ops).integrate_observables(
+        1.0, Nt, rho0, observables=[shared, per_element], stride=stride,
+        callback=lambda ti, t, rho: recorded.append(ti))
+
+    rec = np.arange(0, Nt, stride)
+    np.testing.assert_allclose(times, rec / (Nt - 1))
+    assert recorded == list(rec)
+    assert values.shape == (len(rec), B, 2)
+    expected = np.stack([np.einsum('ij,tbji->tb', shared, full[rec]),
+                         np.einsum('ijb,tbji->tb', per_element, full[rec])], axis=2)
+    np.testing.assert_allclose(values.numpy(), expected, atol=1e-13)
+
+
+def test_observables_without_observables():
+    H0, collapse_ops, rho0 = _problem()
+    times, values = _integrator(H0, collapse_ops).integrate_observables(1.0, 11, rho0, stride=5)
+    np.testing.assert_allclose(times, [0.0, 0.5, 1.0])
+    assert values is None
+
+
+@pytest.mark.parametrize('options', [{}, {'storage': 'packed'}, {'precision': 'single'}])
+def test_trajectory_file_matches_in_memory(tmp_path, options):
+    H0, collapse_ops, rho0 = _problem()
+    expected = _integrator(H0, collapse_ops, **options).integrate(1.0, 23, rho0).numpy()
+    path = tmp_path / 'traj.npy'
+    result = _integrator(H0, collapse_ops, **options).integrate(1.0, 23, rho0, chunk_size=5,
+                                                                trajectory_path=str(path))
+    assert isinstance(result, np.memmap) and not result.flags.writeable
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(np.load(path), expected)
+
+
+def test_trajectory_writer_blocks_land_at_their_offsets(tmp_path):
+    path = tmp_path / 'traj.npy'
+    writer = TrajectoryFileWriter(path, (6, 2), dtype=np.float64, max_pending=1)
+    for start in (4, 0, 2):
+        writer.write(start, np.full((2, 2), float(start)))
+    result = writer.close()
+    np.testing.assert_array_equal(result[:, 0], [0, 0, 2, 2, 4, 4])
+    with pytest.raises(ValueError):
+        TrajectoryFileWriter(path, (5, 2), dtype=np.float64, mode='r+')
+
+
+def _liouvillian_reference(H0, collapse_ops, rho0, T):
+    """rho(T) for constant H0 from expm of the column-stacked Liouvillian."""
+    d, _, B = H0.shape
+    eye = np.eye(d)
+    out = np.empty_like(rho0)
+    for b in range(B):
+        H = 2.0 * np.pi * H0[:, :, b]
+        S = -1j * (np.kron(eye, H) - np.kron(H.T, eye))
+        for L, rates in collapse_ops:
+            l = L[:, :, b]
+            LdL = l.conj().T @ l
+            S += rates[b] * (np.kron(l.conj(), l) - 0.5 * np.kron(eye, LdL) - 0.5 * np.kron(LdL.T, eye))
+        out[:, :, b] = (scipy.linalg.expm(S * T) @ rho0[:, :, b].reshape(-1, order='F')).reshape(d, d, order='F')
+    return out
+
+
+@pytest.mark.parametrize('scheme, order', [('strang', 2), ('yoshida4', 4)])
+def test_splitting_convergence_order(scheme, order):
+    H0, collapse_ops, rho0 = _problem()
+    H0 = 0.3 * H0
+    collapse_ops = [(L, 3.0 * rates) for L, rates in collapse_ops]
+    reference = _liouvillian_reference(H0, collapse_ops, rho0, 1.0)
+    errors = []
+    for Nt in (11, 21):
+        integrator = StrangSplitIntegrator(_HCallback(H0, slope=0.0), collapse_ops, 4, 3, _TemplateState(),
+                                           xp=np, dissipator='exact', scheme=scheme)
+        final = integrator.integrate(1.0, Nt, rho0).numpy()[-1].reshape(4, 3, 3)
+        errors.append(np.abs(final - reference.transpose(2, 0, 1)).max())
+    assert np.log2(errors[0] / errors[1]) > order - 0.2
+
+
+@pytest.mark.parametrize('propagator', ['pade', 'eigh', 'chebyshev'])
+def test_stacked_conjugation_matches_per_state(propagator):
+    H0, collapse_ops, _ = _problem()
+    d, _, B = H0.shape
+    integrator = _integrator(H0, collapse_ops, propagator=propagator)
+    integrator._fill_propagator(3, 0.05)
+    U = scipy.linalg.expm(-2j * np.pi * 0.05 * (H0 * 1.06).transpose(2, 0, 1)).transpose(1, 2, 0)
+
+    rng = np.random.default_rng(1)
+    X = np.asfortranarray(rng.normal(size=(d, d, B, 2)) + 1j * rng.normal(size=(d, d, B, 2)))
+    stacked = X.copy(order='F')
+    integrator._hamiltonian_step(stacked, tmp=np.empty_like(stacked, order='F'))
+    for p in range(2):
+        single = X[..., p].copy(order='F')
+        integrator._hamiltonian_step(single)
+        np.testing.assert_allclose(stacked[..., p], single, atol=1e-14)
+        np.testing.assert_allclose(single, np.einsum('ijb,jkb,lkb->ilb', U, X[..., p], U.conj()), atol=1e-11)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from silospin.quantum_compiler.program_diff import changed_command_table_entries, changed_waveforms
+
+
+def _table(n_entries):
+    """Command table dict (CommandTable.as_dict layout) with n_entries entries."""
+    return {'header': {'version': '0.2'},
+            'table': [{'index': idx, 'waveform': {'index': idx}, 'phase0': {'value': 45.0 * idx, 'increment': idx % 2 == 1}}
+                      for idx in range(n_entries)]}
+
+
+def test_changed_waveforms():
+    old = {0: np.zeros(4), 1: np.ones(4), 2: np.arange(4.0)}
+    new = {0: np.zeros(4), 1: 2 * np.ones(4), 2: np.arange(4.0), 3: np.ones(2)}
+    assert changed_waveforms(old, new) == [1, 3]
+    assert changed_waveforms(old, old) == []
+    assert changed_waveforms(old, {}) == []
+    # A length change is a change
+    assert changed_waveforms({0: np.zeros(4)}, {0: np.zeros(5)}) == [0]
+
+
+def test_changed_command_table_entries():
+    old = _table(4)
+    new = _table(5)
+    new['table'][2]['phase0']['value'] = 10.0
+    assert changed_command_table_entries(old, new) == [2, 4]
+    assert changed_command_table_entries(new, old) == [2, 4]
+    assert changed_command_table_entries(old, _table(4)) == []
+    assert changed_command_table_entries({}, old) == [0, 1, 2, 3]
+
+
+def test_changed_command_table_entries_ignores_entry_order():
+    old = _table(3)
+    new = _table(3)
+    new['table'].reverse()
+    assert changed_command_table_entries(old, new) == []
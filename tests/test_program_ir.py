@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from silospin.quantum_compiler.program_ir import ProgramIR, GATE_KINDS
+
+
+def _sequence_table():
+    return {
+        1: {'rf': {1: ['x', 't40', '0.5*X[10&0]', 'z0.5z'], 2: ['y', 'xx', 't40', 'z0z']},
+            'plunger': {3: ['p', 't40', 't27', 'z0z']}},
+        2: {'rf': {1: ['mxxm', 'yyy'], 2: ['1*V[]', 't500']},
+            'plunger': {3: ['0.4*G[1&2]', 'p']}},
+        4: {'rf': {1: [], 2: []}, 'plunger': {3: []}},
+    }
+
+
+def test_sequence_table_round_trip():
+    table = _sequence_table()
+    ir = ProgramIR.from_sequence_table(table)
+    assert ir.sequence_table() == table
+    assert ir.channels == [('rf', 1), ('rf', 2), ('plunger', 3)]
+    assert ir.lines.tolist() == [1, 2, 4]
+
+
+def test_save_load_round_trip(tmp_path):
+    ir = ProgramIR.from_sequence_table(_sequence_table())
+    path = tmp_path / 'program.npz'
+    ir.save(path)
+    loaded = ProgramIR.load(path)
+
+    assert loaded.sequence_table() == ir.sequence_table()
+    assert loaded.channels == ir.channels
+    for name in ('lines', 'gates', 'kinds', 'durations', 'opcodes', 'starts', 'lengths',
+                 'arb_opcodes', 'arb_labels', 'arb_amps', 'arb_value_offsets', 'arb_values'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(ir, name), err_msg=name)
+
+
+def test_gate_table():
+    ir = ProgramIR.from_sequence_table(_sequence_table())
+    gates = ir.gates.tolist()
+    assert len(gates) == len(set(gates))
+    assert GATE_KINDS[ir.kinds[gates.index('x')]] == 'pi_2'
+    assert GATE_KINDS[ir.kinds[gates.index('xx')]] == 'pi'
+    assert GATE_KINDS[ir.kinds[gates.index('p')]] == 'plunger'
+    assert ir.durations[gates.index('t500')] == 500
+    assert ir.durations[gates.index('x')] == -1
+    assert ir.arb_gate(gates.index('0.5*X[10&0]')) == ('X', 0.5, (10.0, 0.0))
+    assert ir.arb_gate(gates.index('1*V[]')) == ('V', 1.0, ())
+    with pytest.raises(ValueError):
+        ir.arb_gate(gates.index('x'))
+
+
+def test_line_table():
+    ir = ProgramIR.from_sequence_table(_sequence_table())
+    ops = ir.line_table(2)
+    assert ops.shape == (3, 2)
+    assert [[str(ir.gates[op]) for op in row] for row in ops] == [['mxxm', 'yyy'], ['1*V[]', 't500'], ['0.4*G[1&2]', 'p']]
+
+    table = _sequence_table()
+    table[1]['rf'][2].append('x')
+    with pytest.raises(ValueError):
+        ProgramIR.from_sequence_table(table).line_table(1)
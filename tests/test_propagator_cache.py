@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from silospin.batched_expm import HAS_CUPY
+from silospin.integrator_strang import PropagatorCache, StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+def _pair(value, n=4):
+    U = np.full(n, value, dtype=np.complex128)
+    return U, U.conj()
+
+
+def test_lru_eviction_and_counters():
+    entry_bytes = 2 * _pair(0)[0].nbytes
+    cache = PropagatorCache(2 * entry_bytes)
+    cache.put('a', *_pair(1))
+    cache.put('b', *_pair(2))
+    assert cache.get('a')[0][0] == 1   # 'a' becomes most recently used
+    assert cache.get('missing') is None
+    cache.put('c', *_pair(3))            # evicts 'b'
+
+    assert cache.get('b') is None
+    assert cache.get('c')[0][0] == 3
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'evictions': 1, 'entries': 2,
+                             'nbytes': 2 * entry_bytes}
+
+    # Re-putting a key replaces it without double counting
+    cache.put('c', *_pair(4))
+    assert cache.get('c')[0][0] == 4
+    assert cache.nbytes == 2 * entry_bytes and len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_put_stores_copies_and_skips_oversized_entries():
+    U, Udag = _pair(1)
+    cache = PropagatorCache(2 * U.nbytes)
+    cache.put('a', U, Udag)
+    U[:] = 7
+    assert cache.get('a')[0][0] == 1
+
+    cache.put('big', *_pair(1, n=64))
+    assert 'big' not in cache._entries
+    assert cache.evictions == 0
+
+    cache.put('u_only', U, None)
+    assert cache.get('u_only')[1] is None
+
+
+def _piecewise_problem(B=3, d=3, Nt=61):
+    """Three H segments of 20 steps each: idle, drive, idle."""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    H_drive = 0.5 * (X + X.conj().transpose(1, 0, 2))
+
+    def H_callback(ti, B, out):
+        out[...] = H_drive if 20 <= ti < 40 else 0.1 * H_drive
+
+    def segment_callback(ti):
+        return 'drive' if 20 <= ti < 40 else 'idle'
+
+    L = np.zeros((d, d, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((d, d, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    return H_callback, segment_callback, [(L, np.full(B, 0.05))], rho0
+
+
+@pytest.mark.parametrize('propagator', ['pade', 'eigh'])
+@pytest.mark.parametrize('keyed_by', ['segment', 'hash'])
+def test_cached_integration_matches_uncached(propagator, keyed_by):
+    H_callback, segment_callback, collapse_ops, rho0 = _piecewise_problem()
+    reference = StrangSplitIntegrator(H_callback, collapse_ops, 3, 3, _TemplateState(), xp=np,
+                                      propagator=propagator)
+    expected = np.asarray(reference.integrate(1.0, 61, rho0))
+
+    integrator = StrangSplitIntegrator(H_callback, collapse_ops, 3, 3, _TemplateState(), xp=np,
+                                       propagator=propagator, cache_bytes=1 << 20,
+                                       segment_callback=segment_callback if keyed_by == 'segment' else None)
+    result = np.asarray(integrator.integrate(1.0, 61, rho0))
+    np.testing.assert_array_equal(result, expected)
+    stats = integrator.propagator_cache.stats()
+    assert stats['misses'] == 2 and stats['hits'] == 58
+
+
+@pytest.mark.skipif(not HAS_CUPY, reason="CuPy not available")
+def test_cupy_cache_requires_segment_callback():
+    import cupy as cp
+    H_callback, segment_callback, collapse_ops, rho0 = _piecewise_problem()
+    collapse_ops = [(cp.asarray(L), cp.asarray(rates)) for L, rates in collapse_ops]
+    with pytest.raises(ValueError):
+        StrangSplitIntegrator(H_callback, collapse_ops, 3, 3, _TemplateState(), xp=cp, cache_bytes=1 << 20)
+    StrangSplitIntegrator(H_callback, collapse_ops, 3, 3, _TemplateState(), xp=cp, cache_bytes=1 << 20,
+                          segment_callback=segment_callback)
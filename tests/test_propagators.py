@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import scipy.linalg
+import scipy.special
+
+from silospin.batched_expm import batched_expm_hermitian
+from silospin.chebyshev_propagator import ChebyshevPropagator, bessel_j_table, chebyshev_propagate
+from silospin.integrator_strang import StrangSplitIntegrator
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+def _hermitian(d, B, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(d, d, B)) + 1j * rng.normal(size=(d, d, B))
+    return np.asfortranarray(0.5 * (X + X.conj().transpose(1, 0, 2)))
+
+
+def _expm_reference(H, t):
+    return np.stack([scipy.linalg.expm(-1j * t * H[:, :, b]) for b in range(H.shape[2])], axis=2)
+
+
+@pytest.mark.parametrize('precision, atol', [('double', 1e-12), ('mixed', 1e-5), ('single', 1e-5)])
+@pytest.mark.parametrize('t', [1e-3, 0.5, 20.0])
+def test_hermitian_expm_matches_scipy(t, precision, atol):
+    H = _hermitian(6, 5)
+    np.testing.assert_allclose(batched_expm_hermitian(H, t, xp=np, precision=precision), _expm_reference(H, t), atol=atol)
+
+
+def test_bessel_table_matches_scipy():
+    a = np.array([0.0, 0.3, 4.0, 25.0])
+    table = bessel_j_table(60, a)
+    np.testing.assert_allclose(table, scipy.special.jv(np.arange(61)[:, None], a[None, :]), atol=1e-14)
+
+
+@pytest.mark.parametrize('theta', [1e-3, 0.7, -0.7, 12.0])
+def test_chebyshev_matches_dense_conjugation(theta):
+    d, B = 6, 5
+    H = _hermitian(d, B)
+    X = _hermitian(d, B, seed=1) + 1j * _hermitian(d, B, seed=2)
+    U = _expm_reference(H, theta)
+    expected = np.einsum('ijb,jkb,lkb->ilb', U, X, U.conj())
+    np.testing.assert_allclose(chebyshev_propagate(H, X, theta, xp=np), expected, atol=1e-11)
+
+
+def test_chebyshev_applies_to_stacks():
+    d, B = 5, 3
+    H = _hermitian(d, B)
+    X = np.asfortranarray(np.stack([_hermitian(d, B, seed=s) for s in (1, 2)], axis=3))
+    prop = ChebyshevPropagator(d, B, xp=np)
+    prop.set(H, 0.4)
+    stacked = prop.apply(X.copy(order='F'))
+    for p in range(2):
+        np.testing.assert_allclose(stacked[..., p], chebyshev_propagate(H, X[..., p], 0.4, xp=np), atol=1e-13)
+
+
+def _problem(d=4, B=3):
+    H0 = _hermitian(d, B, seed=3)
+
+    def H_callback(ti, B, out):
+        out[...] = H0 * (1.0 + 0.01 * ti)
+
+    L = np.zeros((d, d, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rho0 = np.zeros((d, d, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    return H_callback, [(L, np.full(B, 0.1))], rho0
+
+
+@pytest.mark.parametrize('dissipator', ['euler', 'exact'])
+def test_propagators_agree(dissipator):
+    H_callback, collapse_ops, rho0 = _problem()
+    results = {}
+    for propagator in ('pade', 'eigh', 'chebyshev'):
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, 3, 4, _TemplateState(), xp=np,
+                                           propagator=propagator, dissipator=dissipator)
+        results[propagator] = np.asarray(integrator.integrate(1.0, 51, rho0))
+    np.testing.assert_allclose(results['eigh'], results['pade'], atol=1e-11)
+    np.testing.assert_allclose(results['chebyshev'], results['pade'], atol=1e-11)
+
+
+@pytest.mark.parametrize('propagator', ['pade', 'eigh', 'chebyshev'])
+def test_single_precision_propagators(propagator):
+    H_callback, collapse_ops, rho0 = _problem()
+    runs = {}
+    for precision in ('double', 'single'):
+        integrator = StrangSplitIntegrator(H_callback, collapse_ops, 3, 4, _TemplateState(), xp=np,
+                                           propagator=propagator, precision=precision)
+        runs[precision] = np.asarray(integrator.integrate(1.0, 51, rho0))
+    assert runs['single'].dtype == np.complex64
+    np.testing.assert_allclose(runs['single'], runs['double'], atol=1e-4)
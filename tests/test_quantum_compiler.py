@@ -0,0 +1,213 @@
+"""GateSetTomographyQuantumCompiler program loading, against mock HDAWGs (no hardware)."""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("zhinst.toolkit")
+pytest.importorskip("pandas")
+
+import zhinst.toolkit
+from zhinst.toolkit import CommandTable
+
+from silospin.quantum_compiler.program_ir import ProgramIR
+from silospin.quantum_compiler.quantum_compiler import GateSetTomographyQuantumCompiler
+
+_CT_SCHEMA_PATH = os.path.join(os.path.dirname(zhinst.toolkit.__file__), 'resources', 'ct_schema_hdawg.json')
+
+
+class _MockDaq:
+    def __init__(self):
+        self.calls = []
+
+    def set(self, settings):
+        self.calls.append(('set', list(settings)))
+
+    def setVector(self, path, value):
+        self.calls.append(('setVector', path, value))
+
+
+class _Node:
+    """Records calls made on one HDAWG node (elf.data, commandtable.upload_to_device)."""
+
+    def __init__(self, log, name):
+        self._log = log
+        self._name = name
+
+    def __call__(self, *args):
+        self._log.append((self._name, args))
+
+
+def _load_schema():
+    with open(_CT_SCHEMA_PATH) as f:
+        return json.load(f)
+
+
+class _MockCore:
+    """AWG core: compile_sequencer_program tracks how many compilations run at once."""
+
+    def __init__(self, state, log):
+        self._state = state
+        self.elf = type('Elf', (), {'data': _Node(log, 'elf')})()
+        self.commandtable = type('CommandTableNode', (), {'upload_to_device': _Node(log, 'commandtable'),
+                                                          'load_validation_schema': staticmethod(_load_schema)})()
+
+    def compile_sequencer_program(self, code, **kwargs):
+        with self._state['lock']:
+            self._state['running'] += 1
+            self._state['max_running'] = max(self._state['max_running'], self._state['running'])
+        time.sleep(0.01)
+        with self._state['lock']:
+            self._state['running'] -= 1
+        return ('elf:' + code).encode(), {'samplerate': kwargs.get('samplerate')}
+
+
+class _MockAwg:
+    def __init__(self, device_id, n_cores, state):
+        self.log = []
+        self._daq = _MockDaq()
+        self._connection_settings = {"hdawg_id": device_id}
+        self._hdawg = type('Hdawg', (), {})()
+        self._hdawg.awgs = [_MockCore(state, self.log) for _ in range(n_cores)]
+
+
+def _compiler(n_awgs=2, n_cores=4):
+    """Compiler with its program loading state set up by hand, and compiled artifacts for every core."""
+    state = {'lock': threading.Lock(), 'running': 0, 'max_running': 0}
+    qc = GateSetTomographyQuantumCompiler.__new__(GateSetTomographyQuantumCompiler)
+    qc._awgs = {f"hdawg{i+1}": _MockAwg(f"dev{8000+i}", n_cores, state) for i in range(n_awgs)}
+    qc._channel_mapping = {awg_idx: {core_idx: {} for core_idx in range(1, n_cores + 1)} for awg_idx in qc._awgs}
+    artifacts = {
+        "elf": {awg_idx: {} for awg_idx in qc._awgs},
+        "sequencer_code": {awg_idx: {core_idx: f"{awg_idx}/{core_idx}" for core_idx in qc._channel_mapping[awg_idx]} for awg_idx in qc._awgs},
+        "waveforms": {awg_idx: {core_idx: {0: np.zeros(4), 1: np.ones(4)} for core_idx in qc._channel_mapping[awg_idx]} for awg_idx in qc._awgs},
+        "command_tables": {awg_idx: {core_idx: f"ct{core_idx}" for core_idx in qc._channel_mapping[awg_idx]} for awg_idx in qc._awgs},
+    }
+    return qc, artifacts, state
+
+
+def test_load_program_without_cores():
+    qc, artifacts, state = _compiler(n_cores=0)
+    qc._load_program(artifacts)
+    assert qc._load_time == 0.0
+    assert qc._waveform_round_trips == 0
+    assert qc._core_timings == {awg_idx: {} for awg_idx in qc._awgs}
+
+
+@pytest.mark.parametrize('waveform_upload, round_trips', [('wave', 16), ('core', 8), ('device', 2)])
+def test_load_program_compiles_one_core_at_a_time(waveform_upload, round_trips):
+    qc, artifacts, state = _compiler()
+    qc._load_program(artifacts, waveform_upload=waveform_upload)
+
+    assert state['max_running'] == 1
+    assert qc._waveform_round_trips == round_trips
+    for awg_idx, awg in qc._awgs.items():
+        for core_idx in qc._channel_mapping[awg_idx]:
+            assert artifacts["elf"][awg_idx][core_idx] == f"elf:{awg_idx}/{core_idx}".encode()
+            assert set(qc._core_timings[awg_idx][core_idx]) == {"compile", "wait", "upload"}
+        assert sorted(args for name, args in awg.log if name == 'commandtable') == [(f"ct{c}",) for c in range(1, 5)]
+        paths = []
+        for call in awg._daq.calls:
+            paths += [call[1]] if call[0] == 'setVector' else [path for path, _ in call[1]]
+        device_id = awg._connection_settings["hdawg_id"]
+        assert sorted(paths) == sorted(f"/{device_id}/awgs/{c}/waveform/waves/{w}" for c in range(4) for w in range(2))
+
+
+def test_load_program_uses_cached_elfs():
+    qc, artifacts, state = _compiler(n_awgs=1, n_cores=2)
+    artifacts["elf"]["hdawg1"] = {1: b"cached1", 2: b"cached2"}
+    qc._load_program(artifacts)
+    assert state['max_running'] == 0
+    assert sorted(args for name, args in qc._awgs["hdawg1"].log if name == 'elf') == [(b"cached1",), (b"cached2",)]
+
+
+def _command_table_dict(n_entries):
+    ct = CommandTable(_load_schema())
+    for idx in range(n_entries):
+        ct.table[idx].waveform.index = idx
+        ct.table[idx].phase0.value = 45.0 * idx
+        ct.table[idx].phase0.increment = idx % 2 == 1
+    return ct.as_dict()
+
+
+@pytest.mark.skipif(not os.path.exists(_CT_SCHEMA_PATH), reason="zhinst-toolkit without a bundled HDAWG command table schema")
+def test_restored_command_tables_are_command_table_objects():
+    qc, artifacts, state = _compiler(n_cores=2)
+    tables = {awg_idx: {core_idx: _command_table_dict(core_idx + 1) for core_idx in (1, 2)} for awg_idx in qc._awgs}
+    artifacts.update({"program_ir": ProgramIR.from_sequence_table({}), "ct_idxs": {}, "command_tables": tables, "gate_npoints": {},
+                      "gate_waveforms": {}, "gate_lengths": {}, "arb_waveforms": {}, "arb_dc_waveforms": {}})
+    qc._restore_compiler_state(artifacts)
+    for awg_idx in qc._awgs:
+        for core_idx in (1, 2):
+            ct = qc._command_tables[awg_idx][core_idx]
+            assert isinstance(ct, CommandTable)
+            assert ct.as_dict() == tables[awg_idx][core_idx]
+
+
+_GATE_PARAMETERS = {"rf": {1: {"i_amp": 0.5}, 2: {"i_amp": 0.5}}, "p": {}}
+
+
+def _loaded_compiler():
+    """Compiler with a program loaded on two cores of one HDAWG."""
+    qc, artifacts, state = _compiler(n_awgs=1, n_cores=2)
+    awg_core_split = {1: ("hdawg1", 1), 2: ("hdawg1", 2)}
+    qc._awgs["hdawg1"]._hdawg_core_split = awg_core_split
+    qc._gst_path = "loaded.txt"
+    qc._gate_parameters = qc._split_gate_parameters(_GATE_PARAMETERS, awg_core_split)
+    qc._gate_parameters_all = _GATE_PARAMETERS
+    qc._compile_cache = None
+    qc._n_inner = qc._n_outer = 1
+    qc._added_padding = 0
+    qc._n_workers = None
+    qc._waveform_upload = 'wave'
+    artifacts.update({"elf": {"hdawg1": {1: b"elf1", 2: b"elf2"}}, "program_ir": ProgramIR.from_sequence_table({}), "ct_idxs": {1: "loaded"},
+                      "command_tables": {"hdawg1": {1: _command_table_dict(3), 2: _command_table_dict(3)}}, "gate_npoints": {}, "gate_waveforms": {},
+                      "gate_lengths": {}, "arb_waveforms": {}, "arb_dc_waveforms": {}})
+    qc._restore_compiler_state(artifacts)
+    qc._artifacts = artifacts
+    return qc, artifacts
+
+
+@pytest.mark.skipif(not os.path.exists(_CT_SCHEMA_PATH), reason="zhinst-toolkit without a bundled HDAWG command table schema")
+def test_patch_keeps_state_after_failed_compile():
+    qc, loaded = _loaded_compiler()
+
+    def failing_compile(gst_path, *args):
+        # A compilation that fails half way, after overwriting compiler attributes
+        qc._sequencer_code = "partial"
+        qc._ct_idxs_all = {1: "partial"}
+        qc._command_tables = {}
+        raise RuntimeError("compilation failed")
+
+    qc._compile = failing_compile
+    with pytest.raises(RuntimeError):
+        qc.patch(gst_file_path="new.txt", gate_parameters={"rf": {1: {"i_amp": 0.9}, 2: {"i_amp": 0.5}}, "p": {}})
+
+    assert qc._gst_path == "loaded.txt"
+    assert qc._gate_parameters_all is _GATE_PARAMETERS
+    assert qc._artifacts is loaded
+    assert qc._sequencer_code == loaded["sequencer_code"]
+    assert qc._ct_idxs_all == {1: "loaded"}
+    assert qc._command_tables["hdawg1"][2].as_dict() == loaded["command_tables"]["hdawg1"][2]
+    assert qc._awgs["hdawg1"].log == [] and qc._awgs["hdawg1"]._daq.calls == []
+
+
+@pytest.mark.skipif(not os.path.exists(_CT_SCHEMA_PATH), reason="zhinst-toolkit without a bundled HDAWG command table schema")
+def test_patch_uploads_only_changes():
+    qc, loaded = _loaded_compiler()
+    new = dict(loaded)
+    new["elf"] = {"hdawg1": {}}
+    new["waveforms"] = {"hdawg1": {1: {0: np.zeros(4), 1: 3 * np.ones(4)}, 2: {0: np.zeros(4), 1: np.ones(4)}}}
+    new["command_tables"] = {"hdawg1": {1: _command_table_dict(3), 2: _command_table_dict(4)}}
+    qc._compile = lambda *args: new
+
+    report = qc.patch()
+    assert not report["recompiled"] and not report["configured"]
+    assert report["waveforms"] == {"hdawg1": {1: [1], 2: []}}
+    assert report["command_table_entries"] == {"hdawg1": {1: [], 2: [3]}}
+    assert [call[1] for call in qc._awgs["hdawg1"]._daq.calls] == ["/dev8000/awgs/0/waveform/waves/1"]
+    assert qc._awgs["hdawg1"].log == [('commandtable', (new["command_tables"]["hdawg1"][2],))]
+    assert qc._artifacts is new and new["elf"] == loaded["elf"]
@@ -0,0 +1,94 @@
+import functools
+
+import numpy as np
+import pytest
+
+from silospin.integrator_strang import StrangSplitIntegrator
+from silospin.sharded_integrator import ShardedStrangIntegrator, shard_bounds
+
+_D = 3
+_B = 5
+# Shards pick their own expm scaling from their own norms, so agreement is to rounding
+_ATOL = 1e-12
+
+
+class _TemplateState:
+    def clone(self, arr):
+        return arr
+
+
+class _HCallback:
+    """H(ti) = H0 (1 + 0.02 ti)."""
+
+    def __init__(self, H0):
+        self.H0 = H0
+
+    def __call__(self, ti, B, out):
+        out[...] = self.H0 * (1.0 + 0.02 * ti)
+
+
+class _J:
+    """J(t)[rho] = -i sin(t) [V, rho]."""
+
+    def __init__(self, V):
+        self.V = V
+
+    def compute_action(self, t, dummy, rho, out):
+        out[...] = -1j * np.sin(t) * (np.einsum('ijb,jkb->ikb', self.V, rho) - np.einsum('ijb,jkb->ikb', rho, self.V))
+
+
+def _problem(batch=slice(None)):
+    """The full [d, d, B] problem restricted to the batch slice."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(_D, _D, _B)) + 1j * rng.normal(size=(_D, _D, _B))
+    H0 = np.asfortranarray(0.5 * (X + X.conj().transpose(1, 0, 2))[:, :, batch])
+    B = H0.shape[2]
+    L = np.zeros((_D, _D, B), dtype=complex, order='F')
+    L[0, 1, :] = 1.0
+    rates = np.linspace(0.05, 0.3, _B)[batch]
+    rho0 = np.zeros((_D, _D, B), dtype=complex, order='F')
+    rho0[1, 1, :] = 1.0
+    V = np.asfortranarray(np.repeat(np.diag([1.0, 0.0, -1.0]).astype(complex)[:, :, None], B, axis=2))
+    integrator = StrangSplitIntegrator(_HCallback(H0), [(L, rates)], B, _D, _TemplateState(), xp=np,
+                                       dissipator='exact')
+    return integrator, rho0, _J(V)
+
+
+def build_shard(start, stop, tme=False):
+    integrator, rho0, J = _problem(slice(start, stop))
+    return (integrator, rho0, J) if tme else (integrator, rho0)
+
+
+def test_shard_bounds_cover_batch():
+    assert shard_bounds(5, 2) == [(0, 2), (2, 5)]
+    assert shard_bounds(3, 8) == [(0, 1), (1, 2), (2, 3)]
+    for n in range(1, 7):
+        bounds = shard_bounds(_B, n)
+        assert bounds[0][0] == 0 and bounds[-1][1] == _B
+        assert all(a[1] == b[0] for a, b in zip(bounds[:-1], bounds[1:]))
+
+
+@pytest.mark.parametrize('n_workers', [2, 3])
+def test_sharded_matches_unsharded(n_workers):
+    integrator, rho0, _ = _problem()
+    expected = integrator.integrate(1.0, 31, rho0, chunk_size=8).numpy()
+    sharded = ShardedStrangIntegrator(build_shard, _B, n_workers=n_workers)
+    result = sharded.integrate(1.0, 31, chunk_size=8)
+    assert len(sharded.shard_times) == n_workers
+    np.testing.assert_allclose(result.numpy(), expected, atol=_ATOL)
+
+
+def test_sharded_tme_matches_unsharded():
+    integrator, rho0, J = _problem()
+    expected = integrator.integrate_tme(1.0, 21, rho0, J).numpy()
+    sharded = ShardedStrangIntegrator(functools.partial(build_shard, tme=True), _B, n_workers=2)
+    np.testing.assert_allclose(sharded.integrate_tme(1.0, 21).numpy(), expected, atol=_ATOL)
+
+
+def test_sharded_trajectory_file_matches_unsharded(tmp_path):
+    integrator, rho0, _ = _problem()
+    expected = integrator.integrate(1.0, 21, rho0).numpy()
+    path = tmp_path / 'traj.npy'
+    result = ShardedStrangIntegrator(build_shard, _B, n_workers=2).integrate(1.0, 21, trajectory_path=str(path))
+    np.testing.assert_allclose(np.asarray(result), expected, atol=_ATOL)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['traj.npy']
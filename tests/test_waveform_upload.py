@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from silospin.quantum_compiler.waveform_upload import check_upload_mode, upload_waveforms, waveform_path, waveform_settings
+
+
+class _MockDaq:
+    """Records the data server calls made by upload_waveforms."""
+
+    def __init__(self):
+        self.calls = []
+
+    def set(self, settings):
+        self.calls.append(('set', list(settings)))
+
+    def setVector(self, path, value):
+        self.calls.append(('setVector', path, value))
+
+
+def test_waveform_path_uses_zero_based_core_node():
+    assert waveform_path('dev8446', 1, 0) == '/dev8446/awgs/0/waveform/waves/0'
+    assert waveform_path('dev8446', 4, 17) == '/dev8446/awgs/3/waveform/waves/17'
+
+
+def test_waveform_settings_in_wave_index_order():
+    waves = {2: np.arange(2), 0: np.arange(3), 1: np.arange(4)}
+    settings = waveform_settings('dev8446', 2, waves)
+    assert [path for path, _ in settings] == [f'/dev8446/awgs/1/waveform/waves/{i}' for i in range(3)]
+    assert all(wave is waves[i] for i, (_, wave) in enumerate(settings))
+
+
+def test_upload_batched_is_one_transaction():
+    daq = _MockDaq()
+    settings = waveform_settings('dev8446', 3, {i: np.full(8, i) for i in range(5)})
+    assert upload_waveforms(daq, settings, batched=True) == 1
+    assert daq.calls == [('set', settings)]
+
+
+def test_upload_unbatched_is_one_set_vector_per_wave():
+    daq = _MockDaq()
+    settings = waveform_settings('dev8446', 3, {i: np.full(8, i) for i in range(5)})
+    assert upload_waveforms(daq, settings, batched=False) == 5
+    assert [call[0] for call in daq.calls] == ['setVector'] * 5
+    assert [(path, wave) for _, path, wave in daq.calls] == settings
+
+
+@pytest.mark.parametrize('batched', [True, False])
+def test_upload_nothing(batched):
+    daq = _MockDaq()
+    assert upload_waveforms(daq, [], batched=batched) == 0
+    assert daq.calls == []
+
+
+def test_check_upload_mode():
+    for mode in ('wave', 'core', 'device'):
+        check_upload_mode(mode)
+    with pytest.raises(ValueError):
+        check_upload_mode('batch')